@@ -41,6 +41,42 @@ static Value openFileHandle(int argCount, Value* args, const char* mode) {
 	return NIL_VAL; /* No file handles available. */
 }
 
+/* Get a string of up to a number of bytes from a stream. */
+static Value getString(FILE* stream, int count, bool isLine) {
+	char* chars = NULL;
+	int capacity = 0;
+	int length = 0;
+	
+	while (count < 0 || length < count) {
+		int result = getc(stream);
+		
+		if (result == EOF) {
+			break; /* End of file or error. */
+		}
+		
+		if (length + 1 >= capacity) {
+			int oldCapacity = capacity;
+			capacity = GROW_CAPACITY(oldCapacity);
+			chars = GROW_ARRAY(char, chars, oldCapacity, capacity);
+		}
+		
+		chars[length++] = (char)result;
+		
+		if (isLine && result == '\n') {
+			break; /* End of line. */
+		}
+	}
+	
+	if (length == 0) {
+		FREE_ARRAY(char, chars, capacity);
+		return NIL_VAL; /* End of file or error. */
+	}
+	
+	chars = GROW_ARRAY(char, chars, capacity, length + 1);
+	chars[length] = '\0';
+	return OBJ_VAL(takeString(chars, length));
+}
+
 /* The argc intrinsic. */
 static Value argcIntrinsic(int argCount, Value* args) {
 	return NUMBER_VAL((double)loxArgc);
@@ -146,6 +182,54 @@ static Value getIntrinsic(int argCount, Value* args) {
 	return NUMBER_VAL((double)result);
 }
 
+/* The getline intrinsic. */
+static Value getlineIntrinsic(int argCount, Value* args) {
+	if (argCount != 1 || !IS_NUMBER(args[0])) {
+		return NIL_VAL; /* Invalid arguments. */
+	}
+	
+	int handle = (int)AS_NUMBER(args[0]);
+	
+	if (handle < 0 || handle > STREAM_MAX) {
+		return NIL_VAL; /* Invalid file handle. */
+	}
+	
+	FILE* stream = loxStreams[handle];
+	
+	if (stream == NULL) {
+		return NIL_VAL; /* Unopened stream. */
+	}
+	
+	return getString(stream, -1, true);
+}
+
+/* The getstr intrinsic. */
+static Value getstrIntrinsic(int argCount, Value* args) {
+	if (argCount != 2 || !IS_NUMBER(args[0]) || !IS_NUMBER(args[1])) {
+		return NIL_VAL; /* Invalid arguments. */
+	}
+	
+	int handle = (int)AS_NUMBER(args[0]);
+	
+	if (handle < 0 || handle > STREAM_MAX) {
+		return NIL_VAL; /* Invalid file handle. */
+	}
+	
+	FILE* stream = loxStreams[handle];
+	
+	if (stream == NULL) {
+		return NIL_VAL; /* Unopened stream. */
+	}
+	
+	int count = (int)AS_NUMBER(args[1]);
+	
+	if (count == 0) {
+		return OBJ_VAL(copyString("", 0)); /* Nothing to get. */
+	}
+	
+	return getString(stream, count, false);
+}
+
 /* The length intrinsic. */
 static Value lengthIntrinsic(int argCount, Value* args) {
 	if (argCount != 1 || !IS_STRING(args[0])) {
@@ -209,6 +293,34 @@ static Value putIntrinsic(int argCount, Value* args) {
 	return NUMBER_VAL((double)byte);
 }
 
+/* The putstr intrinsic. */
+static Value putstrIntrinsic(int argCount, Value* args) {
+	if (argCount != 2 || !IS_STRING(args[0]) || !IS_NUMBER(args[1])) {
+		return NIL_VAL; /* Invalid arguments. */
+	}
+	
+	ObjString* string = AS_STRING(args[0]);
+	int handle = (int)AS_NUMBER(args[1]);
+	
+	if (handle < 0 || handle > STREAM_MAX) {
+		return NIL_VAL; /* Invalid file handle. */
+	}
+	
+	FILE* stream = loxStreams[handle];
+	
+	if (stream == NULL) {
+		return NIL_VAL; /* Unopened stream. */
+	}
+	
+	size_t result = fwrite(string->chars, sizeof(char), string->length, stream);
+	
+	if (result != (size_t)string->length) {
+		return NIL_VAL; /* Failed to put string. */
+	}
+	
+	return NUMBER_VAL((double)string->length);
+}
+
 /* The read intrinsic. */
 static Value readIntrinsic(int argCount, Value* args) {
 	return openFileHandle(argCount, args, "rb");
@@ -285,9 +397,12 @@ void installIntrinsics(DefineNativeFn defineNative) {
 	defineNative("_close", closeIntrinsic);
 	defineNative("_exit", exitIntrinsic);
 	defineNative("_get", getIntrinsic);
+	defineNative("_getline", getlineIntrinsic);
+	defineNative("_getstr", getstrIntrinsic);
 	defineNative("_length", lengthIntrinsic);
 	defineNative("_ord", ordIntrinsic);
 	defineNative("_put", putIntrinsic);
+	defineNative("_putstr", putstrIntrinsic);
 	defineNative("_read", readIntrinsic);
 	defineNative("_stderr", stderrIntrinsic);
 	defineNative("_stdin", stdinIntrinsic);
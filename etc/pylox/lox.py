@@ -1,50 +1,237 @@
 #!/usr/bin/env python
 
+import os
 import sys
 
 from lox_ast_printer import ASTPrinter
+from lox_buffer_parser import BufferParser
+from lox_closure_compiler import ClosureCompiler
+from lox_cache import ProgramCache
+from lox_compiler import Compiler
 from lox_error_reporter import ErrorReporter
+from lox_inline_cache import InlineCache
 from lox_interpreter import Interpreter
+from lox_intrinsic import flush_handles
+from lox_object import ObjFunction
+from lox_optimizer import Optimizer
 from lox_parser import Parser
+from lox_regex_scanner import RegexScanner
 from lox_resolver import Resolver
 from lox_scanner import Scanner
 from lox_stmt import Stmt
-from lox_token import Token
+from lox_vm import VM
 from typing import Self
 
 class Lox:
     """ Java-style main class to match the jlox implementation. """
     
+    ENGINES: tuple[str, ...] = ("tree", "closure", "vm")
+    """ The names of the available execution engines. """
+    
+    AST_MARKER: str = "//ast"
+    """ The comment that prints a program's syntax tree when it ends. """
+    
+    engine: str = "tree"
+    """ The name of the execution engine to run programs with. """
+    
+    SCANNERS: dict[str, type[Scanner]] = {
+        "regex": RegexScanner,
+        "char": Scanner,
+    }
+    """ The available scanners by name. """
+    
+    scanner: str = "regex"
+    """ The name of the scanner to scan source code with. """
+    
+    disassemble: bool = False
+    """ Whether to print compiled bytecode with the VM engine. """
+    
+    token_buffer: bool = False
+    """ Whether to parse programs from a compact token buffer. """
+    
+    use_cache: bool = True
+    """ Whether to load and store resolved programs in the cache. """
+    
+    clear_cache: bool = False
+    """ Whether to remove a script's resolved program from the cache. """
+    
+    optimize: bool = False
+    """ Whether to optimize programs before running them. """
+    
+    profile: bool = False
+    """ Whether to print profiling counters after running programs. """
+    
+    NESTING_MESSAGE: str = "Code is too deeply nested."
+    """
+    The error to report when a program's syntax tree is too deep to
+    resolve or compile recursively.
+    """
+    
     error_reporter: ErrorReporter
     """ The error reporter to pass through the interpreter. """
     
     interpreter: Interpreter
     """ The Lox interpreter. """
     
+    vm: VM
+    """ The Lox bytecode virtual machine. """
+    
+    optimizer: Optimizer
+    """ The Lox syntax tree optimizer. """
+    
+    program_cache: ProgramCache
+    """ The cache of resolved programs. """
+    
     def __init__(self: Self) -> None:
         """ Initialize Lox. """
         
-        self.error_reporter = ErrorReporter()
+        self.error_reporter = ErrorReporter(flush_handles)
         self.interpreter = Interpreter(self.error_reporter)
+        self.vm = VM(self.error_reporter)
+        self.optimizer = Optimizer()
+        self.program_cache = ProgramCache(self.interpreter)
     
     
     def main(self: Self, args: list[str]) -> None:
         """ Run Lox from arguments. """
         
-        if args:
-            self.run_file(args[0])
-        else:
-            self.run_prompt()
+        while args and args[0].startswith("--"):
+            option: str = args.pop(0)
+            
+            if option.startswith("--engine="):
+                self.engine = option[len("--engine="):]
+                
+                if self.engine not in self.ENGINES:
+                    self.usage()
+            elif option.startswith("--scanner="):
+                self.scanner = option[len("--scanner="):]
+                
+                if self.scanner not in self.SCANNERS:
+                    self.usage()
+            elif option.startswith("--max-depth="):
+                self.set_max_depth(option[len("--max-depth="):])
+            elif option.startswith("--max-files="):
+                self.set_max_files(option[len("--max-files="):])
+            elif option == "--disassemble":
+                self.disassemble = True
+            elif option == "--token-buffer":
+                self.token_buffer = True
+            elif option == "--no-cache":
+                self.use_cache = False
+            elif option == "--clear-cache":
+                self.clear_cache = True
+            elif option == "--optimize":
+                self.optimize = True
+            elif option == "--profile":
+                self.profile = True
+                self.interpreter.profile = True
+            else:
+                self.usage()
+        
+        # Hide interpreter options from the command line intrinsics.
+        sys.argv[1:] = args
+        
+        try:
+            if args:
+                self.run_file(args[0])
+            else:
+                self.run_prompt()
+        finally:
+            self.interpreter.close()
+            self.vm.close()
+    
+    
+    def usage(self: Self) -> None:
+        """ Print the command line usage and exit. """
+        
+        engines: str = "|".join(self.ENGINES)
+        scanners: str = "|".join(self.SCANNERS)
+        print(
+                f"Usage: lox.py [--engine={engines}] [--scanner={scanners}] "
+                "[--max-depth=<depth>] [--max-files=<count>] "
+                "[--token-buffer] [--no-cache] [--clear-cache] "
+                "[--disassemble] [--optimize] [--profile] [script]")
+        sys.exit(64)
+    
+    
+    def set_max_depth(self: Self, value: str) -> None:
+        """
+        Set the maximum depth of nested Lox calls for every engine from
+        an option value.
+        """
+        
+        if not value.isdigit() or int(value) < 1:
+            self.usage()
+        
+        self.interpreter.max_depth = int(value)
+        self.vm.frames_max = int(value)
+    
+    
+    def set_max_files(self: Self, value: str) -> None:
+        """
+        Set the maximum number of open file handles for every engine
+        from an option value.
+        """
+        
+        if not value.isdigit():
+            self.usage()
+        
+        self.interpreter.handles.max_files = int(value)
+        self.vm.handles.max_files = int(value)
     
     
     def run_file(self: Self, path: str) -> None:
-        """ Run Lox from a file path. """
+        """
+        Run Lox from a file path. Unless a token buffer is used, the
+        file is scanned lazily while it is parsed instead of being read
+        into memory.
+        """
+        
+        if self.clear_cache:
+            self.program_cache.clear(path)
+        
+        is_ast: bool = self.has_ast_marker(path)
+        key: str | None = None
+        statements: list[Stmt] | None = None
         
-        with open(path) as file:
-            self.run(file.read())
+        if self.use_cache and not is_ast and os.path.isfile(path):
+            key = self.program_cache.get_key(path)
+            statements = self.program_cache.load(path, key)
+        
+        if statements is None:
+            with open(path) as file:
+                parser: Parser
+                
+                if self.token_buffer:
+                    parser = self.create_parser(file.read())
+                else:
+                    scanner: Scanner = self.SCANNERS[self.scanner](
+                            self.error_reporter, "")
+                    parser = Parser(
+                            self.error_reporter, scanner.scan_file(file))
+                
+                statements = self.parse(parser, is_ast)
+            
+            if statements is not None and key is not None:
+                self.program_cache.store(path, key, statements)
+        
+        if statements is not None:
+            self.execute(statements)
+        
+        if self.error_reporter.had_error():
+            sys.exit(65)
+    
+    
+    def has_ast_marker(self: Self, path: str) -> bool:
+        """ Return whether a file ends with the syntax tree marker. """
+        
+        with open(path, "rb") as file:
+            if not file.seekable():
+                return False
             
-            if self.error_reporter.had_error():
-                sys.exit(65)
+            marker: bytes = self.AST_MARKER.encode()
+            file.seek(max(file.seek(0, os.SEEK_END) - len(marker), 0))
+            return file.read() == marker
     
     
     def run_prompt(self: Self) -> None:
@@ -62,29 +249,113 @@ class Lox:
     def run(self: Self, source: str) -> None:
         """ Run Lox from source code. """
         
-        scanner: Scanner = Scanner(self.error_reporter, source)
-        tokens: list[Token] = scanner.scan_tokens()
-        parser: Parser = Parser(self.error_reporter, tokens)
+        statements: list[Stmt] | None = self.parse(
+                self.create_parser(source), source.endswith(self.AST_MARKER))
+        
+        if statements is not None:
+            self.execute(statements)
+    
+    
+    def create_parser(self: Self, source: str) -> Parser:
+        """ Create a parser for source code. """
+        
+        scanner: Scanner = self.SCANNERS[self.scanner](
+                self.error_reporter, source)
+        
+        if self.token_buffer:
+            return BufferParser(self.error_reporter, scanner.scan_buffer())
+        
+        return Parser(self.error_reporter, scanner.scan())
+    
+    
+    def parse(self: Self, parser: Parser, is_ast: bool) -> list[Stmt] | None:
+        """
+        Parse and resolve a program from a parser, or print its syntax
+        tree if the source code ends with the syntax tree marker. Return
+        `None` if the program should not be run.
+        """
+        
         statements: list[Stmt] = parser.parse()
         
         if self.error_reporter.had_error():
-            return
+            return None
         
-        if source.endswith("//ast"):
+        if is_ast:
             ast_printer: ASTPrinter = ASTPrinter()
             
             for statement in statements:
                 print(ast_printer.print(statement))
             
-            return
+            return None
         
         resolver: Resolver = Resolver(self.error_reporter, self.interpreter)
-        resolver.resolve(statements)
+        
+        try:
+            resolver.resolve(statements)
+        except RecursionError:
+            self.error_reporter.report_program(self.NESTING_MESSAGE)
         
         if self.error_reporter.had_error():
-            return
+            return None
+        
+        return statements
+    
+    
+    def execute(self: Self, statements: list[Stmt]) -> None:
+        """
+        Optimize and run a resolved program. The engines handle their
+        own runtime errors, so a recursion error can only come from
+        optimizing or compiling the program.
+        """
+        
+        try:
+            if self.optimize:
+                statements = self.optimizer.optimize(statements)
+            
+            if self.engine == "vm":
+                compiler: Compiler = Compiler(
+                        self.error_reporter, self.disassemble)
+                function: ObjFunction = compiler.compile(statements)
+                
+                if not self.error_reporter.had_error():
+                    self.vm.interpret(function)
+            elif self.engine == "closure":
+                ClosureCompiler(self.interpreter).interpret(statements)
+            else:
+                self.interpreter.interpret(statements)
+        except RecursionError:
+            self.error_reporter.report_program(self.NESTING_MESSAGE)
+        
+        flush_handles()
+        
+        if self.profile:
+            self.print_profile()
+    
+    
+    def print_profile(self: Self) -> None:
+        """ Print profiling counters to the standard error stream. """
+        
+        caches: list[InlineCache] = sorted(
+                (cache for cache in self.interpreter.inline_caches
+                        if cache.hits or cache.misses),
+                key=lambda cache: cache.hits + cache.misses, reverse=True)
+        hits: int = sum(cache.hits for cache in caches)
+        misses: int = sum(cache.misses for cache in caches)
+        print("== inline caches ==", file=sys.stderr)
+        
+        for cache in caches:
+            print(
+                    f"[line {cache.name.line}] `{cache.name.lexeme}`: "
+                    f"{cache.hits} hits, {cache.misses} misses, "
+                    f"{cache.state()}", file=sys.stderr)
+        
+        print(f"total: {hits} hits, {misses} misses", file=sys.stderr)
         
-        self.interpreter.interpret(statements)
+        if self.optimize:
+            print("== optimizer ==", file=sys.stderr)
+            print(
+                    f"removed: {self.optimizer.removed_count} nodes",
+                    file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,628 @@
+#!/usr/bin/env python
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from collections.abc import Callable
+from lox_buffer_parser import BufferParser
+from lox_closure_compiler import ClosureCompiler
+from lox_compiler import Compiler
+from lox_descent_parser import DescentParser
+from lox_environment import Environment
+from lox_error_reporter import ErrorReporter
+from lox_interpreter import Interpreter
+from lox_object import ObjFunction
+from lox_optimizer import count_nodes
+from lox_parser import Parser
+from lox_regex_scanner import RegexScanner
+from lox_resolver import Resolver
+from lox_scanner import Scanner
+from lox_stmt import Stmt
+from lox_token import Token
+from lox_token_buffer import TokenBuffer
+from lox_vm import VM
+from typing import Any
+
+ENGINES: tuple[str, ...] = ("tree", "closure", "vm")
+""" The execution engines to compare in the benchmarks. """
+
+KROX_PATH: str = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "..", "..", "loxkrox")
+""" The path to the Krox compiler's Lox source code. """
+
+CAT_PATH: str = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "..", "lox", "cat.lox")
+""" The path to the cat demonstration. """
+
+CAT_SIZE: int = 0x100000
+""" The number of bytes to copy in the cat benchmark. """
+
+SLURP_PATH: str = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "..", "lox", "slurp.lox")
+""" The path to the slurp demonstration. """
+
+SLURP_SIZE: int = 0x1000000
+""" The number of bytes to copy in the slurp benchmark. """
+
+HANDLES_OPEN: int = 200
+""" The number of file handles to hold open in the handles benchmark. """
+
+HANDLES_CYCLES: int = 20000
+""" The number of file handles to open and close in the handles benchmark. """
+
+PARSER_COPIES: int = 5
+""" The number of copies of the Krox compiler in the parser benchmark. """
+
+STREAM_COPIES: int = 30
+""" The number of copies of the Krox compiler in the stream benchmark. """
+
+TAIL_DEPTH: int = 1000000
+""" The depth of tail recursion in the tail benchmark. """
+
+STRINGS_LENGTH: int = 200000
+""" The number of characters to append in the strings benchmark. """
+
+ENVIRONMENT_COUNT: int = 100000
+""" The number of environments to create in the memory benchmark. """
+
+INSTANCE_COUNT: int = 20000
+""" The number of instances to create in the instance benchmark. """
+
+DICT_CLASSES: dict[type, type] = {}
+"""
+Classes that have `__slots__` by the equivalent classes with a
+`__dict__` that are used to measure the layout before slots.
+"""
+
+INSTANCE_SOURCE: str = """
+class ListNode {
+    init(value, next) {
+        this.value = value;
+        this.next = next;
+    }
+}
+
+class MapNode {
+    init(key, value, next) {
+        this.key = key;
+        this.value = value;
+        this.next = next;
+        this.hash = key * 31;
+    }
+    
+    find(key) {
+        var node = this;
+        
+        while (node != nil) {
+            if (node.key == key) return node.value;
+            node = node.next;
+        }
+        
+        return nil;
+    }
+}
+
+var list = nil;
+var map = nil;
+
+for (var i = 0; i < COUNT; i = i + 1) {
+    list = ListNode(i, list);
+    map = MapNode(i, list, map);
+}
+
+var sum = 0;
+var node = list;
+
+while (node != nil) {
+    sum = sum + node.value;
+    node = node.next;
+}
+
+map.find(0);
+"""
+"""
+The source code of the instance benchmark. Builds a linked list of
+`ListNode` instances and an association list of `MapNode` instances,
+then walks both.
+"""
+
+def read_krox_source() -> str:
+    """
+    Return the Krox compiler's Lox source files concatenated into a
+    single source.
+    """
+    
+    sources: list[str] = []
+    
+    for directory, _, files in sorted(os.walk(KROX_PATH)):
+        for file in sorted(files):
+            if file.endswith(".lox"):
+                with open(os.path.join(directory, file)) as source:
+                    sources.append(source.read())
+    
+    return "\n".join(sources)
+
+
+def traced_size(function: Callable[[], Any]) -> tuple[Any, int]:
+    """
+    Call a function and return its result with the size of the memory
+    it allocated that is still in use.
+    """
+    
+    tracemalloc.start()
+    result: Any = function()
+    size: int = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def traced_peak(function: Callable[[], Any]) -> tuple[Any, int]:
+    """
+    Call a function and return its result with the peak size of the
+    memory it allocated.
+    """
+    
+    tracemalloc.start()
+    result: Any = function()
+    size: int = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, size
+
+
+def copy_layout(value: Any, is_slotted: bool, shared: set[int]) -> Any:
+    """
+    Deeply copy a tree of values with every object that has `__slots__`
+    laid out either with its slots or, as before objects had slots, with
+    a `__dict__`. Lists are copied too. Other values, and objects with
+    IDs in a shared set, are not copied.
+    """
+    
+    if id(value) in shared:
+        return value
+    
+    if type(value) is list:
+        items: list[Any] = []
+        
+        for item in value:
+            items.append(copy_layout(item, is_slotted, shared))
+        
+        return items
+    
+    if not hasattr(type(value), "__slots__"):
+        return value
+    
+    klass: type = type(value)
+    
+    if not is_slotted:
+        if klass not in DICT_CLASSES:
+            DICT_CLASSES[klass] = type(klass.__name__, (), {})
+        
+        klass = DICT_CLASSES[klass]
+    
+    copy: Any = object.__new__(klass)
+    
+    for base in reversed(type(value).__mro__):
+        for name in vars(base).get("__slots__", ()):
+            if hasattr(value, name):
+                setattr(copy, name, copy_layout(
+                        getattr(value, name), is_slotted, shared))
+    
+    return copy
+
+
+def run_source(source: str, engine: str) -> Interpreter | VM:
+    """
+    Run Lox source code with an engine and return the interpreter or VM
+    so its globals stay alive.
+    """
+    
+    error_reporter: ErrorReporter = ErrorReporter()
+    interpreter: Interpreter = Interpreter(error_reporter)
+    statements: list[Stmt] = Parser(
+            error_reporter,
+            Scanner(error_reporter, source).scan_tokens()).parse()
+    Resolver(error_reporter, interpreter).resolve(statements)
+    
+    if error_reporter.had_error():
+        sys.exit(65)
+    
+    if engine == "vm":
+        function: ObjFunction = Compiler(error_reporter, False).compile(
+                statements)
+        vm: VM = VM(error_reporter)
+        vm.interpret(function)
+        vm.close()
+        return vm
+    elif engine == "closure":
+        ClosureCompiler(interpreter).interpret(statements)
+    else:
+        interpreter.interpret(statements)
+    
+    interpreter.close()
+    return interpreter
+
+
+def best_time(function: Callable[[], object], repeats: int = 5) -> float:
+    """ Return the best time of calling a function in seconds. """
+    
+    best: float = float("inf")
+    
+    for i in range(repeats):
+        start: float = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    
+    return best
+
+
+def benchmark_cat() -> None:
+    """ Report the throughput of copying a file with `cat.lox`. """
+    
+    with tempfile.TemporaryDirectory() as directory:
+        source_path: str = os.path.join(directory, "source.bin")
+        target_path: str = os.path.join(directory, "target.bin")
+        
+        with open(source_path, "wb") as file:
+            file.write(bytes(range(256)) * (CAT_SIZE // 256))
+        
+        with open(CAT_PATH) as file:
+            source: str = file.read().replace(
+                    "main();",
+                    f'var target = _write("{target_path}");\n'
+                    f'cat("{source_path}", target);\n'
+                    "_close(target);")
+        
+        size: float = CAT_SIZE / 1000000
+        
+        for engine in ENGINES:
+            seconds: float = best_time(
+                    lambda: run_source(source, engine), repeats=3)
+            
+            with open(source_path, "rb") as source_file:
+                with open(target_path, "rb") as target_file:
+                    if source_file.read() != target_file.read():
+                        print(f"cat ({engine}): copy does not match")
+            
+            print(
+                    f"cat ({engine}): {size:.2f} MB, {seconds:.3f}s, "
+                    f"{size / seconds:.2f} MB/s")
+
+
+def benchmark_handles() -> None:
+    """
+    Report the time of opening and closing file handles while many other
+    file handles are open.
+    """
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, "file.txt")
+        
+        with open(path, "wb") as file:
+            file.write(b"Handle")
+        
+        source: str = (
+                f"for(var i = 0; i < {HANDLES_OPEN}; i = i + 1){{\n"
+                f'    _read("{path}");\n'
+                "}\n"
+                f"for(var i = 0; i < {HANDLES_CYCLES}; i = i + 1){{\n"
+                f'    _close(_read("{path}"));\n'
+                "}\n")
+        
+        for engine in ENGINES:
+            seconds: float = best_time(
+                    lambda: run_source(source, engine), repeats=3)
+            print(
+                    f"handles ({engine}): {HANDLES_OPEN} open, "
+                    f"{HANDLES_CYCLES} cycles, {seconds:.3f}s")
+
+
+def benchmark_instances() -> None:
+    """
+    Report the time and memory of creating and walking many small
+    instances.
+    """
+    
+    source: str = INSTANCE_SOURCE.replace("COUNT", str(INSTANCE_COUNT))
+    count: int = INSTANCE_COUNT * 2
+    
+    for engine in ENGINES:
+        seconds: float = best_time(lambda: run_source(source, engine))
+        tracemalloc.start()
+        interpreter: Interpreter | VM = run_source(source, engine)
+        size: int = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del interpreter
+        print(
+                f"instances ({engine}): {count} instances, "
+                f"{seconds:.3f}s, {size / count:.1f} bytes per instance")
+
+
+def benchmark_scanner() -> None:
+    """
+    Report the throughput of each scanner when scanning the Krox
+    compiler.
+    """
+    
+    source: str = read_krox_source()
+    size: float = len(source.encode()) / 1000000
+    
+    for name, scanner in (("char", Scanner), ("regex", RegexScanner)):
+        error_reporter: ErrorReporter = ErrorReporter()
+        seconds: float = best_time(
+                lambda: scanner(error_reporter, source).scan_tokens())
+        print(
+                f"scanner ({name}): {size:.2f} MB, {seconds:.3f}s, "
+                f"{size / seconds:.2f} MB/s")
+    
+    seconds = best_time(
+            lambda: RegexScanner(error_reporter, source).scan_buffer())
+    print(
+            f"scanner (token buffer): {size:.2f} MB, {seconds:.3f}s, "
+            f"{size / seconds:.2f} MB/s")
+
+
+def benchmark_layout() -> None:
+    """
+    Report the memory used by each token and syntax tree node of the
+    Krox compiler, and by each environment, when they are laid out with
+    slots and when they are laid out with a `__dict__` as they were
+    before.
+    """
+    
+    source: str = read_krox_source()
+    error_reporter: ErrorReporter = ErrorReporter()
+    tokens: list[Token] = Scanner(error_reporter, source).scan_tokens()
+    statements: list[Stmt] = Parser(error_reporter, tokens).parse()
+    count: int = sum(count_nodes(statement) for statement in statements)
+    enclosing: Environment = Environment()
+    environments: list[Environment] = [
+            Environment(enclosing, [None, None])
+            for i in range(ENVIRONMENT_COUNT)]
+    
+    for name, objects, shared, object_count in (
+            ("tokens", tokens, [], len(tokens)),
+            ("ast", statements, tokens, count),
+            ("environments", environments, [enclosing], ENVIRONMENT_COUNT)):
+        for layout, is_slotted in (("dict", False), ("slots", True)):
+            ids: set[int] = {id(value) for value in shared}
+            copy: Any
+            copy, size = traced_size(
+                    lambda: copy_layout(objects, is_slotted, ids))
+            del copy
+            print(
+                    f"layout ({name}, {layout}): {object_count} objects, "
+                    f"{size / object_count:.1f} bytes per object")
+
+
+def benchmark_memory() -> None:
+    """
+    Report the memory used by each token and syntax tree node of the
+    Krox compiler, and by each environment.
+    """
+    
+    source: str = read_krox_source()
+    error_reporter: ErrorReporter = ErrorReporter()
+    tokens: Any
+    tokens, size = traced_size(
+            lambda: Scanner(error_reporter, source).scan_tokens())
+    print(
+            f"memory (tokens): {len(tokens)} tokens, "
+            f"{size / len(tokens):.1f} bytes per token")
+    
+    buffer: Any
+    buffer, size = traced_size(
+            lambda: RegexScanner(error_reporter, source).scan_buffer())
+    print(
+            f"memory (token buffer): {len(buffer)} tokens, "
+            f"{size / len(buffer):.1f} bytes per token")
+    
+    statements: Any
+    statements, size = traced_size(
+            lambda: Parser(error_reporter, tokens).parse())
+    count: int = sum(count_nodes(statement) for statement in statements)
+    print(
+            f"memory (ast): {count} nodes, "
+            f"{size / count:.1f} bytes per node")
+    
+    enclosing: Environment = Environment()
+    environments: Any
+    environments, size = traced_size(
+            lambda: [
+                    Environment(enclosing, [None, None])
+                    for i in range(ENVIRONMENT_COUNT)])
+    print(
+            f"memory (environments): {ENVIRONMENT_COUNT} environments, "
+            f"{size / ENVIRONMENT_COUNT:.1f} bytes per environment")
+
+
+def benchmark_parser() -> None:
+    """
+    Report the time of parsing copies of the Krox compiler from a list
+    of tokens with the recursive descent parser that precedence climbing
+    replaced, and with precedence climbing from a list of tokens and
+    from a token buffer.
+    """
+    
+    source: str = read_krox_source() * PARSER_COPIES
+    error_reporter: ErrorReporter = ErrorReporter()
+    tokens: list[Token] = RegexScanner(error_reporter, source).scan_tokens()
+    buffer: TokenBuffer = RegexScanner(error_reporter, source).scan_buffer()
+    seconds: float = best_time(
+            lambda: DescentParser(error_reporter, tokens).parse())
+    print(f"parser (descent): {len(tokens)} tokens, {seconds:.3f}s")
+    seconds = best_time(lambda: Parser(error_reporter, tokens).parse())
+    print(f"parser (tokens): {len(tokens)} tokens, {seconds:.3f}s")
+    seconds = best_time(lambda: BufferParser(error_reporter, buffer).parse())
+    print(f"parser (token buffer): {len(buffer)} tokens, {seconds:.3f}s")
+
+
+def benchmark_slurp() -> None:
+    """
+    Report the throughput of copying a file with the bulk intrinsics
+    and `slurp.lox`.
+    """
+    
+    with tempfile.TemporaryDirectory() as directory:
+        source_path: str = os.path.join(directory, "source.bin")
+        target_path: str = os.path.join(directory, "target.bin")
+        
+        with open(source_path, "wb") as file:
+            file.write(bytes(range(256)) * (SLURP_SIZE // 256))
+        
+        with open(SLURP_PATH) as file:
+            source: str = file.read().replace(
+                    "main();",
+                    f'var target = _write("{target_path}");\n'
+                    f'_putstr(slurp("{source_path}"), target);\n'
+                    "_close(target);")
+        
+        size: float = SLURP_SIZE / 1000000
+        
+        for engine in ENGINES:
+            seconds: float = best_time(lambda: run_source(source, engine))
+            
+            with open(source_path, "rb") as source_file:
+                with open(target_path, "rb") as target_file:
+                    if source_file.read() != target_file.read():
+                        print(f"slurp ({engine}): copy does not match")
+            
+            print(
+                    f"slurp ({engine}): {size:.2f} MB, {seconds:.3f}s, "
+                    f"{size / seconds:.2f} MB/s")
+
+
+def benchmark_stream() -> None:
+    """
+    Report the peak memory of parsing a large file after reading and
+    scanning all of it, and while lazily scanning it.
+    """
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, "stream.lox")
+        
+        with open(path, "w") as file:
+            source: str = read_krox_source()
+            
+            for i in range(STREAM_COPIES):
+                file.write(source)
+        
+        size: float = os.path.getsize(path) / 1000000
+        
+        def parse_list() -> list[Stmt]:
+            with open(path) as file:
+                error_reporter: ErrorReporter = ErrorReporter()
+                tokens: list[Token] = RegexScanner(
+                        error_reporter, file.read()).scan_tokens()
+                return Parser(error_reporter, tokens).parse()
+        
+        def parse_stream() -> list[Stmt]:
+            with open(path) as file:
+                error_reporter: ErrorReporter = ErrorReporter()
+                scanner: RegexScanner = RegexScanner(error_reporter, "")
+                return Parser(error_reporter, scanner.scan_file(file)).parse()
+        
+        for name, parse in (("list", parse_list), ("stream", parse_stream)):
+            statements: Any
+            statements, peak = traced_peak(parse)
+            del statements
+            print(
+                    f"stream ({name}): {size:.2f} MB file, "
+                    f"{peak / 1000000:.2f} MB peak")
+
+
+def benchmark_strings() -> None:
+    """
+    Report the time of building a long string a character at a time and
+    reversing it with substrings.
+    """
+    
+    source: str = (
+            'var message = "";\n'
+            f"for(var i = 0; i < {STRINGS_LENGTH}; i = i + 1){{\n"
+            "    message = message + _chr(97 + i - _trunc(i / 26) * 26);\n"
+            "}\n"
+            'var backwards = "";\n'
+            "for(var i = _length(message) - 1; i >= 0; i = i - 1){\n"
+            "    backwards = backwards + _substring(message, i, 1);\n"
+            "}\n")
+    
+    for engine in ENGINES:
+        seconds: float = best_time(
+                lambda: run_source(source, engine), repeats=3)
+        print(
+                f"strings ({engine}): {STRINGS_LENGTH} characters, "
+                f"{seconds:.3f}s")
+
+
+def benchmark_tail() -> None:
+    """
+    Report the time of tail recursion that is much deeper than the
+    maximum depth of nested Lox calls. Only the tree and closure engines
+    eliminate tail calls, so the other implementations cannot run it.
+    """
+    
+    source: str = (
+            "fun count(n, total){\n"
+            "    if(n <= 0){\n"
+            "        return total;\n"
+            "    }\n"
+            "    \n"
+            "    return count(n - 1, total + 1);\n"
+            "}\n"
+            "\n"
+            "fun is_even(n){\n"
+            "    if(n == 0){\n"
+            "        return true;\n"
+            "    }\n"
+            "    \n"
+            "    return is_odd(n - 1);\n"
+            "}\n"
+            "\n"
+            "fun is_odd(n){\n"
+            "    if(n == 0){\n"
+            "        return false;\n"
+            "    }\n"
+            "    \n"
+            "    return is_even(n - 1);\n"
+            "}\n"
+            "\n"
+            f"var total = count({TAIL_DEPTH}, 0);\n"
+            f"var is_even_depth = is_even({TAIL_DEPTH + 1});\n")
+    
+    for engine in ("tree", "closure"):
+        seconds: float = best_time(
+                lambda: run_source(source, engine), repeats=3)
+        print(f"tail ({engine}): {TAIL_DEPTH} calls deep, {seconds:.3f}s")
+
+
+BENCHMARKS: dict[str, Callable[[], None]] = {
+    "cat": benchmark_cat,
+    "handles": benchmark_handles,
+    "instances": benchmark_instances,
+    "layout": benchmark_layout,
+    "memory": benchmark_memory,
+    "parser": benchmark_parser,
+    "scanner": benchmark_scanner,
+    "slurp": benchmark_slurp,
+    "stream": benchmark_stream,
+    "strings": benchmark_strings,
+    "tail": benchmark_tail,
+}
+""" The available benchmarks by name. """
+
+def main(args: list[str]) -> None:
+    """ Run benchmarks from their names, or all benchmarks. """
+    
+    for name in args or list(BENCHMARKS):
+        if name not in BENCHMARKS:
+            print(f"Usage: lox_benchmark.py [{'|'.join(BENCHMARKS)}]...")
+            sys.exit(64)
+        
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,98 @@
+from lox_error_reporter import ErrorReporter
+from lox_parser import Parser
+from lox_token import Token
+from lox_token_buffer import TokenBuffer
+from lox_token_type import TokenType
+from typing import Self
+
+class BufferParser(Parser):
+    """
+    Parses an abstract syntax tree from a token buffer. Token types are
+    matched by their type values in the buffer, so a `Token` is only
+    created for tokens that are kept in the tree or reported in errors.
+    Type values are read with `_value_` because the `value` property of
+    an enum member is much slower.
+    """
+    
+    EOF_VALUE: int = TokenType.EOF._value_
+    """ The type value of end of file tokens. """
+    
+    buffer: TokenBuffer
+    """ The token buffer to parse. """
+    
+    position: int = 0
+    """ The index of the current token in the token buffer. """
+    
+    def __init__(
+            self: Self,
+            error_reporter: ErrorReporter, buffer: TokenBuffer) -> None:
+        """ Initialize the buffer parser. """
+        
+        self.error_reporter = error_reporter
+        self.buffer = buffer
+    
+    
+    def match(self: Self, *types: TokenType) -> bool:
+        """
+        Consume the current token if it matches a set of types and
+        return whether the token was consumed.
+        """
+        
+        value: int = self.buffer.types[self.position]
+        
+        if value == self.EOF_VALUE:
+            return False
+        
+        for type in types:
+            if type._value_ == value:
+                self.position += 1
+                return True
+        
+        return False
+    
+    
+    def check(self: Self, type: TokenType) -> bool:
+        """ Return whether the current token matches a type. """
+        
+        value: int = self.buffer.types[self.position]
+        return value != self.EOF_VALUE and value == type._value_
+    
+    
+    def advance(self: Self) -> Token:
+        """ Consume and return the current token. """
+        
+        if not self.is_at_end():
+            self.position += 1
+        
+        return self.previous()
+    
+    
+    def skip(self: Self) -> None:
+        """ Consume the current token without creating it. """
+        
+        if not self.is_at_end():
+            self.position += 1
+    
+    
+    def is_at_end(self: Self) -> bool:
+        """ Return whether all of the tokens have been consumed. """
+        
+        return self.buffer.types[self.position] == self.EOF_VALUE
+    
+    
+    def peek_type(self: Self) -> TokenType:
+        """ Peek the current token's type. """
+        
+        return self.buffer.TYPES[self.buffer.types[self.position]]
+    
+    
+    def peek(self: Self) -> Token:
+        """ Peek the current token. """
+        
+        return self.buffer.token(self.position)
+    
+    
+    def previous(self: Self) -> Token:
+        """ Peek the previous token. """
+        
+        return self.buffer.token(self.position - 1)
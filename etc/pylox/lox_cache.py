@@ -0,0 +1,156 @@
+import hashlib
+import os
+import pickle
+import sys
+
+from lox_environment import GlobalEnvironment
+from lox_inline_cache import InlineCache
+from lox_interpreter import Interpreter
+from lox_stmt import Stmt
+from typing import Any, Self
+
+class ProgramCache:
+    """
+    Caches resolved programs on disk so that the scanner, parser and
+    resolver can be skipped when a script has not changed. Each script
+    has one cache file in a cache directory next to it. A cache file is
+    keyed by a hash of the script's source code and of the interpreter's
+    own source code, so it is invalidated automatically when either
+    changes.
+    """
+    
+    DIRECTORY: str = "__loxcache__"
+    """ The name of the cache directories next to scripts. """
+    
+    RECURSION_LIMIT: int = 0x1000
+    """
+    The recursion limit to pickle and unpickle programs with. Pickling
+    recurses through native code, so the limit is kept low enough for
+    the main thread's stack. Programs that are too deep to pickle within
+    this limit are not cached.
+    """
+    
+    interpreter: Interpreter
+    """ The interpreter that programs are resolved with. """
+    
+    version: str | None = None
+    """
+    The hash of the interpreter's source code, or `None` if it has not
+    been hashed.
+    """
+    
+    def __init__(self: Self, interpreter: Interpreter) -> None:
+        """ Initialize the program cache. """
+        
+        self.interpreter = interpreter
+    
+    
+    def get_path(self: Self, path: str) -> str:
+        """ Return a script's cache file path. """
+        
+        directory, name = os.path.split(os.path.abspath(path))
+        return os.path.join(directory, self.DIRECTORY, f"{name}.pickle")
+    
+    
+    def get_version(self: Self) -> str:
+        """ Return the hash of the interpreter's source code. """
+        
+        if self.version is None:
+            digest: Any = hashlib.sha256(sys.version.encode())
+            directory: str = os.path.dirname(os.path.abspath(__file__))
+            
+            for name in sorted(os.listdir(directory)):
+                if name.startswith("lox") and name.endswith(".py"):
+                    with open(os.path.join(directory, name), "rb") as file:
+                        digest.update(file.read())
+            
+            self.version = digest.hexdigest()
+        
+        return self.version
+    
+    
+    def get_key(self: Self, path: str) -> str:
+        """
+        Return a script's cache key. Programs resolved for profiling
+        are keyed separately because they also track inline caches.
+        """
+        
+        with open(path, "rb") as file:
+            digest: Any = hashlib.file_digest(file, "sha256")
+        
+        digest.update(self.get_version().encode())
+        
+        if self.interpreter.profile:
+            digest.update(b"profile")
+        
+        return digest.hexdigest()
+    
+    
+    def load(self: Self, path: str, key: str) -> list[Stmt] | None:
+        """
+        Load a script's resolved program if it is cached with a key.
+        Return `None` if it is not cached, is out of date or could not
+        be loaded.
+        """
+        
+        recursion_limit: int = sys.getrecursionlimit()
+        
+        try:
+            with open(self.get_path(path), "rb") as file:
+                if file.readline().decode().strip() != key:
+                    return None
+                
+                statements: list[Stmt]
+                caches: list[InlineCache]
+                names: dict[str, int]
+                sys.setrecursionlimit(self.RECURSION_LIMIT)
+                statements, caches, names = pickle.load(file)
+        except (
+                OSError, pickle.UnpicklingError, EOFError, AttributeError,
+                ImportError, RecursionError, UnicodeDecodeError):
+            return None
+        finally:
+            sys.setrecursionlimit(recursion_limit)
+        
+        globals: GlobalEnvironment = self.interpreter.globals
+        
+        for name, slot in sorted(names.items(), key=lambda item: item[1]):
+            if globals.intern(name) != slot:
+                return None
+        
+        self.interpreter.inline_caches.extend(caches)
+        return statements
+    
+    
+    def store(self: Self, path: str, key: str, statements: list[Stmt]) -> None:
+        """
+        Store a script's resolved program with a key. The program is
+        not cached if it could not be stored.
+        """
+        
+        cache_path: str = self.get_path(path)
+        recursion_limit: int = sys.getrecursionlimit()
+        
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            
+            with open(cache_path, "wb") as file:
+                file.write(f"{key}\n".encode())
+                program: tuple[Any, ...] = (
+                        statements, self.interpreter.inline_caches,
+                        self.interpreter.globals.names)
+                sys.setrecursionlimit(self.RECURSION_LIMIT)
+                pickle.dump(program, file, pickle.HIGHEST_PROTOCOL)
+        except (OSError, pickle.PicklingError, RecursionError, TypeError):
+            self.clear(path)
+        finally:
+            sys.setrecursionlimit(recursion_limit)
+    
+    
+    def clear(self: Self, path: str) -> None:
+        """ Remove a script's cached program if it has one. """
+        
+        try:
+            os.remove(self.get_path(path))
+        except OSError:
+            pass
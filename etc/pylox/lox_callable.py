@@ -3,6 +3,8 @@ from typing import Any, Self
 class LoxCallable:
     """ An object that is callable by Lox. """
     
+    __slots__ = ()
+    
     def arity(self: Self) -> int:
         """ Return the Lox callable's arity. """
         
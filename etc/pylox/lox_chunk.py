@@ -0,0 +1,189 @@
+from array import array
+from enum import IntEnum, auto
+from lox_token import Token
+from typing import Any, Self
+
+class OpCode(IntEnum):
+    """ A bytecode instruction's operation. """
+    
+    CONSTANT = auto()
+    """ Push a constant. """
+    
+    NIL = auto()
+    """ Push `nil`. """
+    
+    TRUE = auto()
+    """ Push `true`. """
+    
+    FALSE = auto()
+    """ Push `false`. """
+    
+    POP = auto()
+    """ Pop a value. """
+    
+    GET_LOCAL = auto()
+    """ Push a local variable. """
+    
+    SET_LOCAL = auto()
+    """ Assign a local variable. """
+    
+    GET_GLOBAL = auto()
+    """ Push a global variable. """
+    
+    DEFINE_GLOBAL = auto()
+    """ Pop a value into a new global variable. """
+    
+    SET_GLOBAL = auto()
+    """ Assign an existing global variable. """
+    
+    GET_UPVALUE = auto()
+    """ Push an upvalue. """
+    
+    SET_UPVALUE = auto()
+    """ Assign an upvalue. """
+    
+    GET_PROPERTY = auto()
+    """ Replace an instance with one of its properties. """
+    
+    SET_PROPERTY = auto()
+    """ Assign a field on an instance. """
+    
+    GET_SUPER = auto()
+    """ Replace a superclass with one of its methods bound to `this`. """
+    
+    EQUAL = auto()
+    """ `==`. """
+    
+    GREATER = auto()
+    """ `>`. """
+    
+    LESS = auto()
+    """ `<`. """
+    
+    ADD = auto()
+    """ `+`. """
+    
+    SUBTRACT = auto()
+    """ Binary `-`. """
+    
+    MULTIPLY = auto()
+    """ `*`. """
+    
+    DIVIDE = auto()
+    """ `/`. """
+    
+    NOT = auto()
+    """ `!`. """
+    
+    NEGATE = auto()
+    """ Unary `-`. """
+    
+    PRINT = auto()
+    """ Pop and print a value. """
+    
+    JUMP = auto()
+    """ Jump forwards. """
+    
+    JUMP_IF_FALSE = auto()
+    """ Jump forwards if the top value is falsey. """
+    
+    LOOP = auto()
+    """ Jump backwards. """
+    
+    CALL = auto()
+    """ Call a value. """
+    
+    INVOKE = auto()
+    """ Call a method or field on an instance. """
+    
+    SUPER_INVOKE = auto()
+    """ Call a method from a superclass. """
+    
+    CLOSURE = auto()
+    """ Push a new closure around a function. """
+    
+    CLOSE_UPVALUE = auto()
+    """ Move a local variable off the stack and pop it. """
+    
+    RETURN = auto()
+    """ Return from the current function. """
+    
+    CLASS = auto()
+    """ Push a new class. """
+    
+    INHERIT = auto()
+    """ Copy a superclass' methods down into a subclass. """
+    
+    METHOD = auto()
+    """ Add a method to a class. """
+
+
+class Chunk:
+    """ A chunk of bytecode instructions and constants. """
+    
+    CONSTANTS_MAX: int = 0x10000
+    """ The maximum number of constants in a chunk. """
+    
+    code: array
+    """ The chunk's bytecode. """
+    
+    lines: array
+    """ The line number of each byte in the chunk's bytecode. """
+    
+    constants: list[Any]
+    """ The chunk's constant values. """
+    
+    constant_ids: dict[tuple[type, Any], int]
+    """ The chunk's constant IDs by type and value. """
+    
+    tokens: dict[int, Token]
+    """
+    The chunk's tokens for reporting runtime errors by the offset of
+    the byte that reports them.
+    """
+    
+    def __init__(self: Self) -> None:
+        """ Initialize the chunk. """
+        
+        self.code = array("B")
+        self.lines = array("i")
+        self.constants = []
+        self.constant_ids = {}
+        self.tokens = {}
+    
+    
+    def write(self: Self, byte: int, line: int) -> None:
+        """ Write a byte to the chunk's bytecode. """
+        
+        self.code.append(byte)
+        self.lines.append(line)
+    
+    
+    def write_short(self: Self, value: int, line: int) -> None:
+        """ Write a big-endian 16-bit integer to the chunk's bytecode. """
+        
+        self.write((value >> 8) & 0xff, line)
+        self.write(value & 0xff, line)
+    
+    
+    def write_token(self: Self, token: Token) -> None:
+        """ Set the token reported by the next byte to be written. """
+        
+        self.tokens[len(self.code)] = token
+    
+    
+    def add_constant(self: Self, value: Any) -> int:
+        """
+        Add a constant to the chunk and return its ID. Equal constants
+        of the same type are merged to the same ID.
+        """
+        
+        key: tuple[type, Any] = (type(value), value)
+        id: int | None = self.constant_ids.get(key)
+        
+        if id is None:
+            id = len(self.constants)
+            self.constants.append(value)
+            self.constant_ids[key] = id
+        
+        return id
@@ -1,13 +1,14 @@
 from lox_callable import LoxCallable
-from lox_error_reporter import ErrorReporter
 from lox_function import LoxFunction
+from lox_shape import Shape
 from typing import Any, Self
 
 class LoxClass(LoxCallable):
     """ A user-defined Lox class. """
     
-    error_reporter: ErrorReporter
-    """ The class' error reporter. """
+    __slots__ = (
+            "name", "superclass", "methods", "shape", "initializer",
+            "initializer_arity")
     
     name: str
     """ The class' name. """
@@ -16,18 +17,45 @@ class LoxClass(LoxCallable):
     """ The class' superclass. """
     
     methods: dict[str, LoxFunction]
-    """ The class' methods. """
+    """
+    The class' methods, including methods copied down from its
+    superclasses.
+    """
+    
+    shape: Shape
+    """ The initial empty shape of the class' instances. """
+    
+    initializer: LoxFunction | None
+    """ The class' initializer, or `None` if it has no initializer. """
+    
+    initializer_arity: int
+    """ The class' cached arity. """
     
     def __init__(
-            self: Self, error_reporter: ErrorReporter, name: str,
-            superclass: Self | None, methods: dict[str, LoxFunction]) -> None:
+            self: Self, name: str, superclass: Self | None,
+            methods: dict[str, LoxFunction]) -> None:
         """ Initialize the class. """
         
         super().__init__()
-        self.error_reporter = error_reporter
         self.name = name
         self.superclass = superclass
-        self.methods = methods
+        
+        # Methods never change after a class is created, so inherited
+        # methods can be copied down once instead of being looked up
+        # through the superclass chain on every access.
+        if superclass is None:
+            self.methods = methods
+        else:
+            self.methods = superclass.methods.copy()
+            self.methods.update(methods)
+        
+        self.shape = Shape({})
+        self.initializer = self.methods.get("init")
+        
+        if self.initializer is None:
+            self.initializer_arity = 0
+        else:
+            self.initializer_arity = self.initializer.arity()
     
     
     def __repr__(self: Self) -> str:
@@ -39,12 +67,7 @@ class LoxClass(LoxCallable):
     def arity(self: Self) -> int:
         """ Return the class' arity. """
         
-        initializer: LoxFunction | None = self.find_method("init")
-        
-        if initializer is None:
-            return 0
-        else:
-            return initializer.arity()
+        return self.initializer_arity
     
     
     def call(self: Self, arguments: list[Any]) -> Any:
@@ -53,11 +76,12 @@ class LoxClass(LoxCallable):
         # Workaround for circular import.
         from lox_instance import LoxInstance
         
-        instance: LoxInstance = LoxInstance(self.error_reporter, self)
-        initializer: LoxFunction | None = self.find_method("init")
+        instance: LoxInstance = LoxInstance(self)
+        initializer: LoxFunction | None = self.initializer
         
         if initializer is not None:
-            instance.bind_method(initializer).call(arguments)
+            arguments.insert(0, instance)
+            initializer.invoke(arguments)
         
         return instance
     
@@ -65,10 +89,4 @@ class LoxClass(LoxCallable):
     def find_method(self: Self, name: str) -> LoxFunction | None:
         """ Find a method from its name. """
         
-        if name in self.methods:
-            return self.methods[name]
-        
-        if self.superclass is not None:
-            return self.superclass.find_method(name)
-        
-        return None
+        return self.methods.get(name)
@@ -0,0 +1,901 @@
+from collections.abc import Callable
+from lox_callable import LoxCallable
+from lox_class import LoxClass
+from lox_environment import UNDEFINED, Environment, GlobalEnvironment
+from lox_expr import AssignExpr, BinaryExpr, CallExpr, Expr, ExprVisitor
+from lox_expr import GetExpr, GroupingExpr, LiteralExpr, LogicalExpr, SetExpr
+from lox_expr import SuperExpr, ThisExpr, UnaryExpr, VariableExpr
+from lox_function import LoxFunction, Return, TailCall
+from lox_inline_cache import InlineCache
+from lox_instance import LoxInstance
+from lox_interpreter import Interpreter, StackOverflow, stringify
+from lox_intrinsic import print_line
+from lox_stmt import BlockStmt, ClassStmt, ExpressionStmt, FunctionStmt
+from lox_stmt import IfStmt, PrintStmt, ReturnStmt, Stmt, StmtVisitor, VarStmt
+from lox_stmt import WhileStmt
+from lox_string import STRING_TYPES, concatenate
+from lox_token import Token
+from lox_token_type import TokenType
+from typing import Any, Self
+
+StmtClosure = Callable[[Environment], Return | None]
+"""
+A compiled statement that is executed in an environment and returns a
+return signal if it returns from the current function.
+"""
+
+ExprClosure = Callable[[Environment], Any]
+""" A compiled expression that is evaluated in an environment. """
+
+class ClosureCompiler(StmtVisitor, ExprVisitor):
+    """
+    Compiles a resolved AST to nested Python closures so that each node
+    is dispatched once at compile time instead of on every evaluation.
+    """
+    
+    interpreter: Interpreter
+    """
+    The closure compiler's interpreter. Provides resolved local
+    variables, globals, the standard library, and runtime errors.
+    """
+    
+    scope_depth: int
+    """ The closure compiler's current local scope depth. """
+    
+    def __init__(self: Self, interpreter: Interpreter) -> None:
+        """ Initialize the closure compiler. """
+        
+        super().__init__()
+        self.interpreter = interpreter
+        self.scope_depth = 0
+    
+    
+    def interpret(self: Self, statements: list[Stmt]) -> None:
+        """ Compile and execute a list of statements. """
+        
+        program: StmtClosure = self.compile_block(statements)
+        globals: GlobalEnvironment = self.interpreter.globals
+        self.interpreter.install_standard_library()
+        self.interpreter.run(lambda: program(globals))
+    
+    
+    def compile(self: Self, node: Stmt | Expr) -> Any:
+        """ Compile an AST node to a closure. """
+        
+        return node.accept(self)
+    
+    
+    def compile_block(self: Self, statements: list[Stmt]) -> StmtClosure:
+        """
+        Compile a list of statements to a closure that executes them in
+        the environment it is given.
+        """
+        
+        closures: tuple[StmtClosure, ...] = tuple(
+                self.compile(statement) for statement in statements)
+        
+        if len(closures) == 1:
+            return closures[0]
+        
+        def block(environment: Environment) -> Return | None:
+            for closure in closures:
+                completion: Return | None = closure(environment)
+                
+                if completion is not None:
+                    return completion
+            
+            return None
+        
+        return block
+    
+    
+    def compile_function(
+            self: Self, declaration: FunctionStmt
+            ) -> Callable[[list[Stmt], Environment], Return | None]:
+        """ Compile a function declaration to a function executor. """
+        
+        self.scope_depth += 1
+        body: StmtClosure = self.compile_block(declaration.body)
+        self.scope_depth -= 1
+        
+        def executor(
+                statements: list[Stmt],
+                environment: Environment) -> Return | None:
+            return body(environment)
+        
+        return executor
+    
+    
+    def compile_define(
+            self: Self, name: str,
+            value: ExprClosure | None) -> StmtClosure:
+        """
+        Compile a variable definition in the current scope from its
+        name and value.
+        """
+        
+        if self.scope_depth == 0:
+            slots: list[Any] = self.interpreter.globals.slots
+            global_slot: int = self.interpreter.globals.intern(name)
+            
+            if value is None:
+                def define_global_nil(environment: Environment) -> None:
+                    slots[global_slot] = None
+                
+                return define_global_nil
+            
+            def define_global(environment: Environment) -> None:
+                slots[global_slot] = value(environment)
+            
+            return define_global
+        
+        if value is None:
+            def define_local_nil(environment: Environment) -> None:
+                environment.slots.append(None)
+            
+            return define_local_nil
+        
+        def define_local(environment: Environment) -> None:
+            environment.slots.append(value(environment))
+        
+        return define_local
+    
+    
+    def compile_get_local(
+            self: Self, expr: ThisExpr | VariableExpr) -> ExprClosure:
+        """ Compile a local variable lookup from its expression. """
+        
+        distance: int = expr.depth
+        slot: int = expr.slot
+        
+        if distance == 0:
+            def get_local(environment: Environment) -> Any:
+                return environment.slots[slot]
+            
+            return get_local
+        elif distance == 1:
+            def get_enclosing(environment: Environment) -> Any:
+                return environment.enclosing.slots[slot]
+            
+            return get_enclosing
+        
+        def get_ancestor(environment: Environment) -> Any:
+            return environment.ancestor(distance).slots[slot]
+        
+        return get_ancestor
+    
+    
+    def visit_block_stmt(self: Self, stmt: BlockStmt) -> StmtClosure:
+        """ Visit and compile a block statement. """
+        
+        self.scope_depth += 1
+        body: StmtClosure = self.compile_block(stmt.statements)
+        self.scope_depth -= 1
+        
+        def block(environment: Environment) -> Return | None:
+            return body(Environment(environment))
+        
+        return block
+    
+    
+    def visit_class_stmt(self: Self, stmt: ClassStmt) -> StmtClosure:
+        """ Visit and compile a class statement. """
+        
+        error: Callable[[Token, str], RuntimeError] = self.interpreter.error
+        name: str = stmt.name.lexeme
+        superclass_token: Token | None = None
+        superclass_closure: ExprClosure | None = None
+        
+        if stmt.superclass is not None:
+            superclass_token = stmt.superclass.name
+            superclass_closure = self.compile(stmt.superclass)
+        
+        methods: list[tuple[FunctionStmt, Callable[..., Return | None]]] = [
+                (method, self.compile_function(method))
+                for method in stmt.methods]
+        
+        def create_class(environment: Environment) -> Any:
+            superclass: Any = None
+            
+            if superclass_closure is not None:
+                superclass = superclass_closure(environment)
+                
+                if not isinstance(superclass, LoxClass):
+                    raise error(
+                            superclass_token, "Superclass must be a class.")
+            
+            closure: Environment = environment
+            
+            if superclass_closure is not None:
+                closure = Environment(environment)
+                closure.define("super", superclass)
+            
+            functions: dict[str, LoxFunction] = {}
+            
+            for method, executor in methods:
+                functions[method.name.lexeme] = LoxFunction(
+                        executor, method, closure,
+                        method.name.lexeme == "init")
+            
+            return LoxClass(name, superclass, functions)
+        
+        return self.compile_define(name, create_class)
+    
+    
+    def visit_expression_stmt(self: Self, stmt: ExpressionStmt) -> StmtClosure:
+        """ Visit and compile an expression statement. """
+        
+        expression: ExprClosure = self.compile(stmt.expression)
+        
+        # Discard the value so it is not mistaken for a return signal.
+        def evaluate(environment: Environment) -> None:
+            expression(environment)
+        
+        return evaluate
+    
+    
+    def visit_function_stmt(self: Self, stmt: FunctionStmt) -> StmtClosure:
+        """ Visit and compile a function statement. """
+        
+        name: str = stmt.name.lexeme
+        executor: Callable[..., Return | None] = self.compile_function(stmt)
+        
+        def create_function(environment: Environment) -> Any:
+            return LoxFunction(executor, stmt, environment, False)
+        
+        return self.compile_define(name, create_function)
+    
+    
+    def visit_if_stmt(self: Self, stmt: IfStmt) -> StmtClosure:
+        """ Visit and compile an if statement. """
+        
+        condition: ExprClosure = self.compile(stmt.condition)
+        then_branch: StmtClosure = self.compile(stmt.then_branch)
+        
+        if stmt.else_branch is None:
+            def if_then(environment: Environment) -> Return | None:
+                value: Any = condition(environment)
+                
+                if value is not None and value is not False:
+                    return then_branch(environment)
+                
+                return None
+            
+            return if_then
+        
+        else_branch: StmtClosure = self.compile(stmt.else_branch)
+        
+        def if_then_else(environment: Environment) -> Return | None:
+            value: Any = condition(environment)
+            
+            if value is not None and value is not False:
+                return then_branch(environment)
+            
+            return else_branch(environment)
+        
+        return if_then_else
+    
+    
+    def visit_print_stmt(self: Self, stmt: PrintStmt) -> StmtClosure:
+        """ Visit and compile a print statement. """
+        
+        expression: ExprClosure = self.compile(stmt.expression)
+        
+        def print_value(environment: Environment) -> None:
+            print_line(stringify(expression(environment)))
+        
+        return print_value
+    
+    
+    def visit_return_stmt(self: Self, stmt: ReturnStmt) -> StmtClosure:
+        """ Visit and compile a return statement. """
+        
+        if stmt.value is None:
+            def return_nil(environment: Environment) -> Return:
+                return Return(None)
+            
+            return return_nil
+        
+        value: ExprClosure = self.compile(stmt.value)
+        
+        if isinstance(stmt.value, CallExpr) and stmt.value.is_tail:
+            # Calls in tail position evaluate to a tail call signal.
+            def return_call(environment: Environment) -> Return:
+                result: Any = value(environment)
+                
+                if type(result) is TailCall:
+                    return result
+                
+                return Return(result)
+            
+            return return_call
+        
+        def return_value(environment: Environment) -> Return:
+            return Return(value(environment))
+        
+        return return_value
+    
+    
+    def visit_var_stmt(self: Self, stmt: VarStmt) -> StmtClosure:
+        """ Visit and compile a var statement. """
+        
+        if stmt.initializer is None:
+            return self.compile_define(stmt.name.lexeme, None)
+        
+        return self.compile_define(
+                stmt.name.lexeme, self.compile(stmt.initializer))
+    
+    
+    def visit_while_stmt(self: Self, stmt: WhileStmt) -> StmtClosure:
+        """ Visit and compile a while statement. """
+        
+        condition: ExprClosure = self.compile(stmt.condition)
+        body: StmtClosure = self.compile(stmt.body)
+        
+        def loop(environment: Environment) -> Return | None:
+            value: Any = condition(environment)
+            
+            while value is not None and value is not False:
+                completion: Return | None = body(environment)
+                
+                if completion is not None:
+                    return completion
+                
+                value = condition(environment)
+            
+            return None
+        
+        return loop
+    
+    
+    def visit_assign_expr(self: Self, expr: AssignExpr) -> ExprClosure:
+        """ Visit and compile an assign expression. """
+        
+        value: ExprClosure = self.compile(expr.value)
+        name: Token = expr.name
+        
+        if expr.depth < 0:
+            globals: GlobalEnvironment = self.interpreter.globals
+            slots: list[Any] = globals.slots
+            global_slot: int = expr.slot
+            
+            def assign_global(environment: Environment) -> Any:
+                result: Any = value(environment)
+                
+                if slots[global_slot] is UNDEFINED:
+                    globals.undefined(name)
+                
+                slots[global_slot] = result
+                return result
+            
+            return assign_global
+        
+        distance: int = expr.depth
+        slot: int = expr.slot
+        
+        if distance == 0:
+            def assign_local(environment: Environment) -> Any:
+                result: Any = value(environment)
+                environment.slots[slot] = result
+                return result
+            
+            return assign_local
+        
+        def assign_ancestor(environment: Environment) -> Any:
+            result: Any = value(environment)
+            environment.ancestor(distance).slots[slot] = result
+            return result
+        
+        return assign_ancestor
+    
+    
+    def visit_binary_expr(self: Self, expr: BinaryExpr) -> ExprClosure:
+        """ Visit and compile a binary expression. """
+        
+        left: ExprClosure = self.compile(expr.left)
+        right: ExprClosure = self.compile(expr.right)
+        operator: Token = expr.operator
+        error: Callable[[Token, str], RuntimeError] = self.interpreter.error
+        
+        match operator.type:
+            case TokenType.GREATER:
+                def greater(environment: Environment) -> Any:
+                    a: Any = left(environment)
+                    b: Any = right(environment)
+                    
+                    if type(a) is not float or type(b) is not float:
+                        raise error(operator, "Operands must both be numbers.")
+                    
+                    return a > b
+                
+                return greater
+            case TokenType.GREATER_EQUAL:
+                def greater_equal(environment: Environment) -> Any:
+                    a: Any = left(environment)
+                    b: Any = right(environment)
+                    
+                    if type(a) is not float or type(b) is not float:
+                        raise error(operator, "Operands must both be numbers.")
+                    
+                    return a >= b
+                
+                return greater_equal
+            case TokenType.LESS:
+                def less(environment: Environment) -> Any:
+                    a: Any = left(environment)
+                    b: Any = right(environment)
+                    
+                    if type(a) is not float or type(b) is not float:
+                        raise error(operator, "Operands must both be numbers.")
+                    
+                    return a < b
+                
+                return less
+            case TokenType.LESS_EQUAL:
+                def less_equal(environment: Environment) -> Any:
+                    a: Any = left(environment)
+                    b: Any = right(environment)
+                    
+                    if type(a) is not float or type(b) is not float:
+                        raise error(operator, "Operands must both be numbers.")
+                    
+                    return a <= b
+                
+                return less_equal
+            case TokenType.BANG_EQUAL:
+                def not_equal(environment: Environment) -> Any:
+                    a: Any = left(environment)
+                    b: Any = right(environment)
+                    
+                    if type(a) is type(b):
+                        return a != b
+                    
+                    return (type(a) not in STRING_TYPES
+                            or type(b) not in STRING_TYPES or a != b)
+                
+                return not_equal
+            case TokenType.EQUAL_EQUAL:
+                def equal(environment: Environment) -> Any:
+                    a: Any = left(environment)
+                    b: Any = right(environment)
+                    
+                    if type(a) is type(b):
+                        return a == b
+                    
+                    return (type(a) in STRING_TYPES
+                            and type(b) in STRING_TYPES and a == b)
+                
+                return equal
+            case TokenType.MINUS:
+                def subtract(environment: Environment) -> Any:
+                    a: Any = left(environment)
+                    b: Any = right(environment)
+                    
+                    if type(a) is not float or type(b) is not float:
+                        raise error(operator, "Operands must both be numbers.")
+                    
+                    return a - b
+                
+                return subtract
+            case TokenType.PLUS:
+                def add(environment: Environment) -> Any:
+                    a: Any = left(environment)
+                    b: Any = right(environment)
+                    
+                    if type(a) is float and type(b) is float:
+                        return a + b
+                    
+                    if type(a) in STRING_TYPES and type(b) in STRING_TYPES:
+                        return concatenate(a, b)
+                    
+                    raise error(
+                            operator,
+                            "Operands must both be numbers or strings.")
+                
+                return add
+            case TokenType.SLASH:
+                def divide(environment: Environment) -> Any:
+                    a: Any = left(environment)
+                    b: Any = right(environment)
+                    
+                    if type(a) is not float or type(b) is not float:
+                        raise error(operator, "Operands must both be numbers.")
+                    
+                    if b == 0.0:
+                        raise error(operator, "Cannot divide by zero.")
+                    
+                    return a / b
+                
+                return divide
+            case TokenType.STAR:
+                def multiply(environment: Environment) -> Any:
+                    a: Any = left(environment)
+                    b: Any = right(environment)
+                    
+                    if type(a) is not float or type(b) is not float:
+                        raise error(operator, "Operands must both be numbers.")
+                    
+                    return a * b
+                
+                return multiply
+        
+        def unimplemented(environment: Environment) -> Any:
+            left(environment)
+            right(environment)
+            raise error(operator, "Unimplemented binary operator.")
+        
+        return unimplemented
+    
+    
+    def visit_call_expr(self: Self, expr: CallExpr) -> ExprClosure:
+        """ Visit and compile a call expression. """
+        
+        if isinstance(expr.callee, GetExpr):
+            return self.compile_invoke(expr, expr.callee)
+        elif isinstance(expr.callee, SuperExpr):
+            return self.compile_super_invoke(expr, expr.callee)
+        
+        callee: ExprClosure = self.compile(expr.callee)
+        arguments: tuple[ExprClosure, ...] = tuple(
+                self.compile(argument) for argument in expr.arguments)
+        paren: Token = expr.paren
+        error: Callable[[Token, str], RuntimeError] = self.interpreter.error
+        interpreter: Interpreter = self.interpreter
+        tail: bool = expr.is_tail
+        
+        def call(environment: Environment) -> Any:
+            function: Any = callee(environment)
+            values: list[Any] = [
+                    argument(environment) for argument in arguments]
+            
+            if not isinstance(function, LoxCallable):
+                raise error(paren, "Can only call functions and classes.")
+            
+            arity: int = function.arity()
+            
+            if len(values) != arity:
+                raise error(
+                        paren,
+                        f"Expected {arity} arguments but got {len(values)}.")
+            
+            if tail and type(function) is LoxFunction:
+                if function.receiver is not None:
+                    values.insert(0, function.receiver)
+                
+                return TailCall(function, values)
+            
+            interpreter.depth += 1
+            
+            if interpreter.depth > interpreter.max_depth:
+                raise error(paren, "Stack overflow.")
+            
+            try:
+                result: Any = function.call(values)
+            except RecursionError:
+                raise StackOverflow(paren)
+            
+            interpreter.depth -= 1
+            return result
+        
+        return call
+    
+    
+    def compile_invoke(
+            self: Self, expr: CallExpr, get: GetExpr) -> ExprClosure:
+        """
+        Compile a call to a property of an instance. Methods are called
+        without binding them to the instance.
+        """
+        
+        object: ExprClosure = self.compile(get.object)
+        arguments: tuple[ExprClosure, ...] = tuple(
+                self.compile(argument) for argument in expr.arguments)
+        name: Token = get.name
+        cache: InlineCache = get.cache
+        paren: Token = expr.paren
+        error: Callable[[Token, str], RuntimeError] = self.interpreter.error
+        interpreter: Interpreter = self.interpreter
+        tail: bool = expr.is_tail
+        
+        def invoke(environment: Environment) -> Any:
+            instance: Any = object(environment)
+            
+            if not isinstance(instance, LoxInstance):
+                raise error(name, "Only instances have properties.")
+            
+            function: Any = instance.get_field(name.lexeme, cache)
+            result: Any
+            
+            if function is not UNDEFINED:
+                values: list[Any] = [
+                        argument(environment) for argument in arguments]
+                
+                if not isinstance(function, LoxCallable):
+                    raise error(paren, "Can only call functions and classes.")
+                
+                arity: int = function.arity()
+                
+                if len(values) != arity:
+                    raise error(
+                            paren,
+                            f"Expected {arity} arguments but got "
+                            f"{len(values)}.")
+                
+                if tail and type(function) is LoxFunction:
+                    if function.receiver is not None:
+                        values.insert(0, function.receiver)
+                    
+                    return TailCall(function, values)
+                
+                interpreter.depth += 1
+                
+                if interpreter.depth > interpreter.max_depth:
+                    raise error(paren, "Stack overflow.")
+                
+                try:
+                    result = function.call(values)
+                except RecursionError:
+                    raise StackOverflow(paren)
+                
+                interpreter.depth -= 1
+                return result
+            
+            method: LoxFunction | None = cache.lookup(instance.klass)
+            
+            if method is None:
+                raise error(name, f"Undefined property `{name.lexeme}`.")
+            
+            slots: list[Any] = [instance]
+            
+            for argument in arguments:
+                slots.append(argument(environment))
+            
+            if len(arguments) != method.arity():
+                raise error(
+                        paren,
+                        f"Expected {method.arity()} arguments but got "
+                        f"{len(arguments)}.")
+            
+            if tail:
+                return TailCall(method, slots)
+            
+            interpreter.depth += 1
+            
+            if interpreter.depth > interpreter.max_depth:
+                raise error(paren, "Stack overflow.")
+            
+            try:
+                result = method.invoke(slots)
+            except RecursionError:
+                raise StackOverflow(paren)
+            
+            interpreter.depth -= 1
+            return result
+        
+        return invoke
+    
+    
+    def compile_super_invoke(
+            self: Self, expr: CallExpr, callee: SuperExpr) -> ExprClosure:
+        """
+        Compile a call to a superclass method without binding it to the
+        instance.
+        """
+        
+        distance: int = callee.depth
+        slot: int = callee.slot
+        arguments: tuple[ExprClosure, ...] = tuple(
+                self.compile(argument) for argument in expr.arguments)
+        name: Token = callee.method
+        paren: Token = expr.paren
+        error: Callable[[Token, str], RuntimeError] = self.interpreter.error
+        interpreter: Interpreter = self.interpreter
+        tail: bool = expr.is_tail
+        
+        def super_invoke(environment: Environment) -> Any:
+            superclass: LoxClass = environment.get_at(distance, slot)
+            slots: list[Any] = [environment.get_at(distance - 1, 0)]
+            method: LoxFunction | None = superclass.find_method(name.lexeme)
+            
+            if method is None:
+                raise error(name, f"Undefined property `{name.lexeme}`.")
+            
+            for argument in arguments:
+                slots.append(argument(environment))
+            
+            if len(arguments) != method.arity():
+                raise error(
+                        paren,
+                        f"Expected {method.arity()} arguments but got "
+                        f"{len(arguments)}.")
+            
+            if tail:
+                return TailCall(method, slots)
+            
+            interpreter.depth += 1
+            
+            if interpreter.depth > interpreter.max_depth:
+                raise error(paren, "Stack overflow.")
+            
+            try:
+                result: Any = method.invoke(slots)
+            except RecursionError:
+                raise StackOverflow(paren)
+            
+            interpreter.depth -= 1
+            return result
+        
+        return super_invoke
+    
+    
+    def visit_get_expr(self: Self, expr: GetExpr) -> ExprClosure:
+        """ Visit and compile a get expression. """
+        
+        object: ExprClosure = self.compile(expr.object)
+        name: Token = expr.name
+        cache: InlineCache = expr.cache
+        error: Callable[[Token, str], RuntimeError] = self.interpreter.error
+        
+        def get(environment: Environment) -> Any:
+            instance: Any = object(environment)
+            
+            if not isinstance(instance, LoxInstance):
+                raise error(name, "Only instances have properties.")
+            
+            value: Any = instance.get(name, cache)
+            
+            if value is UNDEFINED:
+                raise error(name, f"Undefined property `{name.lexeme}`.")
+            
+            return value
+        
+        return get
+    
+    
+    def visit_grouping_expr(self: Self, expr: GroupingExpr) -> ExprClosure:
+        """ Visit and compile a grouping expression. """
+        
+        return self.compile(expr.expression)
+    
+    
+    def visit_literal_expr(self: Self, expr: LiteralExpr) -> ExprClosure:
+        """ Visit and compile a literal expression. """
+        
+        value: Any = expr.value
+        
+        def literal(environment: Environment) -> Any:
+            return value
+        
+        return literal
+    
+    
+    def visit_logical_expr(self: Self, expr: LogicalExpr) -> ExprClosure:
+        """ Visit and compile a logical expression. """
+        
+        left: ExprClosure = self.compile(expr.left)
+        right: ExprClosure = self.compile(expr.right)
+        
+        if expr.operator.type == TokenType.OR:
+            def logical_or(environment: Environment) -> Any:
+                value: Any = left(environment)
+                
+                if value is not None and value is not False:
+                    return value
+                
+                return right(environment)
+            
+            return logical_or
+        
+        def logical_and(environment: Environment) -> Any:
+            value: Any = left(environment)
+            
+            if value is None or value is False:
+                return value
+            
+            return right(environment)
+        
+        return logical_and
+    
+    
+    def visit_set_expr(self: Self, expr: SetExpr) -> ExprClosure:
+        """ Visit and compile a set expression. """
+        
+        object: ExprClosure = self.compile(expr.object)
+        value: ExprClosure = self.compile(expr.value)
+        name: Token = expr.name
+        cache: InlineCache = expr.cache
+        error: Callable[[Token, str], RuntimeError] = self.interpreter.error
+        
+        def set(environment: Environment) -> Any:
+            instance: Any = object(environment)
+            
+            if not isinstance(instance, LoxInstance):
+                raise error(name, "Only instances have fields.")
+            
+            result: Any = value(environment)
+            instance.set(name, result, cache)
+            return result
+        
+        return set
+    
+    
+    def visit_super_expr(self: Self, expr: SuperExpr) -> ExprClosure:
+        """ Visit and compile a super expression. """
+        
+        distance: int = expr.depth
+        slot: int = expr.slot
+        method: Token = expr.method
+        error: Callable[[Token, str], RuntimeError] = self.interpreter.error
+        
+        def get_super(environment: Environment) -> Any:
+            superclass: LoxClass = environment.get_at(distance, slot)
+            object: LoxInstance = environment.get_at(distance - 1, 0)
+            function: LoxFunction | None = superclass.find_method(
+                    method.lexeme)
+            
+            if function is None:
+                raise error(method, f"Undefined property `{method.lexeme}`.")
+            
+            return object.bind_method(function)
+        
+        return get_super
+    
+    
+    def visit_this_expr(self: Self, expr: ThisExpr) -> ExprClosure:
+        """ Visit and compile a this expression. """
+        
+        return self.compile_get_local(expr)
+    
+    
+    def visit_unary_expr(self: Self, expr: UnaryExpr) -> ExprClosure:
+        """ Visit and compile a unary expression. """
+        
+        right: ExprClosure = self.compile(expr.right)
+        operator: Token = expr.operator
+        error: Callable[[Token, str], RuntimeError] = self.interpreter.error
+        
+        match operator.type:
+            case TokenType.MINUS:
+                def negate(environment: Environment) -> Any:
+                    value: Any = right(environment)
+                    
+                    if type(value) is not float:
+                        raise error(operator, "Operand must be a number.")
+                    
+                    return -value
+                
+                return negate
+            case TokenType.BANG:
+                def logical_not(environment: Environment) -> Any:
+                    value: Any = right(environment)
+                    return value is None or value is False
+                
+                return logical_not
+        
+        def unimplemented(environment: Environment) -> Any:
+            right(environment)
+            raise error(operator, "Unimplemented unary operator.")
+        
+        return unimplemented
+    
+    
+    def visit_variable_expr(self: Self, expr: VariableExpr) -> ExprClosure:
+        """ Visit and compile a variable expression. """
+        
+        if expr.depth >= 0:
+            return self.compile_get_local(expr)
+        
+        globals: GlobalEnvironment = self.interpreter.globals
+        slots: list[Any] = globals.slots
+        global_slot: int = expr.slot
+        name: Token = expr.name
+        
+        def get_global(environment: Environment) -> Any:
+            value: Any = slots[global_slot]
+            
+            if value is UNDEFINED:
+                globals.undefined(name)
+            
+            return value
+        
+        return get_global
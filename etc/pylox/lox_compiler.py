@@ -0,0 +1,828 @@
+from array import array
+from lox_chunk import Chunk, OpCode
+from lox_debug import disassemble_chunk
+from lox_error_reporter import ErrorReporter
+from lox_expr import AssignExpr, BinaryExpr, CallExpr, Expr, ExprVisitor
+from lox_expr import GetExpr, GroupingExpr, LiteralExpr, LogicalExpr, SetExpr
+from lox_expr import SuperExpr, ThisExpr, UnaryExpr, VariableExpr
+from lox_object import ObjFunction
+from lox_resolver import FunctionType
+from lox_stmt import BlockStmt, ClassStmt, ExpressionStmt, FunctionStmt
+from lox_stmt import IfStmt, PrintStmt, ReturnStmt, Stmt, StmtVisitor, VarStmt
+from lox_stmt import WhileStmt
+from lox_token import Token
+from lox_token_type import TokenType
+from typing import Any, Self
+
+UINT8_COUNT: int = 0x100
+""" The number of values that fit in a byte operand. """
+
+UINT16_MAX: int = 0xffff
+""" The largest value that fits in a short operand. """
+
+class Local:
+    """ A local variable in a function being compiled. """
+    
+    name: str
+    """ The local variable's name. """
+    
+    depth: int
+    """
+    The local variable's scope depth, or `-1` if it has not been
+    initialized.
+    """
+    
+    is_captured: bool
+    """ Whether the local variable is captured by a closure. """
+    
+    def __init__(self: Self, name: str, depth: int) -> None:
+        """ Initialize the local variable. """
+        
+        self.name = name
+        self.depth = depth
+        self.is_captured = False
+
+
+class Upvalue:
+    """ An upvalue in a function being compiled. """
+    
+    index: int
+    """ The upvalue's slot or upvalue index in the enclosing function. """
+    
+    is_local: bool
+    """ Whether the upvalue captures a local of the enclosing function. """
+    
+    def __init__(self: Self, index: int, is_local: bool) -> None:
+        """ Initialize the upvalue. """
+        
+        self.index = index
+        self.is_local = is_local
+
+
+class FunctionCompiler:
+    """ The compiler state of a function being compiled. """
+    
+    enclosing: Self | None
+    """ The function compiler's enclosing function compiler. """
+    
+    function: ObjFunction
+    """ The function being compiled. """
+    
+    type: FunctionType
+    """ The type of the function being compiled. """
+    
+    locals: list[Local]
+    """ The function compiler's local variables in the current scope. """
+    
+    upvalues: list[Upvalue]
+    """ The function compiler's upvalues. """
+    
+    scope_depth: int
+    """ The function compiler's current scope depth. """
+    
+    def __init__(
+            self: Self, enclosing: Self | None,
+            function: ObjFunction, type: FunctionType) -> None:
+        """ Initialize the function compiler. """
+        
+        self.enclosing = enclosing
+        self.function = function
+        self.type = type
+        self.upvalues = []
+        self.scope_depth = 0
+        
+        # The first slot holds the receiver in methods and the callee in
+        # other functions.
+        if type == FunctionType.METHOD or type == FunctionType.INITIALIZER:
+            self.locals = [Local("this", 0)]
+        else:
+            self.locals = [Local("", 0)]
+
+
+class ClassCompiler:
+    """ The compiler state of a class being compiled. """
+    
+    enclosing: Self | None
+    """ The class compiler's enclosing class compiler. """
+    
+    has_superclass: bool
+    """ Whether the class being compiled has a superclass. """
+    
+    def __init__(self: Self, enclosing: Self | None) -> None:
+        """ Initialize the class compiler. """
+        
+        self.enclosing = enclosing
+        self.has_superclass = False
+
+
+class Compiler(StmtVisitor, ExprVisitor):
+    """
+    Compiles a list of resolved statements to bytecode for the VM.
+    Static errors are assumed to have already been reported by the
+    resolver, so only the limits of the bytecode format are checked.
+    """
+    
+    error_reporter: ErrorReporter
+    """ The compiler's error reporter. """
+    
+    disassemble: bool
+    """ Whether to print each function's bytecode after compiling it. """
+    
+    current: FunctionCompiler | None
+    """ The compiler state of the current function. """
+    
+    current_class: ClassCompiler | None
+    """ The compiler state of the current class. """
+    
+    previous: Token | None
+    """ The most recent token that the compiler has seen. """
+    
+    def __init__(
+            self: Self,
+            error_reporter: ErrorReporter, disassemble: bool = False) -> None:
+        """ Initialize the compiler. """
+        
+        super().__init__()
+        self.error_reporter = error_reporter
+        self.disassemble = disassemble
+        self.current = None
+        self.current_class = None
+        self.previous = None
+    
+    
+    def compile(self: Self, statements: list[Stmt]) -> ObjFunction:
+        """ Compile a list of statements to a top level script function. """
+        
+        self.begin_function(None, FunctionType.NONE)
+        
+        for statement in statements:
+            self.compile_node(statement)
+        
+        return self.end_function()
+    
+    
+    def compile_node(self: Self, node: Stmt | Expr) -> None:
+        """ Compile an AST node. """
+        
+        node.accept(self)
+    
+    
+    def current_chunk(self: Self) -> Chunk:
+        """ Return the chunk of the current function. """
+        
+        assert self.current is not None
+        return self.current.function.chunk
+    
+    
+    def line(self: Self) -> int:
+        """
+        Return the line number of the most recent token. Statements set
+        the most recent token to their own keyword or name before they
+        emit any bytes, so bytes are not given the line of a previous
+        statement.
+        """
+        
+        return 0 if self.previous is None else self.previous.line
+    
+    
+    def error(self: Self, message: str) -> None:
+        """ Report an error at the most recent token. """
+        
+        assert self.previous is not None
+        self.error_reporter.error(self.previous, message)
+    
+    
+    def emit_byte(self: Self, byte: int) -> None:
+        """ Emit a byte to the current chunk. """
+        
+        self.current_chunk().write(byte, self.line())
+    
+    
+    def emit_short(self: Self, value: int) -> None:
+        """ Emit a short operand to the current chunk. """
+        
+        self.current_chunk().write_short(value, self.line())
+    
+    
+    def emit_token(self: Self, token: Token) -> None:
+        """
+        Set a token as the most recent token and the token reported by
+        runtime errors from the next byte to be emitted.
+        """
+        
+        self.previous = token
+        self.current_chunk().write_token(token)
+    
+    
+    def emit_loop(self: Self, loop_start: int) -> None:
+        """ Emit a loop instruction jumping back to a loop's start. """
+        
+        self.emit_byte(OpCode.LOOP)
+        offset: int = len(self.current_chunk().code) - loop_start + 2
+        
+        if offset > UINT16_MAX:
+            self.error("Loop body too large.")
+        
+        self.emit_short(offset & UINT16_MAX)
+    
+    
+    def emit_jump(self: Self, instruction: OpCode) -> int:
+        """
+        Emit a jump instruction with a placeholder offset and return the
+        offset of the placeholder.
+        """
+        
+        self.emit_byte(instruction)
+        self.emit_short(UINT16_MAX)
+        return len(self.current_chunk().code) - 2
+    
+    
+    def emit_return(self: Self) -> None:
+        """ Emit an implicit return from the current function. """
+        
+        assert self.current is not None
+        
+        if self.current.type == FunctionType.INITIALIZER:
+            self.emit_byte(OpCode.GET_LOCAL)
+            self.emit_byte(0)
+        else:
+            self.emit_byte(OpCode.NIL)
+        
+        self.emit_byte(OpCode.RETURN)
+    
+    
+    def make_constant(self: Self, value: Any) -> int:
+        """ Add a constant to the current chunk and return its ID. """
+        
+        constant: int = self.current_chunk().add_constant(value)
+        
+        if constant > UINT16_MAX:
+            self.error("Too many constants in one chunk.")
+            return 0
+        
+        return constant
+    
+    
+    def emit_constant(self: Self, instruction: OpCode, value: Any) -> None:
+        """ Emit an instruction with a constant operand. """
+        
+        constant: int = self.make_constant(value)
+        self.emit_byte(instruction)
+        self.emit_short(constant)
+    
+    
+    def patch_jump(self: Self, offset: int) -> None:
+        """ Patch a jump instruction's offset to the current position. """
+        
+        code: array = self.current_chunk().code
+        jump: int = len(code) - offset - 2
+        
+        if jump > UINT16_MAX:
+            self.error("Too much code to jump over.")
+        
+        code[offset] = (jump >> 8) & 0xff
+        code[offset + 1] = jump & 0xff
+    
+    
+    def begin_function(
+            self: Self, name: str | None, type: FunctionType) -> None:
+        """ Begin compiling a new function. """
+        
+        self.current = FunctionCompiler(self.current, ObjFunction(name), type)
+    
+    
+    def end_function(self: Self) -> ObjFunction:
+        """ End compiling the current function and return it. """
+        
+        assert self.current is not None
+        self.emit_return()
+        function: ObjFunction = self.current.function
+        function.upvalue_count = len(self.current.upvalues)
+        
+        if self.disassemble and not self.error_reporter.had_error():
+            disassemble_chunk(function.chunk, repr(function))
+        
+        self.current = self.current.enclosing
+        return function
+    
+    
+    def begin_scope(self: Self) -> None:
+        """ Begin a new scope. """
+        
+        assert self.current is not None
+        self.current.scope_depth += 1
+    
+    
+    def end_scope(self: Self) -> None:
+        """ End the current scope and discard its local variables. """
+        
+        assert self.current is not None
+        self.current.scope_depth -= 1
+        locals: list[Local] = self.current.locals
+        
+        while locals and locals[-1].depth > self.current.scope_depth:
+            if locals.pop().is_captured:
+                self.emit_byte(OpCode.CLOSE_UPVALUE)
+            else:
+                self.emit_byte(OpCode.POP)
+    
+    
+    def function(self: Self, stmt: FunctionStmt, type: FunctionType) -> None:
+        """ Compile a function and emit a closure around it. """
+        
+        self.begin_function(stmt.name.lexeme, type)
+        compiler: FunctionCompiler | None = self.current
+        assert compiler is not None
+        self.begin_scope()
+        
+        for param in stmt.params:
+            compiler.function.arity += 1
+            self.declare_variable(param)
+            self.mark_initialized()
+        
+        for statement in stmt.body:
+            self.compile_node(statement)
+        
+        # There is no need to end the function's scope because returning
+        # discards the whole frame.
+        function: ObjFunction = self.end_function()
+        self.previous = stmt.name
+        self.emit_constant(OpCode.CLOSURE, function)
+        
+        for upvalue in compiler.upvalues:
+            self.emit_byte(1 if upvalue.is_local else 0)
+            self.emit_byte(upvalue.index)
+    
+    
+    def method(self: Self, stmt: FunctionStmt) -> None:
+        """ Compile a method and add it to the class below it. """
+        
+        type: FunctionType = FunctionType.METHOD
+        
+        if stmt.name.lexeme == "init":
+            type = FunctionType.INITIALIZER
+        
+        self.function(stmt, type)
+        self.emit_token(stmt.name)
+        self.emit_constant(OpCode.METHOD, stmt.name.lexeme)
+    
+    
+    def identifier_constant(self: Self, name: Token) -> int:
+        """ Add a name to the current chunk's constants. """
+        
+        self.previous = name
+        return self.make_constant(name.lexeme)
+    
+    
+    def resolve_local(
+            self: Self, compiler: FunctionCompiler, name: str) -> int:
+        """ Resolve a name to a local slot, or `-1` if it is not local. """
+        
+        for index in range(len(compiler.locals) - 1, -1, -1):
+            if compiler.locals[index].name == name:
+                return index
+        
+        return -1
+    
+    
+    def add_upvalue(
+            self: Self, compiler: FunctionCompiler,
+            index: int, is_local: bool) -> int:
+        """ Add an upvalue to a function and return its index. """
+        
+        for i, upvalue in enumerate(compiler.upvalues):
+            if upvalue.index == index and upvalue.is_local == is_local:
+                return i
+        
+        if len(compiler.upvalues) == UINT8_COUNT:
+            self.error("Too many closure variables in function.")
+            return 0
+        
+        compiler.upvalues.append(Upvalue(index, is_local))
+        return len(compiler.upvalues) - 1
+    
+    
+    def resolve_upvalue(
+            self: Self, compiler: FunctionCompiler, name: str) -> int:
+        """
+        Resolve a name to an upvalue index, or `-1` if it is not an
+        upvalue.
+        """
+        
+        if compiler.enclosing is None:
+            return -1
+        
+        local: int = self.resolve_local(compiler.enclosing, name)
+        
+        if local != -1:
+            compiler.enclosing.locals[local].is_captured = True
+            return self.add_upvalue(compiler, local, True)
+        
+        upvalue: int = self.resolve_upvalue(compiler.enclosing, name)
+        
+        if upvalue != -1:
+            return self.add_upvalue(compiler, upvalue, False)
+        
+        return -1
+    
+    
+    def add_local(self: Self, name: str) -> None:
+        """ Add an uninitialized local variable to the current scope. """
+        
+        assert self.current is not None
+        
+        if len(self.current.locals) == UINT8_COUNT:
+            self.error("Too many local variables in function.")
+            return
+        
+        self.current.locals.append(Local(name, -1))
+    
+    
+    def declare_variable(self: Self, name: Token) -> None:
+        """ Declare a variable if the current scope is local. """
+        
+        assert self.current is not None
+        self.previous = name
+        
+        if self.current.scope_depth > 0:
+            self.add_local(name.lexeme)
+    
+    
+    def parse_variable(self: Self, name: Token) -> int:
+        """
+        Declare a variable and return its name's constant ID if it is
+        global.
+        """
+        
+        assert self.current is not None
+        self.declare_variable(name)
+        
+        if self.current.scope_depth > 0:
+            return 0
+        
+        return self.identifier_constant(name)
+    
+    
+    def mark_initialized(self: Self) -> None:
+        """ Mark the most recent local variable as initialized. """
+        
+        assert self.current is not None
+        
+        if self.current.scope_depth > 0:
+            self.current.locals[-1].depth = self.current.scope_depth
+    
+    
+    def define_variable(self: Self, name: Token, constant: int) -> None:
+        """ Define a declared variable from the value on the stack. """
+        
+        assert self.current is not None
+        
+        if self.current.scope_depth > 0:
+            self.mark_initialized()
+            return
+        
+        self.emit_token(name)
+        self.emit_byte(OpCode.DEFINE_GLOBAL)
+        self.emit_short(constant)
+    
+    
+    def named_variable(
+            self: Self, name: Token, value: Expr | None = None) -> None:
+        """ Emit a variable's value, or assign a value to the variable. """
+        
+        assert self.current is not None
+        get_op: OpCode
+        set_op: OpCode
+        arg: int = self.resolve_local(self.current, name.lexeme)
+        
+        if arg != -1:
+            get_op, set_op = OpCode.GET_LOCAL, OpCode.SET_LOCAL
+        else:
+            arg = self.resolve_upvalue(self.current, name.lexeme)
+            
+            if arg != -1:
+                get_op, set_op = OpCode.GET_UPVALUE, OpCode.SET_UPVALUE
+            else:
+                get_op, set_op = OpCode.GET_GLOBAL, OpCode.SET_GLOBAL
+                arg = self.identifier_constant(name)
+        
+        if value is not None:
+            self.compile_node(value)
+        
+        self.emit_token(name)
+        
+        if value is None:
+            self.emit_byte(get_op)
+        else:
+            self.emit_byte(set_op)
+        
+        if get_op == OpCode.GET_GLOBAL:
+            self.emit_short(arg)
+        else:
+            self.emit_byte(arg)
+    
+    
+    def arguments(self: Self, arguments: list[Expr]) -> int:
+        """ Compile a call's arguments and return the argument count. """
+        
+        for argument in arguments:
+            self.compile_node(argument)
+        
+        return len(arguments)
+    
+    
+    def visit_block_stmt(self: Self, stmt: BlockStmt) -> None:
+        """ Visit and compile a block statement. """
+        
+        self.begin_scope()
+        
+        for statement in stmt.statements:
+            self.compile_node(statement)
+        
+        self.end_scope()
+    
+    
+    def visit_class_stmt(self: Self, stmt: ClassStmt) -> None:
+        """ Visit and compile a class statement. """
+        
+        name_constant: int = self.identifier_constant(stmt.name)
+        self.declare_variable(stmt.name)
+        self.emit_byte(OpCode.CLASS)
+        self.emit_short(name_constant)
+        self.define_variable(stmt.name, name_constant)
+        
+        class_compiler: ClassCompiler = ClassCompiler(self.current_class)
+        self.current_class = class_compiler
+        
+        if stmt.superclass is not None:
+            self.compile_node(stmt.superclass)
+            self.begin_scope()
+            self.add_local("super")
+            self.mark_initialized()
+            self.named_variable(stmt.name)
+            self.emit_token(stmt.superclass.name)
+            self.emit_byte(OpCode.INHERIT)
+            class_compiler.has_superclass = True
+        
+        self.named_variable(stmt.name)
+        
+        for method in stmt.methods:
+            self.method(method)
+        
+        self.emit_byte(OpCode.POP)
+        
+        if class_compiler.has_superclass:
+            self.end_scope()
+        
+        self.current_class = class_compiler.enclosing
+    
+    
+    def visit_expression_stmt(self: Self, stmt: ExpressionStmt) -> None:
+        """ Visit and compile an expression statement. """
+        
+        self.compile_node(stmt.expression)
+        self.emit_byte(OpCode.POP)
+    
+    
+    def visit_function_stmt(self: Self, stmt: FunctionStmt) -> None:
+        """ Visit and compile a function statement. """
+        
+        constant: int = self.parse_variable(stmt.name)
+        self.mark_initialized()
+        self.function(stmt, FunctionType.FUNCTION)
+        self.define_variable(stmt.name, constant)
+    
+    
+    def visit_if_stmt(self: Self, stmt: IfStmt) -> None:
+        """ Visit and compile an if statement. """
+        
+        self.previous = stmt.keyword
+        self.compile_node(stmt.condition)
+        then_jump: int = self.emit_jump(OpCode.JUMP_IF_FALSE)
+        self.emit_byte(OpCode.POP)
+        self.compile_node(stmt.then_branch)
+        else_jump: int = self.emit_jump(OpCode.JUMP)
+        self.patch_jump(then_jump)
+        self.emit_byte(OpCode.POP)
+        
+        if stmt.else_branch is not None:
+            self.compile_node(stmt.else_branch)
+        
+        self.patch_jump(else_jump)
+    
+    
+    def visit_print_stmt(self: Self, stmt: PrintStmt) -> None:
+        """ Visit and compile a print statement. """
+        
+        self.previous = stmt.keyword
+        self.compile_node(stmt.expression)
+        self.previous = stmt.keyword
+        self.emit_byte(OpCode.PRINT)
+    
+    
+    def visit_return_stmt(self: Self, stmt: ReturnStmt) -> None:
+        """ Visit and compile a return statement. """
+        
+        self.previous = stmt.keyword
+        
+        if stmt.value is None:
+            self.emit_return()
+        else:
+            self.compile_node(stmt.value)
+            self.emit_byte(OpCode.RETURN)
+    
+    
+    def visit_var_stmt(self: Self, stmt: VarStmt) -> None:
+        """ Visit and compile a var statement. """
+        
+        constant: int = self.parse_variable(stmt.name)
+        
+        if stmt.initializer is None:
+            self.emit_byte(OpCode.NIL)
+        else:
+            self.compile_node(stmt.initializer)
+        
+        self.define_variable(stmt.name, constant)
+    
+    
+    def visit_while_stmt(self: Self, stmt: WhileStmt) -> None:
+        """ Visit and compile a while statement. """
+        
+        self.previous = stmt.keyword
+        loop_start: int = len(self.current_chunk().code)
+        self.compile_node(stmt.condition)
+        exit_jump: int = self.emit_jump(OpCode.JUMP_IF_FALSE)
+        self.emit_byte(OpCode.POP)
+        self.compile_node(stmt.body)
+        self.emit_loop(loop_start)
+        self.patch_jump(exit_jump)
+        self.emit_byte(OpCode.POP)
+    
+    
+    def visit_assign_expr(self: Self, expr: AssignExpr) -> None:
+        """ Visit and compile an assign expression. """
+        
+        self.named_variable(expr.name, expr.value)
+    
+    
+    def visit_binary_expr(self: Self, expr: BinaryExpr) -> None:
+        """ Visit and compile a binary expression. """
+        
+        self.compile_node(expr.left)
+        self.compile_node(expr.right)
+        self.emit_token(expr.operator)
+        
+        match expr.operator.type:
+            case TokenType.BANG_EQUAL:
+                self.emit_byte(OpCode.EQUAL)
+                self.emit_byte(OpCode.NOT)
+            case TokenType.EQUAL_EQUAL:
+                self.emit_byte(OpCode.EQUAL)
+            case TokenType.GREATER:
+                self.emit_byte(OpCode.GREATER)
+            case TokenType.GREATER_EQUAL:
+                self.emit_byte(OpCode.LESS)
+                self.emit_byte(OpCode.NOT)
+            case TokenType.LESS:
+                self.emit_byte(OpCode.LESS)
+            case TokenType.LESS_EQUAL:
+                self.emit_byte(OpCode.GREATER)
+                self.emit_byte(OpCode.NOT)
+            case TokenType.PLUS:
+                self.emit_byte(OpCode.ADD)
+            case TokenType.MINUS:
+                self.emit_byte(OpCode.SUBTRACT)
+            case TokenType.STAR:
+                self.emit_byte(OpCode.MULTIPLY)
+            case TokenType.SLASH:
+                self.emit_byte(OpCode.DIVIDE)
+            case _:
+                self.error("Unimplemented binary operator.")
+    
+    
+    def visit_call_expr(self: Self, expr: CallExpr) -> None:
+        """ Visit and compile a call expression. """
+        
+        callee: Expr = expr.callee
+        arg_count: int
+        
+        if isinstance(callee, GetExpr):
+            self.compile_node(callee.object)
+            arg_count = self.arguments(expr.arguments)
+            self.emit_token(expr.paren)
+            self.emit_byte(OpCode.INVOKE)
+            self.emit_token(callee.name)
+            self.emit_short(self.make_constant(callee.name.lexeme))
+        elif isinstance(callee, SuperExpr):
+            self.named_variable(Token(
+                    TokenType.THIS, "this", None, callee.keyword.line))
+            arg_count = self.arguments(expr.arguments)
+            self.named_variable(callee.keyword)
+            self.emit_token(expr.paren)
+            self.emit_byte(OpCode.SUPER_INVOKE)
+            self.emit_token(callee.method)
+            self.emit_short(self.make_constant(callee.method.lexeme))
+        else:
+            self.compile_node(callee)
+            arg_count = self.arguments(expr.arguments)
+            self.emit_token(expr.paren)
+            self.emit_byte(OpCode.CALL)
+        
+        self.emit_byte(arg_count)
+    
+    
+    def visit_get_expr(self: Self, expr: GetExpr) -> None:
+        """ Visit and compile a get expression. """
+        
+        self.compile_node(expr.object)
+        constant: int = self.identifier_constant(expr.name)
+        self.emit_token(expr.name)
+        self.emit_byte(OpCode.GET_PROPERTY)
+        self.emit_short(constant)
+    
+    
+    def visit_grouping_expr(self: Self, expr: GroupingExpr) -> None:
+        """ Visit and compile a grouping expression. """
+        
+        self.compile_node(expr.expression)
+    
+    
+    def visit_literal_expr(self: Self, expr: LiteralExpr) -> None:
+        """ Visit and compile a literal expression. """
+        
+        if expr.value is None:
+            self.emit_byte(OpCode.NIL)
+        elif expr.value is True:
+            self.emit_byte(OpCode.TRUE)
+        elif expr.value is False:
+            self.emit_byte(OpCode.FALSE)
+        else:
+            self.emit_constant(OpCode.CONSTANT, expr.value)
+    
+    
+    def visit_logical_expr(self: Self, expr: LogicalExpr) -> None:
+        """ Visit and compile a logical expression. """
+        
+        self.compile_node(expr.left)
+        self.previous = expr.operator
+        
+        if expr.operator.type == TokenType.OR:
+            else_jump: int = self.emit_jump(OpCode.JUMP_IF_FALSE)
+            end_jump: int = self.emit_jump(OpCode.JUMP)
+            self.patch_jump(else_jump)
+        else:
+            end_jump = self.emit_jump(OpCode.JUMP_IF_FALSE)
+        
+        self.emit_byte(OpCode.POP)
+        self.compile_node(expr.right)
+        self.patch_jump(end_jump)
+    
+    
+    def visit_set_expr(self: Self, expr: SetExpr) -> None:
+        """ Visit and compile a set expression. """
+        
+        self.compile_node(expr.object)
+        self.compile_node(expr.value)
+        constant: int = self.identifier_constant(expr.name)
+        self.emit_token(expr.name)
+        self.emit_byte(OpCode.SET_PROPERTY)
+        self.emit_short(constant)
+    
+    
+    def visit_super_expr(self: Self, expr: SuperExpr) -> None:
+        """ Visit and compile a super expression. """
+        
+        self.named_variable(Token(
+                TokenType.THIS, "this", None, expr.keyword.line))
+        self.named_variable(expr.keyword)
+        constant: int = self.identifier_constant(expr.method)
+        self.emit_token(expr.method)
+        self.emit_byte(OpCode.GET_SUPER)
+        self.emit_short(constant)
+    
+    
+    def visit_this_expr(self: Self, expr: ThisExpr) -> None:
+        """ Visit and compile a this expression. """
+        
+        self.named_variable(expr.keyword)
+    
+    
+    def visit_unary_expr(self: Self, expr: UnaryExpr) -> None:
+        """ Visit and compile a unary expression. """
+        
+        self.compile_node(expr.right)
+        self.emit_token(expr.operator)
+        
+        match expr.operator.type:
+            case TokenType.MINUS:
+                self.emit_byte(OpCode.NEGATE)
+            case TokenType.BANG:
+                self.emit_byte(OpCode.NOT)
+            case _:
+                self.error("Unimplemented unary operator.")
+    
+    
+    def visit_variable_expr(self: Self, expr: VariableExpr) -> None:
+        """ Visit and compile a variable expression. """
+        
+        self.named_variable(expr.name)
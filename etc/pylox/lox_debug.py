@@ -0,0 +1,141 @@
+from lox_chunk import Chunk, OpCode
+from lox_interpreter import stringify
+from typing import Any
+
+def disassemble_chunk(chunk: Chunk, name: str) -> None:
+    """ Print the instructions in a chunk with a name. """
+    
+    print(f"== {name} ==")
+    offset: int = 0
+    
+    while offset < len(chunk.code):
+        offset = disassemble_instruction(chunk, offset)
+
+
+def read_short(chunk: Chunk, offset: int) -> int:
+    """ Read a big-endian 16-bit integer from a chunk at an offset. """
+    
+    return (chunk.code[offset] << 8) | chunk.code[offset + 1]
+
+
+def constant_instruction(name: str, chunk: Chunk, offset: int) -> int:
+    """
+    Print a constant instruction at an offset in a chunk and return the
+    new offset.
+    """
+    
+    constant: int = read_short(chunk, offset + 1)
+    value: str = stringify(chunk.constants[constant])
+    print(f"{name:<16} {constant:6d} '{value}'")
+    return offset + 3
+
+
+def invoke_instruction(name: str, chunk: Chunk, offset: int) -> int:
+    """
+    Print an invoke instruction at an offset in a chunk and return the
+    new offset.
+    """
+    
+    constant: int = read_short(chunk, offset + 1)
+    arg_count: int = chunk.code[offset + 3]
+    value: str = stringify(chunk.constants[constant])
+    print(f"{name:<16} ({arg_count} args) {constant:6d} '{value}'")
+    return offset + 4
+
+
+def simple_instruction(name: str, offset: int) -> int:
+    """
+    Print a single byte instruction at an offset and return the new
+    offset.
+    """
+    
+    print(name)
+    return offset + 1
+
+
+def byte_instruction(name: str, chunk: Chunk, offset: int) -> int:
+    """
+    Print an instruction with a single byte operand at an offset and
+    return the new offset.
+    """
+    
+    print(f"{name:<16} {chunk.code[offset + 1]:4d}")
+    return offset + 2
+
+
+def jump_instruction(name: str, sign: int, chunk: Chunk, offset: int) -> int:
+    """
+    Print a jump instruction with a sign and a short operand at an
+    offset and return the new offset.
+    """
+    
+    jump: int = read_short(chunk, offset + 1)
+    print(f"{name:<16} {offset:4d} -> {offset + 3 + sign * jump}")
+    return offset + 3
+
+
+def closure_instruction(chunk: Chunk, offset: int) -> int:
+    """
+    Print a closure instruction and its upvalues at an offset in a chunk
+    and return the new offset.
+    """
+    
+    constant: int = read_short(chunk, offset + 1)
+    function: Any = chunk.constants[constant]
+    print(f"{'OP_CLOSURE':<16} {constant:6d} {stringify(function)}")
+    offset += 3
+    
+    for i in range(function.upvalue_count):
+        is_local: int = chunk.code[offset]
+        index: int = chunk.code[offset + 1]
+        kind: str = "local" if is_local else "upvalue"
+        print(f"{offset:04d}      |                     {kind} {index}")
+        offset += 2
+    
+    return offset
+
+
+def disassemble_instruction(chunk: Chunk, offset: int) -> int:
+    """
+    Print the instruction at an offset in a chunk and return the new
+    offset.
+    """
+    
+    print(f"{offset:05d} ", end="")
+    
+    if offset > 0 and chunk.lines[offset] == chunk.lines[offset - 1]:
+        print("    | ", end="")
+    else:
+        print(f"{chunk.lines[offset]:5d} ", end="")
+    
+    instruction: int = chunk.code[offset]
+    
+    try:
+        op: OpCode = OpCode(instruction)
+    except ValueError:
+        print(f"Unknown opcode {instruction}")
+        return offset + 1
+    
+    name: str = f"OP_{op.name}"
+    
+    match op:
+        case OpCode.CONSTANT | OpCode.GET_GLOBAL | OpCode.DEFINE_GLOBAL:
+            return constant_instruction(name, chunk, offset)
+        case OpCode.SET_GLOBAL | OpCode.GET_PROPERTY | OpCode.SET_PROPERTY:
+            return constant_instruction(name, chunk, offset)
+        case OpCode.GET_SUPER | OpCode.CLASS | OpCode.METHOD:
+            return constant_instruction(name, chunk, offset)
+        case OpCode.GET_LOCAL | OpCode.SET_LOCAL | OpCode.CALL:
+            return byte_instruction(name, chunk, offset)
+        case OpCode.GET_UPVALUE | OpCode.SET_UPVALUE:
+            return byte_instruction(name, chunk, offset)
+        case OpCode.JUMP | OpCode.JUMP_IF_FALSE:
+            return jump_instruction(name, 1, chunk, offset)
+        case OpCode.LOOP:
+            return jump_instruction(name, -1, chunk, offset)
+        case OpCode.INVOKE | OpCode.SUPER_INVOKE:
+            return invoke_instruction(name, chunk, offset)
+        case OpCode.CLOSURE:
+            return closure_instruction(chunk, offset)
+        case _:
+            return simple_instruction(name, offset)
@@ -0,0 +1,171 @@
+from collections.abc import Callable
+from lox_expr import AssignExpr, BinaryExpr, Expr, GetExpr, GroupingExpr
+from lox_expr import LiteralExpr, LogicalExpr, SetExpr, SuperExpr, ThisExpr
+from lox_expr import UnaryExpr, VariableExpr
+from lox_parser import Parser
+from lox_token import Token
+from lox_token_type import TokenType
+from typing import Self
+
+class DescentParser(Parser):
+    """
+    A parser that parses expressions by recursive descent through one
+    rule for each precedence level. This is the expression parser that
+    precedence climbing replaced, kept so that the parser benchmark can
+    compare them. It builds the same syntax trees.
+    """
+    
+    def assignment(self: Self) -> Expr:
+        """ Parse an assignment expression. """
+        
+        expr: Expr = self.or_expression()
+        
+        if self.match(TokenType.EQUAL):
+            equals: Token = self.previous()
+            value: Expr = self.assignment()
+            
+            if isinstance(expr, VariableExpr):
+                name: Token = expr.name
+                return AssignExpr(name, value)
+            elif isinstance(expr, GetExpr):
+                return SetExpr(expr.object, expr.name, value)
+            
+            self.error(equals, "Invalid assignment target.")
+        
+        return expr
+    
+    
+    def or_expression(self: Self) -> Expr:
+        """ Parse an or expression. """
+        
+        expr: Expr = self.and_expression()
+        
+        while self.match(TokenType.OR):
+            operator: Token = self.previous()
+            right: Expr = self.and_expression()
+            expr = LogicalExpr(expr, operator, right)
+        
+        return expr
+    
+    
+    def and_expression(self: Self) -> Expr:
+        """ Parse an and expression. """
+        
+        expr: Expr = self.equality()
+        
+        while self.match(TokenType.AND):
+            operator: Token = self.previous()
+            right: Expr = self.equality()
+            expr = LogicalExpr(expr, operator, right)
+        
+        return expr
+    
+    
+    def equality(self: Self) -> Expr:
+        """ Parse an equality expression. """
+        
+        return self.binary(
+                self.comparison, TokenType.BANG_EQUAL, TokenType.EQUAL_EQUAL)
+    
+    
+    def comparison(self: Self) -> Expr:
+        """ Parse a comparison expression. """
+        
+        return self.binary(
+                self.term, TokenType.GREATER, TokenType.GREATER_EQUAL,
+                TokenType.LESS, TokenType.LESS_EQUAL)
+    
+    
+    def term(self: Self) -> Expr:
+        """ Parse a term expression. """
+        
+        return self.binary(self.factor, TokenType.MINUS, TokenType.PLUS)
+    
+    
+    def factor(self: Self) -> Expr:
+        """ Parse a factor expression. """
+        
+        return self.binary(self.unary, TokenType.SLASH, TokenType.STAR)
+    
+    
+    def unary(self: Self) -> Expr:
+        """ Parse a unary expression. """
+        
+        if self.match(TokenType.BANG, TokenType.MINUS):
+            operator: Token = self.previous()
+            right: Expr = self.unary()
+            return UnaryExpr(operator, right)
+        
+        return self.call()
+    
+    
+    def call(self: Self) -> Expr:
+        """ Parse a call expression. """
+        
+        expr: Expr = self.primary()
+        
+        while True:
+            if self.match(TokenType.LEFT_PAREN):
+                expr = self.finish_call(expr)
+            elif self.match(TokenType.DOT):
+                name: Token = self.consume(
+                        TokenType.IDENTIFIER,
+                        "Expect property name after `.`.")
+                expr = GetExpr(expr, name)
+            else:
+                break
+        
+        return expr
+    
+    
+    def primary(self: Self) -> Expr:
+        """ Parse a primary expression. """
+        
+        if self.match(TokenType.FALSE):
+            return LiteralExpr(False)
+        
+        if self.match(TokenType.TRUE):
+            return LiteralExpr(True)
+        
+        if self.match(TokenType.NIL):
+            return LiteralExpr(None)
+        
+        if self.match(TokenType.NUMBER, TokenType.STRING):
+            return LiteralExpr(self.previous().literal)
+        
+        if self.match(TokenType.SUPER):
+            keyword: Token = self.previous()
+            self.consume(TokenType.DOT, "Expect `.` after `super`.")
+            method: Token = self.consume(
+                    TokenType.IDENTIFIER, "Expect superclass method name.")
+            return SuperExpr(keyword, method)
+        
+        if self.match(TokenType.THIS):
+            return ThisExpr(self.previous())
+        
+        if self.match(TokenType.IDENTIFIER):
+            return VariableExpr(self.previous())
+        
+        if self.match(TokenType.LEFT_PAREN):
+            expr: Expr = self.expression()
+            self.consume(TokenType.RIGHT_PAREN, "Expect `)` after expression.")
+            return GroupingExpr(expr)
+        
+        raise self.error(self.peek(), "Expect expression.")
+    
+    
+    def binary(
+            self: Self, rule: Callable[[], Expr], *types: TokenType) -> Expr:
+        """
+        Parse a left-associative binary expression from its
+        sub-expression rule and operator types.
+        """
+        
+        expr: Expr = rule()
+        
+        while self.match(*types):
+            operator: Token = self.previous()
+            right: Expr = rule()
+            expr = BinaryExpr(expr, operator, right)
+        
+        return expr
@@ -2,61 +2,40 @@ from lox_error_reporter import ErrorReporter
 from lox_token import Token
 from typing import Any, Self
 
+UNDEFINED: object = object()
+""" The value of a global variable slot that has not been defined. """
+
 class Environment:
-    """ An environment of names and values. """
+    """
+    An environment of values stored in slots. Enclosed environments are
+    frames with slots that are assigned by the resolver in declaration
+    order.
+    """
     
-    error_reporter: ErrorReporter
-    """ The environment's error reporter. """
+    __slots__ = ("enclosing", "slots")
     
     enclosing: Self | None
     """ The environment's enclosing environment. """
     
-    values: dict[str, Any]
-    """ The environment's names and values. """
+    slots: list[Any]
+    """ The environment's slot values. """
     
     def __init__(
-            self: Self, error_reporter: ErrorReporter,
-            enclosing: Self | None = None) -> None:
-        """ Initialize the environment. """
-        
-        self.error_reporter = error_reporter
-        self.enclosing = enclosing
-        self.values = {}
-    
-    
-    def get(self: Self, name: Token) -> Any:
+            self: Self, enclosing: Self | None = None,
+            slots: list[Any] | None = None) -> None:
         """
-        Get a value from the environment and throw an error if it is
-        undefined.
+        Initialize the environment. The environment takes ownership of
+        any initial slot values.
         """
         
-        if name.lexeme in self.values:
-            return self.values[name.lexeme]
-        
-        if self.enclosing is not None:
-            return self.enclosing.get(name)
-        
-        self.error_reporter.error(name, f"Undefined variable `{name.lexeme}`.")
-        raise RuntimeError()
-    
-    
-    def assign(self: Self, name: Token, value: Any) -> None:
-        """ Assign a name and value in the environment. """
-        
-        if name.lexeme in self.values:
-            self.values[name.lexeme] = value
-        elif self.enclosing is not None:
-            self.enclosing.assign(name, value)
-        else:
-            self.error_reporter.error(
-                    name, f"Undefined variable `{name.lexeme}`.")
-            raise RuntimeError()
+        self.enclosing = enclosing
+        self.slots = [] if slots is None else slots
     
     
     def define(self: Self, name: str, value: Any) -> None:
-        """ Define a name and value in the environment. """
+        """ Define a name and value in the environment's next slot. """
         
-        self.values[name] = value
+        self.slots.append(value)
     
     
     def ancestor(self: Self, distance: int) -> Self:
@@ -73,17 +52,100 @@ class Environment:
         return environment
     
     
-    def get_at(self: Self, distance: int, name: str) -> Any:
+    def get_at(self: Self, distance: int, slot: int) -> Any:
         """
-        Get a value from the environment's ancestor at a distance.
+        Get a slot value from the environment's ancestor at a distance.
         """
         
-        return self.ancestor(distance).values[name]
+        if distance == 0:
+            return self.slots[slot]
+        
+        return self.ancestor(distance).slots[slot]
     
     
-    def assign_at(self: Self, distance: int, name: Token, value: Any) -> None:
+    def assign_at(self: Self, distance: int, slot: int, value: Any) -> None:
         """
-        Assign a value in the environment's ancestor at a distance.
+        Assign a slot value in the environment's ancestor at a distance.
         """
         
-        self.ancestor(distance).values[name.lexeme] = value
+        if distance == 0:
+            self.slots[slot] = value
+        else:
+            self.ancestor(distance).slots[slot] = value
+
+
+class GlobalEnvironment(Environment):
+    """
+    The global environment. It has no enclosing environment and interns
+    each global name to a slot when it is first resolved or defined.
+    """
+    
+    __slots__ = ("error_reporter", "names")
+    
+    error_reporter: ErrorReporter
+    """ The global environment's error reporter. """
+    
+    names: dict[str, int]
+    """ The global environment's slots by name. """
+    
+    def __init__(self: Self, error_reporter: ErrorReporter) -> None:
+        """ Initialize the global environment. """
+        
+        super().__init__()
+        self.error_reporter = error_reporter
+        self.names = {}
+    
+    
+    def intern(self: Self, name: str) -> int:
+        """
+        Return a global name's slot, adding an undefined slot for the
+        name if it does not have one.
+        """
+        
+        slot: int | None = self.names.get(name)
+        
+        if slot is None:
+            slot = len(self.slots)
+            self.names[name] = slot
+            self.slots.append(UNDEFINED)
+        
+        return slot
+    
+    
+    def define(self: Self, name: str, value: Any) -> None:
+        """ Define a name and value in the name's global slot. """
+        
+        self.slots[self.intern(name)] = value
+    
+    
+    def get_global(self: Self, name: Token, slot: int) -> Any:
+        """
+        Get a value from a global slot and throw an error if it is
+        undefined.
+        """
+        
+        value: Any = self.slots[slot]
+        
+        if value is UNDEFINED:
+            self.undefined(name)
+        
+        return value
+    
+    
+    def assign_global(self: Self, name: Token, slot: int, value: Any) -> None:
+        """
+        Assign a value to a global slot and throw an error if it is
+        undefined.
+        """
+        
+        if self.slots[slot] is UNDEFINED:
+            self.undefined(name)
+        
+        self.slots[slot] = value
+    
+    
+    def undefined(self: Self, name: Token) -> None:
+        """ Throw an error for an undefined variable name. """
+        
+        self.error_reporter.error(name, f"Undefined variable `{name.lexeme}`.")
+        raise RuntimeError()
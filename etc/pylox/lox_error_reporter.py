@@ -1,3 +1,4 @@
+from collections.abc import Callable
 from lox_token import Token
 from lox_token_type import TokenType
 from typing import Self
@@ -8,13 +9,38 @@ class ErrorReporter:
     error_count: int = 0
     """ The number of syntax errors that have been reported. """
     
+    flush: Callable[[], None] | None
+    """
+    The function to call before an error is reported so that the error
+    is ordered after any buffered output, or `None`.
+    """
+    
+    def __init__(self: Self, flush: Callable[[], None] | None = None) -> None:
+        """ Initialize the error reporter. """
+        
+        self.flush = flush
+    
+    
     def report(self: Self, line: int, message: str, where: str = "") -> None:
         """ Report a syntax error at a location. """
         
+        if self.flush is not None:
+            self.flush()
+        
         print(f"[line {line}] Error{where}: {message}")
         self.error_count += 1
     
     
+    def report_program(self: Self, message: str) -> None:
+        """ Report a syntax error in a program without a location. """
+        
+        if self.flush is not None:
+            self.flush()
+        
+        print(f"Error: {message}")
+        self.error_count += 1
+    
+    
     def error(self: Self, token: Token, message: str) -> None:
         """ Report a syntax error from a token and a message. """
         
@@ -1,9 +1,13 @@
+from collections.abc import Callable
+from lox_inline_cache import InlineCache
 from lox_token import Token
 from typing import Any, Self
 
 class Expr:
     """ An expression in a tree. """
     
+    __slots__ = ()
+    
     def accept(self: Self, visitor: Any) -> Any:
         """ Accept an expression visitor. """
         
@@ -13,18 +17,34 @@ class Expr:
 class AssignExpr(Expr):
     """ An assign expression in a tree. """
     
+    __slots__ = ("name", "value", "depth", "slot")
+    
     name: Token
     """ The assign expression's name. """
     
     value: Expr
     """ The assign expression's value. """
     
+    depth: int
+    """
+    The number of scopes between the assign expression and its
+    variable's scope, or `-1` if it is resolved to a global variable.
+    """
+    
+    slot: int
+    """
+    The assign expression's variable slot in its scope, or in the
+    global environment if it is resolved to a global variable.
+    """
+    
     def __init__(self: Self, name: Token, value: Expr) -> None:
         """ Initialize the assign expression's name and value. """
         
         super().__init__()
         self.name = name
         self.value = value
+        self.depth = -1
+        self.slot = -1
     
     
     def accept(self: Self, visitor: Any) -> Any:
@@ -36,6 +56,8 @@ class AssignExpr(Expr):
 class BinaryExpr(Expr):
     """ A binary expression in a tree. """
     
+    __slots__ = ("left", "operator", "right", "operation")
+    
     left: Expr
     """ The binary expression's left operand. """
     
@@ -45,6 +67,12 @@ class BinaryExpr(Expr):
     right: Expr
     """ The binrary expression's right operand. """
     
+    operation: Callable[[Any, Token, Any, Any], Any] | None
+    """
+    The binary expression's operator handler, which takes the
+    interpreter as its first argument, or `None` if it is not resolved.
+    """
+    
     def __init__(self: Self, left: Expr, operator: Token, right: Expr) -> None:
         """
         Initialize the binary expression's operator and operands.
@@ -54,6 +82,7 @@ class BinaryExpr(Expr):
         self.left = left
         self.operator = operator
         self.right = right
+        self.operation = None
     
     
     def accept(self: Self, visitor: Any) -> Any:
@@ -65,6 +94,8 @@ class BinaryExpr(Expr):
 class CallExpr(Expr):
     """ A call expression in a tree. """
     
+    __slots__ = ("callee", "paren", "arguments", "is_tail")
+    
     callee: Expr
     """ The call expression's callee. """
     
@@ -74,6 +105,12 @@ class CallExpr(Expr):
     arguments: list[Expr]
     """ The call expression's arguments. """
     
+    is_tail: bool
+    """
+    Whether the call expression is returned directly from a function,
+    so its call may replace the function's call.
+    """
+    
     def __init__(
             self: Self,
             callee: Expr, paren: Token, arguments: list[Expr]) -> None:
@@ -86,6 +123,7 @@ class CallExpr(Expr):
         self.callee = callee
         self.paren = paren
         self.arguments = arguments
+        self.is_tail = False
     
     
     def accept(self: Self, visitor: Any) -> Any:
@@ -97,18 +135,24 @@ class CallExpr(Expr):
 class GetExpr(Expr):
     """ A get expression in a tree. """
     
+    __slots__ = ("object", "name", "cache")
+    
     object: Expr
     """ The get expression's object. """
     
     name: Token
     """ The get expression's token. """
     
+    cache: InlineCache
+    """ The get expression's inline cache of method lookups. """
+    
     def __init__(self: Self, object: Expr, name: Token) -> None:
         """ Initialize the get expression's object and name. """
         
         super().__init__()
         self.object = object
         self.name = name
+        self.cache = InlineCache(name)
     
     
     def accept(self: Self, visitor: Any) -> None:
@@ -120,6 +164,8 @@ class GetExpr(Expr):
 class GroupingExpr(Expr):
     """ A grouping expression in a tree. """
     
+    __slots__ = ("expression",)
+    
     expression: Expr
     """ The grouping expression's expression. """
     
@@ -139,6 +185,8 @@ class GroupingExpr(Expr):
 class LiteralExpr(Expr):
     """ A literal expression in a tree. """
     
+    __slots__ = ("value",)
+    
     value: Any
     """ The literal expression's value. """
     
@@ -158,6 +206,8 @@ class LiteralExpr(Expr):
 class LogicalExpr(Expr):
     """ A logical expression in a tree. """
     
+    __slots__ = ("left", "operator", "right", "operation")
+    
     left: Expr
     """ The logical expression's left operand. """
     
@@ -167,6 +217,12 @@ class LogicalExpr(Expr):
     right: Expr
     """ The logical expression's right operand. """
     
+    operation: Callable[[Any, Self], Any] | None
+    """
+    The logical expression's operator handler, which takes the
+    interpreter as its first argument, or `None` if it is not resolved.
+    """
+    
     def __init__(self: Self, left: Expr, operator: Token, right: Expr) -> None:
         """ Initialize the logical expression's operator and operands. """
         
@@ -174,6 +230,7 @@ class LogicalExpr(Expr):
         self.left = left
         self.operator = operator
         self.right = right
+        self.operation = None
     
     
     def accept(self: Self, visitor: Any) -> Any:
@@ -185,6 +242,8 @@ class LogicalExpr(Expr):
 class SetExpr(Expr):
     """ A set expression in a tree. """
     
+    __slots__ = ("object", "name", "value", "cache")
+    
     object: Expr
     """ The set expression's object. """
     
@@ -194,6 +253,9 @@ class SetExpr(Expr):
     value: Expr
     """ The set expression's value. """
     
+    cache: InlineCache
+    """ The set expression's inline cache of field shapes. """
+    
     def __init__(self: Self, object: Expr, name: Token, value: Expr) -> None:
         """ Initialize the set expression's object, name, and value. """
         
@@ -201,6 +263,7 @@ class SetExpr(Expr):
         self.object = object
         self.name = name
         self.value = value
+        self.cache = InlineCache(name)
     
     
     def accept(self: Self, visitor: Any) -> Any:
@@ -212,18 +275,31 @@ class SetExpr(Expr):
 class SuperExpr(Expr):
     """ A super expression in a tree. """
     
+    __slots__ = ("keyword", "method", "depth", "slot")
+    
     keyword: Token
     """ The super expression's keyword. """
     
     method: Token
     """ The super expression's method. """
     
+    depth: int
+    """
+    The number of scopes between the super expression and the scope of
+    `super`.
+    """
+    
+    slot: int
+    """ The slot of `super` in its scope. """
+    
     def __init__(self: Self, keyword: Token, method: Token) -> None:
         """ Initialize the super expression's keyword and method. """
         
         super().__init__()
         self.keyword = keyword
         self.method = method
+        self.depth = -1
+        self.slot = -1
     
     
     def accept(self: Self, visitor: Any) -> Any:
@@ -235,14 +311,27 @@ class SuperExpr(Expr):
 class ThisExpr(Expr):
     """ A this expression in a tree. """
     
+    __slots__ = ("keyword", "depth", "slot")
+    
     keyword: Token
     """ The this expression's keyword. """
     
+    depth: int
+    """
+    The number of scopes between the this expression and the scope of
+    `this`.
+    """
+    
+    slot: int
+    """ The slot of `this` in its scope. """
+    
     def __init__(self: Self, keyword: Token) -> None:
         """ Initialize the this expression's keyword. """
         
         super().__init__()
         self.keyword = keyword
+        self.depth = -1
+        self.slot = -1
     
     
     def accept(self: Self, visitor: Any) -> Any:
@@ -254,18 +343,27 @@ class ThisExpr(Expr):
 class UnaryExpr(Expr):
     """ A unary expression in a tree. """
     
+    __slots__ = ("operator", "right", "operation")
+    
     operator: Token
     """ The unary expression's operator. """
     
     right: Expr
     """ The unary expression's right operand. """
     
+    operation: Callable[[Any, Token, Any], Any] | None
+    """
+    The unary expression's operator handler, which takes the
+    interpreter as its first argument, or `None` if it is not resolved.
+    """
+    
     def __init__(self: Self, operator: Token, right: Expr) -> None:
         """ Initialize the unary expression's operator and operand. """
         
         super().__init__()
         self.operator = operator
         self.right = right
+        self.operation = None
     
     
     def accept(self: Self, visitor: Any) -> Any:
@@ -277,14 +375,30 @@ class UnaryExpr(Expr):
 class VariableExpr(Expr):
     """ A variable expression in a tree. """
     
+    __slots__ = ("name", "depth", "slot")
+    
     name: Token
     """ The variable expression's name. """
     
+    depth: int
+    """
+    The number of scopes between the variable expression and its
+    variable's scope, or `-1` if it is resolved to a global variable.
+    """
+    
+    slot: int
+    """
+    The variable expression's variable slot in its scope, or in the
+    global environment if it is resolved to a global variable.
+    """
+    
     def __init__(self: Self, name: Token) -> None:
         """ Initialize the variable expression's name. """
         
         super().__init__()
         self.name = name
+        self.depth = -1
+        self.slot = -1
     
     
     def accept(self: Self, visitor: Any) -> Any:
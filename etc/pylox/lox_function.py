@@ -1,33 +1,61 @@
 from collections.abc import Callable
 from lox_callable import LoxCallable
 from lox_environment import Environment
-from lox_error_reporter import ErrorReporter
 from lox_stmt import FunctionStmt, Stmt
 from typing import Any, Self
 
-class ReturnException(Exception):
-    """ An exception containing a return value from a function call. """
+class Return:
+    """
+    A completion signal containing a return value from a function call.
+    Executing a statement produces a return signal if it returns from
+    the current function, or `None` if it completes normally.
+    """
+    
+    __slots__ = ("value",)
     
     value: Any
     """ The return value. """
     
     def __init__(self: Self, value: Any) -> None:
-        """ Initialize the return exception. """
+        """ Initialize the return signal. """
         
-        super().__init__()
         self.value = value
 
 
+class TailCall(Return):
+    """
+    A return signal for a call in tail position. The called function
+    runs in place of the returning function, so tail calls do not
+    nest.
+    """
+    
+    __slots__ = ("function", "slots")
+    
+    function: Any
+    """ The tail call's function. """
+    
+    slots: list[Any]
+    """ The tail call's initial slot values. """
+    
+    def __init__(self: Self, function: Any, slots: list[Any]) -> None:
+        """ Initialize the tail call's function and slot values. """
+        
+        super().__init__(None)
+        self.function = function
+        self.slots = slots
+
+
 class LoxFunction(LoxCallable):
     """ A user-defined Lox function. """
     
-    error_reporter: ErrorReporter
-    """ The function's error reporter. """
+    __slots__ = (
+            "closure", "executor", "declaration", "is_initializer",
+            "receiver")
     
     closure: Environment
     """ The function's closure. """
     
-    executor: Callable[[list[Stmt], Environment], None]
+    executor: Callable[[list[Stmt], Environment], Return | None]
     """ The function's executor. """
     
     declaration: FunctionStmt
@@ -36,19 +64,22 @@ class LoxFunction(LoxCallable):
     is_initializer: bool
     """ Whether the function is an initializer. """
     
+    receiver: Any
+    """ The function's bound receiver if it is a bound method. """
+    
     def __init__(
-            self: Self, error_reporter: ErrorReporter,
-            executor: Callable[[list[Stmt], Environment], None],
+            self: Self,
+            executor: Callable[[list[Stmt], Environment], Return | None],
             declaration: FunctionStmt, closure: Environment,
-            is_initializer: bool) -> None:
+            is_initializer: bool, receiver: Any = None) -> None:
         """ Initialize the function. """
         
         super().__init__()
-        self.error_reporter = error_reporter
         self.executor = executor
         self.declaration = declaration
         self.closure = closure
         self.is_initializer = is_initializer
+        self.receiver = receiver
     
     
     def __repr__(self: Self) -> str:
@@ -63,24 +94,38 @@ class LoxFunction(LoxCallable):
         return len(self.declaration.params)
     
     
-    def call(self: Self, arguments: list[Any]) -> None:
+    def call(self: Self, arguments: list[Any]) -> Any:
         """ Call the function and return its return value. """
         
-        environment: Environment = Environment(
-                self.error_reporter, self.closure)
-        
-        for index, param in enumerate(self.declaration.params):
-            environment.define(param.lexeme, arguments[index])
+        if self.receiver is not None:
+            arguments.insert(0, self.receiver)
         
-        try:
-            self.executor(self.declaration.body, environment)
-        except ReturnException as return_value:
-            if self.is_initializer:
-                return self.closure.get_at(0, "this")
-            
-            return return_value.value
+        return self.invoke(arguments)
+    
+    
+    def invoke(self: Self, slots: list[Any]) -> Any:
+        """
+        Call the function with its frame's initial slot values and
+        return its return value. Methods take their receiver as `this`
+        in the first slot, followed by their arguments. Tail calls run
+        in a loop instead of nesting.
+        """
         
-        if self.is_initializer:
-            return self.closure.get_at(0, "this")
+        function: LoxFunction = self
         
-        return None
+        while True:
+            environment: Environment = Environment(function.closure, slots)
+            completion: Return | None = function.executor(
+                    function.declaration.body, environment)
+            
+            if function.is_initializer:
+                return slots[0]
+            
+            if completion is None:
+                return None
+            
+            if type(completion) is not TailCall:
+                return completion.value
+            
+            function = completion.function
+            slots = completion.slots
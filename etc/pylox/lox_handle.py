@@ -0,0 +1,199 @@
+from typing import BinaryIO, Self
+
+class Handle:
+    """
+    A buffered stream available to Lox. Bytes are read from the stream
+    a block at a time, and written bytes are coalesced until a block is
+    full or the handle is flushed. Interactive handles are also flushed
+    after each line and before reading, like C's line-buffered streams.
+    """
+    
+    __slots__ = (
+            "stream", "is_readable", "is_writable", "is_interactive",
+            "is_buffered", "data", "position", "pending")
+    
+    BLOCK_SIZE: int = 0x10000
+    """ The number of bytes to read or write at a time. """
+    
+    stream: BinaryIO
+    """ The handle's underlying stream. """
+    
+    is_readable: bool
+    """ Whether the handle's stream can be read. """
+    
+    is_writable: bool
+    """ Whether the handle's stream can be written. """
+    
+    is_interactive: bool
+    """ Whether the handle's stream is interactive. """
+    
+    is_buffered: bool
+    """
+    Whether written bytes are held until a block is full. Unbuffered
+    handles are flushed after every write, like C's standard error.
+    """
+    
+    data: bytes
+    """ The bytes that have been read from the stream. """
+    
+    position: int
+    """ The index of the next byte to get from the read bytes. """
+    
+    pending: bytearray
+    """ The bytes that have not been written to the stream yet. """
+    
+    def __init__(
+            self: Self, stream: BinaryIO, is_buffered: bool = True) -> None:
+        """
+        Initialize the handle from its underlying stream and whether
+        written bytes are buffered.
+        """
+        
+        self.stream = stream
+        self.is_buffered = is_buffered
+        
+        try:
+            self.is_readable = stream.readable()
+            self.is_writable = stream.writable()
+            self.is_interactive = stream.isatty()
+        except (OSError, ValueError):
+            self.is_readable = self.is_writable = False
+            self.is_interactive = False
+        
+        self.data = b""
+        self.position = 0
+        self.pending = bytearray()
+    
+    
+    def fill(self: Self) -> bool:
+        """
+        Replace the read bytes with the next block of the stream and
+        return whether any bytes were read. Raise `OSError` or
+        `ValueError` if the stream could not be read.
+        """
+        
+        # Read whatever is available so interactive input is not held.
+        self.data = self.stream.read1(self.BLOCK_SIZE)
+        self.position = 0
+        return len(self.data) > 0
+    
+    
+    def get(self: Self) -> int | None:
+        """
+        Get the next byte from the handle, or `None` at the end of the
+        stream. Raise `OSError` or `ValueError` if the stream could not
+        be read.
+        """
+        
+        if self.position >= len(self.data) and not self.fill():
+            return None
+        
+        position: int = self.position
+        self.position = position + 1
+        return self.data[position]
+    
+    
+    def read(self: Self, count: int) -> bytes:
+        """
+        Read up to a number of bytes from the handle, or the rest of the
+        stream if the number is negative. Fewer bytes are returned at
+        the end of the stream. Raise `OSError` or `ValueError` if the
+        stream could not be read.
+        """
+        
+        chunks: list[bytes] = []
+        
+        while count != 0:
+            if self.position >= len(self.data) and not self.fill():
+                break
+            
+            start: int = self.position
+            end: int = len(self.data)
+            
+            if count > 0:
+                end = min(end, start + count)
+                count -= end - start
+            
+            chunks.append(self.data[start:end])
+            self.position = end
+        
+        return b"".join(chunks)
+    
+    
+    def read_line(self: Self) -> bytes:
+        """
+        Read bytes from the handle up to and including the next line
+        feed. Fewer bytes are returned at the end of the stream. Raise
+        `OSError` or `ValueError` if the stream could not be read.
+        """
+        
+        chunks: list[bytes] = []
+        
+        while self.position < len(self.data) or self.fill():
+            start: int = self.position
+            end: int = self.data.find(b"\n", start) + 1
+            
+            if end > 0:
+                chunks.append(self.data[start:end])
+                self.position = end
+                break
+            
+            chunks.append(self.data[start:])
+            self.position = len(self.data)
+        
+        return b"".join(chunks)
+    
+    
+    def put(self: Self, byte: int) -> None:
+        """
+        Put a byte to the handle. Raise `OSError` or `ValueError` if the
+        stream could not be written.
+        """
+        
+        pending: bytearray = self.pending
+        pending.append(byte)
+        
+        if not self.is_buffered or len(pending) >= self.BLOCK_SIZE:
+            self.flush()
+        elif byte == 10 and self.is_interactive:
+            self.flush()
+    
+    
+    def write(self: Self, data: bytes) -> None:
+        """
+        Write bytes to the handle. Raise `OSError` or `ValueError` if the
+        stream could not be written.
+        """
+        
+        pending: bytearray = self.pending
+        pending += data
+        
+        if not self.is_buffered or len(pending) >= self.BLOCK_SIZE:
+            self.flush()
+        elif self.is_interactive and b"\n" in data:
+            self.flush()
+    
+    
+    def flush(self: Self) -> None:
+        """
+        Write any pending bytes to the stream. Raise `OSError` or
+        `ValueError` if the stream could not be written.
+        """
+        
+        if self.pending:
+            self.stream.write(self.pending)
+            self.pending.clear()
+        
+        self.stream.flush()
+    
+    
+    def close(self: Self) -> None:
+        """
+        Flush and close the handle's stream. Raise `OSError` or
+        `ValueError` if the stream could not be flushed or closed.
+        """
+        
+        try:
+            self.flush()
+        finally:
+            self.stream.close()
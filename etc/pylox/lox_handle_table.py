@@ -0,0 +1,111 @@
+import sys
+
+from lox_handle import Handle
+from typing import Self
+
+STANDARD_HANDLES: tuple[Handle, ...] = (
+    Handle(sys.stdin.buffer),
+    Handle(sys.stdout.buffer),
+    Handle(sys.stderr.buffer, is_buffered=False),
+)
+""" The standard stream handles, shared by every handle table. """
+
+class HandleTable:
+    """
+    The handles available to an interpreter, indexed by handle number.
+    The first handle numbers are the standard streams, and file handles
+    follow them. Closed file handle numbers are kept in a free list to
+    be reused, so opening and closing a file handle takes constant time
+    and the table only grows when every file handle number is in use.
+    """
+    
+    FILE_HANDLE_MIN: int = len(STANDARD_HANDLES)
+    """ The minimum file handle number. """
+    
+    MAX_FILES: int = 0x100
+    """ The default maximum number of open file handles. """
+    
+    handles: list[Handle | None]
+    """ The handles by handle number, or `None` for closed handles. """
+    
+    free: list[int]
+    """ The closed file handle numbers that can be reused. """
+    
+    max_files: int
+    """ The maximum number of open file handles. """
+    
+    def __init__(self: Self) -> None:
+        """ Initialize the handle table with the standard handles. """
+        
+        self.handles = list(STANDARD_HANDLES)
+        self.free = []
+        self.max_files = self.MAX_FILES
+    
+    
+    def is_full(self: Self) -> bool:
+        """ Return whether the maximum number of files are open. """
+        
+        return (len(self.handles) - len(self.free) - self.FILE_HANDLE_MIN
+                >= self.max_files)
+    
+    
+    def get(self: Self, handle: int) -> Handle | None:
+        """ Return the handle at a handle number, or `None`. """
+        
+        if handle < 0 or handle >= len(self.handles):
+            return None
+        
+        return self.handles[handle]
+    
+    
+    def add(self: Self, stream: Handle) -> int:
+        """ Add a file handle to the table and return its handle number. """
+        
+        if self.free:
+            handle: int = self.free.pop()
+            self.handles[handle] = stream
+            return handle
+        
+        self.handles.append(stream)
+        return len(self.handles) - 1
+    
+    
+    def remove(self: Self, handle: int) -> Handle | None:
+        """
+        Remove and return the file handle at a handle number. Return
+        `None` if the handle number is not an open file handle.
+        """
+        
+        if handle < self.FILE_HANDLE_MIN or handle >= len(self.handles):
+            return None
+        
+        stream: Handle | None = self.handles[handle]
+        
+        if stream is not None:
+            self.handles[handle] = None
+            self.free.append(handle)
+        
+        return stream
+    
+    
+    def close(self: Self) -> None:
+        """
+        Close every open file handle and flush the standard handles.
+        Errors are ignored because the handles are being discarded.
+        """
+        
+        for stream in self.handles[self.FILE_HANDLE_MIN:]:
+            if stream is not None:
+                try:
+                    stream.close()
+                except (OSError, ValueError):
+                    pass # Failed to flush or close file.
+        
+        del self.handles[self.FILE_HANDLE_MIN:]
+        self.free.clear()
+        
+        for stream in STANDARD_HANDLES:
+            try:
+                stream.flush()
+            except (OSError, ValueError):
+                pass # Failed to flush stream.
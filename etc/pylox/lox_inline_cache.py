@@ -0,0 +1,113 @@
+from lox_shape import Shape
+from lox_token import Token
+from typing import Any, Self
+
+class InlineCache:
+    """
+    A cache of method lookups by class for a single property access in
+    the AST. A class' methods never change after it is created, so a
+    cached lookup is valid for as long as the class exists. The cache
+    holds one class until a second class is seen, then up to
+    `POLYMORPHIC_MAX` classes, then stops caching new classes. The
+    cache also holds the slot index of the field for the last shape
+    that was seen with the field.
+    """
+    
+    __slots__ = (
+            "name", "klass", "method", "entries", "shape", "slot",
+            "transition", "hits", "misses")
+    
+    POLYMORPHIC_MAX: int = 4
+    """ The maximum number of classes to cache at a single access. """
+    
+    name: Token
+    """ The inline cache's property name. """
+    
+    klass: Any
+    """ The first cached class, or `None` if the cache is empty. """
+    
+    method: Any
+    """
+    The first cached class' method, or `None` if the class has no
+    method with the property name.
+    """
+    
+    entries: dict[Any, Any] | None
+    """
+    The inline cache's methods by class if it has seen more than one
+    class.
+    """
+    
+    shape: Shape | None
+    """ The cached shape of instances, or `None` if no field is cached. """
+    
+    slot: int
+    """ The field's slot index in the cached shape. """
+    
+    transition: Shape | None
+    """
+    The shape after setting the field on an instance of the cached shape
+    if the cached shape does not have the field. Otherwise, `None`.
+    """
+    
+    hits: int
+    """ The number of lookups found in the inline cache. """
+    
+    misses: int
+    """ The number of lookups not found in the inline cache. """
+    
+    def __init__(self: Self, name: Token) -> None:
+        """ Initialize the inline cache. """
+        
+        self.name = name
+        self.klass = None
+        self.method = None
+        self.entries = None
+        self.shape = None
+        self.slot = 0
+        self.transition = None
+        self.hits = 0
+        self.misses = 0
+    
+    
+    def lookup(self: Self, klass: Any) -> Any:
+        """
+        Return a class' method with the property name, or `None` if it
+        has no such method.
+        """
+        
+        if klass is self.klass:
+            self.hits += 1
+            return self.method
+        
+        entries: dict[Any, Any] | None = self.entries
+        
+        if entries is not None and klass in entries:
+            self.hits += 1
+            return entries[klass]
+        
+        self.misses += 1
+        method: Any = klass.find_method(self.name.lexeme)
+        
+        if self.klass is None:
+            self.klass = klass
+            self.method = method
+        elif entries is None:
+            self.entries = {klass: method}
+        elif len(entries) < self.POLYMORPHIC_MAX - 1:
+            entries[klass] = method
+        
+        return method
+    
+    
+    def state(self: Self) -> str:
+        """ Return the name of the inline cache's state. """
+        
+        if self.klass is None:
+            return "uninitialized"
+        elif self.entries is None:
+            return "monomorphic"
+        elif self.misses > self.POLYMORPHIC_MAX:
+            return "megamorphic"
+        else:
+            return "polymorphic"
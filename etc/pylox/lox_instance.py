@@ -1,30 +1,31 @@
 from lox_class import LoxClass
-from lox_error_reporter import ErrorReporter
-from lox_environment import Environment
+from lox_environment import UNDEFINED
 from lox_function import LoxFunction
+from lox_inline_cache import InlineCache
+from lox_shape import Shape
 from lox_token import Token
 from typing import Any, Self
 
 class LoxInstance:
     """ An instance of a user-defined class. """
     
-    error_reporter: ErrorReporter
-    """ The instance's error reporter. """
+    __slots__ = ("klass", "shape", "values")
     
     klass: LoxClass
     """ The instance's class. """
     
-    fields: dict[str, Any]
-    """ The instance's fields. """
+    shape: Shape
+    """ The instance's shape of fields. """
     
-    def __init__(
-            self: Self,
-            error_reporter: ErrorReporter, klass: LoxClass) -> None:
+    values: list[Any]
+    """ The instance's field values by the slot indices of its shape. """
+    
+    def __init__(self: Self, klass: LoxClass) -> None:
         """ Initialize the instance. """
         
-        self.error_reporter = error_reporter
         self.klass = klass
-        self.fields = {}
+        self.shape = klass.shape
+        self.values = []
     
     
     def __repr__(self: Self) -> str:
@@ -33,34 +34,77 @@ class LoxInstance:
         return f"{self.klass.name} instance"
     
     
-    def get(self: Self, name: Token) -> Any:
-        """ Get a property from the instance. """
+    def get(self: Self, name: Token, cache: InlineCache) -> Any:
+        """
+        Get a property from the instance, looking up fields and methods
+        through an inline cache. Return `UNDEFINED` if the instance has
+        no property with the name.
+        """
+        
+        value: Any = self.get_field(name.lexeme, cache)
         
-        if name.lexeme in self.fields:
-            return self.fields[name.lexeme]
+        if value is not UNDEFINED:
+            return value
         
-        method: LoxFunction | None = self.klass.find_method(name.lexeme)
+        method: LoxFunction | None = cache.lookup(self.klass)
         
         # Move binding here as a workaround for circular imports.
         if method is not None:
             return self.bind_method(method)
         
-        self.error_reporter.error(name, f"Undefined property `{name.lexeme}`.")
-        raise RuntimeError()
+        return UNDEFINED
+    
+    
+    def get_field(self: Self, name: str, cache: InlineCache) -> Any:
+        """
+        Get a field from the instance through an inline cache. Return
+        `UNDEFINED` if the instance has no field with the name.
+        """
+        
+        shape: Shape = self.shape
+        
+        if shape is cache.shape:
+            return self.values[cache.slot]
+        
+        slot: int | None = shape.slots.get(name)
+        
+        if slot is None:
+            return UNDEFINED
+        
+        cache.shape = shape
+        cache.slot = slot
+        return self.values[slot]
     
     
-    def set(self: Self, name: Token, value: Any) -> None:
-        """ Set a field on the instance. """
+    def set(self: Self, name: Token, value: Any, cache: InlineCache) -> None:
+        """ Set a field on the instance through an inline cache. """
+        
+        shape: Shape = self.shape
+        
+        if shape is cache.shape:
+            if cache.transition is None:
+                self.values[cache.slot] = value
+            else:
+                self.shape = cache.transition
+                self.values.append(value)
+            
+            return
+        
+        slot: int | None = shape.slots.get(name.lexeme)
+        cache.shape = shape
         
-        self.fields[name.lexeme] = value
+        if slot is None:
+            self.shape = cache.transition = shape.add_field(name.lexeme)
+            self.values.append(value)
+        else:
+            cache.slot = slot
+            cache.transition = None
+            self.values[slot] = value
     
     
     def bind_method(self: Self, method: LoxFunction) -> LoxFunction:
         """ Create a new method bound to this instance. """
         
-        environment: Environment = Environment(
-                self.error_reporter, method.closure)
-        environment.define("this", self)
         return LoxFunction(
-                self.error_reporter, method.executor,
-                method.declaration, environment, method.is_initializer)
+                method.executor, method.declaration, method.closure,
+                method.is_initializer, self)
@@ -1,18 +1,24 @@
+import sys
+import threading
+
 from collections.abc import Callable
 from lox_callable import LoxCallable
 from lox_class import LoxClass
-from lox_environment import Environment
+from lox_environment import UNDEFINED, Environment, GlobalEnvironment
 from lox_error_reporter import ErrorReporter
 from lox_expr import AssignExpr, BinaryExpr, CallExpr, Expr, ExprVisitor
 from lox_expr import GetExpr, GroupingExpr, LiteralExpr, LogicalExpr, SetExpr
 from lox_expr import SuperExpr, ThisExpr, UnaryExpr, VariableExpr
-from lox_function import ReturnException, LoxFunction
+from lox_function import LoxFunction, Return, TailCall
+from lox_handle_table import HandleTable
+from lox_inline_cache import InlineCache
 from lox_instance import LoxInstance
-from lox_intrinsic import install_intrinsics
+from lox_intrinsic import install_intrinsics, print_line
 from lox_native_function import NativeFunction
 from lox_stmt import BlockStmt, ClassStmt, ExpressionStmt, FunctionStmt
 from lox_stmt import IfStmt, PrintStmt, ReturnStmt, Stmt, StmtVisitor, VarStmt
 from lox_stmt import WhileStmt
+from lox_string import STRING_TYPES, concatenate
 from lox_token import Token
 from lox_token_type import TokenType
 from time import perf_counter
@@ -29,29 +35,109 @@ def create_clock(start: float) -> Callable[[list[Any]], float]:
     return clock
 
 
+def stringify(value: Any) -> str:
+    """ Return a value's string representation in Lox. """
+    
+    if value is None:
+        return "nil"
+    elif value is False:
+        return "false"
+    elif value is True:
+        return "true"
+    elif isinstance(value, float):
+        text: str = str(value)
+        
+        if text == "-0.0":
+            return "0"
+        elif text.endswith(".0"):
+            return text[:-2]
+        else:
+            return text
+    else:
+        return str(value)
+
+
+class StackOverflow(RuntimeError):
+    """
+    Raised when Python's recursion limit is reached in a Lox call. The
+    error is reported after the stack has unwound so that there is room
+    to report it.
+    """
+    
+    token: Token
+    """ The token of the call that overflowed the stack. """
+    
+    def __init__(self: Self, token: Token) -> None:
+        """ Initialize the stack overflow from its call's token. """
+        
+        super().__init__()
+        self.token = token
+
+
 class Interpreter(StmtVisitor, ExprVisitor):
     """ Interprets a list of statements. """
     
+    DEPTH_MAX: int = 0x4000
+    """ The default maximum depth of nested Lox calls. """
+    
+    PYTHON_FRAMES_PER_CALL: int = 32
+    """
+    The number of Python frames used by a nested Lox call made from a
+    block in a loop, measured with the tree engine. Calls that are more
+    deeply nested in their function use more frames and may reach
+    Python's recursion limit before the maximum depth, which is also
+    reported as a stack overflow.
+    """
+    
+    PYTHON_FRAMES_RESERVED: int = 0x400
+    """ The number of Python frames to allow in addition to Lox calls. """
+    
+    STACK_BYTES_PER_FRAME: int = 0x400
+    """
+    The bytes of native stack to allow for each Python frame. This is
+    about twice the most measured for a Python frame that recurses
+    through native code.
+    """
+    
     error_reporter: ErrorReporter
     """ The interpreter's error reporter. """
     
-    globals: Environment
+    globals: GlobalEnvironment
     """ The interpreter's global environment. """
     
     environment: Environment
     """ The interpreter's environment. """
     
-    locals: dict[Expr, int]
-    """ The interpreter's resolved local variables. """
+    profile: bool = False
+    """ Whether to track resolved inline caches for profiling. """
+    
+    inline_caches: list[InlineCache]
+    """
+    The interpreter's resolved inline caches for profiling. Caches are
+    only tracked when profiling so that they can be freed with their
+    syntax trees.
+    """
+    
+    depth: int
+    """ The interpreter's current depth of nested Lox calls. """
+    
+    max_depth: int
+    """ The interpreter's maximum depth of nested Lox calls. """
+    
+    handles: HandleTable
+    """ The interpreter's table of handles. """
     
     def __init__(self: Self, error_reporter: ErrorReporter) -> None:
         """ Initialize the interpreter. """
         
         super().__init__()
         self.error_reporter = error_reporter
-        self.globals = Environment(error_reporter)
+        self.globals = GlobalEnvironment(error_reporter)
         self.environment = self.globals
-        self.locals = {}
+        self.inline_caches = []
+        self.depth = 0
+        self.max_depth = self.DEPTH_MAX
+        self.handles = HandleTable()
     
     
     def define_native(
@@ -63,18 +149,84 @@ class Interpreter(StmtVisitor, ExprVisitor):
         self.globals.define(name, native)
     
     
+    def install_standard_library(self: Self) -> None:
+        """ Install the standard library in the interpreter's globals. """
+        
+        self.define_native("clock", 0, create_clock(perf_counter()))
+        install_intrinsics(self.define_native, self.handles)
+    
+    
+    def close(self: Self) -> None:
+        """ Close the interpreter's file handles. """
+        
+        self.handles.close()
+    
+    
     def interpret(self: Self, statements: list[Stmt]) -> None:
         """ Interpret a list of statements. """
         
-        # Install the standard library.
-        self.define_native("clock", 0, create_clock(perf_counter()))
-        install_intrinsics(self.define_native)
+        self.install_standard_library()
         
-        try:
+        def program() -> None:
             for statement in statements:
                 self.execute(statement)
-        except RuntimeError:
-            pass
+        
+        self.run(program)
+    
+    
+    def run(self: Self, program: Callable[[], None]) -> None:
+        """
+        Run a program on a thread with a stack that is large enough for
+        the maximum depth of nested Lox calls. Python's recursion limit
+        is only raised while the program runs, so the rest of Lox keeps
+        the limit that is safe for the main thread. The stack is halved
+        until it can be allocated. Runtime errors stop the program and
+        reset the interpreter.
+        """
+        
+        errors: list[BaseException] = []
+        
+        def target() -> None:
+            try:
+                program()
+            except StackOverflow as error:
+                self.error(error.token, "Stack overflow.")
+                self.environment = self.globals
+                self.depth = 0
+            except RuntimeError:
+                self.environment = self.globals
+                self.depth = 0
+            except BaseException as error:
+                errors.append(error) # Raise exits and bugs on this thread.
+        
+        frame_count: int = (self.max_depth * self.PYTHON_FRAMES_PER_CALL
+                + self.PYTHON_FRAMES_RESERVED)
+        recursion_limit: int = sys.getrecursionlimit()
+        stack_size: int = threading.stack_size()
+        
+        try:
+            while True:
+                thread: threading.Thread = threading.Thread(
+                        target=target, daemon=True)
+                threading.stack_size(frame_count * self.STACK_BYTES_PER_FRAME)
+                sys.setrecursionlimit(frame_count)
+                
+                try:
+                    thread.start()
+                    break
+                except RuntimeError:
+                    if frame_count <= self.PYTHON_FRAMES_RESERVED:
+                        raise
+                    
+                    frame_count //= 2 # Failed to allocate the stack.
+            
+            thread.join()
+        finally:
+            threading.stack_size(stack_size)
+            sys.setrecursionlimit(recursion_limit)
+        
+        if errors:
+            raise errors[0]
     
     
     def evaluate(self: Self, expr: Expr) -> Any:
@@ -83,40 +235,113 @@ class Interpreter(StmtVisitor, ExprVisitor):
         return expr.accept(self)
     
     
-    def execute(self: Self, stmt: Stmt) -> None:
-        """ Execute a statement. """
+    def execute(self: Self, stmt: Stmt) -> Return | None:
+        """
+        Execute a statement and return a return signal if it returns
+        from the current function.
+        """
         
-        stmt.accept(self)
+        return stmt.accept(self)
     
     
-    def resolve(self: Self, expr: Expr, depth: int) -> None:
-        """ Resolve an expression's variable to a depth. """
+    def resolve(
+            self: Self, expr: AssignExpr | SuperExpr | ThisExpr | VariableExpr,
+            depth: int, slot: int) -> None:
+        """ Resolve an expression's variable to a depth and slot. """
         
-        self.locals[expr] = depth
+        expr.depth = depth
+        expr.slot = slot
+    
+    
+    def resolve_cache(self: Self, cache: InlineCache) -> None:
+        """ Track a resolved inline cache if profiling is enabled. """
+        
+        if self.profile:
+            self.inline_caches.append(cache)
+    
+    
+    def resolve_global(self: Self, expr: AssignExpr | VariableExpr) -> None:
+        """ Resolve an expression's variable to a global slot. """
+        
+        expr.depth = -1
+        expr.slot = self.globals.intern(expr.name.lexeme)
+    
+    
+    def resolve_operator(
+            self: Self, expr: BinaryExpr | LogicalExpr | UnaryExpr) -> None:
+        """
+        Resolve an operator expression to a handler specialized for its
+        operator. Handlers are stored as functions rather than as bound
+        methods so that syntax trees do not refer to an interpreter.
+        """
+        
+        if isinstance(expr, LogicalExpr):
+            if expr.operator.type == TokenType.OR:
+                expr.operation = Interpreter.logical_or
+            else:
+                expr.operation = Interpreter.logical_and
+        elif isinstance(expr, UnaryExpr):
+            match expr.operator.type:
+                case TokenType.MINUS:
+                    expr.operation = Interpreter.unary_negate
+                case TokenType.BANG:
+                    expr.operation = Interpreter.unary_not
+                case _:
+                    expr.operation = Interpreter.unary_unimplemented
+        else:
+            match expr.operator.type:
+                case TokenType.GREATER:
+                    expr.operation = Interpreter.binary_greater
+                case TokenType.GREATER_EQUAL:
+                    expr.operation = Interpreter.binary_greater_equal
+                case TokenType.LESS:
+                    expr.operation = Interpreter.binary_less
+                case TokenType.LESS_EQUAL:
+                    expr.operation = Interpreter.binary_less_equal
+                case TokenType.BANG_EQUAL:
+                    expr.operation = Interpreter.binary_not_equal
+                case TokenType.EQUAL_EQUAL:
+                    expr.operation = Interpreter.binary_equal
+                case TokenType.MINUS:
+                    expr.operation = Interpreter.binary_subtract
+                case TokenType.PLUS:
+                    expr.operation = Interpreter.binary_add
+                case TokenType.SLASH:
+                    expr.operation = Interpreter.binary_divide
+                case TokenType.STAR:
+                    expr.operation = Interpreter.binary_multiply
+                case _:
+                    expr.operation = Interpreter.binary_unimplemented
     
     
     def execute_block(
-            self: Self,
-            statements: list[Stmt], environment: Environment) -> None:
-        """ Execute a block of statements in a new environment. """
+            self: Self, statements: list[Stmt],
+            environment: Environment) -> Return | None:
+        """
+        Execute a block of statements in a new environment and return a
+        return signal if it returns from the current function. A runtime
+        error leaves the environment to be reset by `interpret`.
+        """
         
         previous: Environment = self.environment
+        self.environment = environment
         
-        try:
-            self.environment = environment
+        for statement in statements:
+            completion: Return | None = self.execute(statement)
             
-            for statement in statements:
-                self.execute(statement)
-        finally:
-            self.environment = previous
+            if completion is not None:
+                self.environment = previous
+                return completion
+        
+        self.environment = previous
+        return None
     
     
-    def visit_block_stmt(self: Self, stmt: BlockStmt) -> None:
+    def visit_block_stmt(self: Self, stmt: BlockStmt) -> Return | None:
         """ Visit and execute a block statement. """
         
-        self.execute_block(
-                stmt.statements,
-                Environment(self.error_reporter, self.environment))
+        return self.execute_block(
+                stmt.statements, Environment(self.environment))
     
     
     def visit_class_stmt(self: Self, stmt: ClassStmt) -> None:
@@ -131,28 +356,24 @@ class Interpreter(StmtVisitor, ExprVisitor):
                 raise self.error(
                         stmt.superclass.name, "Superclass must be a class.")
         
-        self.environment.define(stmt.name.lexeme, None)
-        
         if stmt.superclass is not None:
-            self.environment = Environment(
-                    self.error_reporter, self.environment)
+            self.environment = Environment(self.environment)
             self.environment.define("super", superclass)
         
         methods: dict[str, LoxFunction] = {}
         
         for method in stmt.methods:
             function: LoxFunction = LoxFunction(
-                    self.error_reporter, self.execute_block,
-                    method, self.environment, method.name.lexeme == "init")
+                    self.execute_block, method, self.environment,
+                    method.name.lexeme == "init")
             methods[method.name.lexeme] = function
         
-        klass: LoxClass = LoxClass(
-                self.error_reporter, stmt.name.lexeme, superclass, methods)
+        klass: LoxClass = LoxClass(stmt.name.lexeme, superclass, methods)
         
         if superclass is not None and self.environment.enclosing is not None:
             self.environment = self.environment.enclosing
         
-        self.environment.assign(stmt.name, klass)
+        self.environment.define(stmt.name.lexeme, klass)
     
     
     def visit_expression_stmt(self: Self, stmt: ExpressionStmt) -> None:
@@ -165,53 +386,40 @@ class Interpreter(StmtVisitor, ExprVisitor):
         """ Visit and execute a function statement. """
         
         function: LoxFunction = LoxFunction(
-                self.error_reporter,
                 self.execute_block, stmt, self.environment, False)
         self.environment.define(stmt.name.lexeme, function)
     
     
-    def visit_if_stmt(self: Self, stmt: IfStmt) -> None:
+    def visit_if_stmt(self: Self, stmt: IfStmt) -> Return | None:
         """ Visit and execute an if statement. """
         
         if self.is_truthy(self.evaluate(stmt.condition)):
-            self.execute(stmt.then_branch)
+            return self.execute(stmt.then_branch)
         elif stmt.else_branch is not None:
-            self.execute(stmt.else_branch)
+            return self.execute(stmt.else_branch)
+        
+        return None
     
     
     def visit_print_stmt(self: Self, stmt: PrintStmt) -> None:
         """ Visit and execute a print statement. """
         
-        value: Any = self.evaluate(stmt.expression)
-        
-        if value is None:
-            print("nil")
-        elif value is False:
-            print("false")
-        elif value is True:
-            print("true")
-        elif isinstance(value, float):
-            text: str = str(value)
-            
-            if text == "-0.0":
-                print("0")
-            elif text.endswith(".0"):
-                print(text[:-2])
-            else:
-                print(text)
-        else:
-            print(str(value))
+        print_line(stringify(self.evaluate(stmt.expression)))
     
     
-    def visit_return_stmt(self: Self, stmt: ReturnStmt) -> None:
+    def visit_return_stmt(self: Self, stmt: ReturnStmt) -> Return:
         """ Visit and execute a return statement. """
         
         value: Any = None
         
         if stmt.value is not None:
             value = self.evaluate(stmt.value)
+            
+            # Calls in tail position evaluate to a tail call signal.
+            if type(value) is TailCall:
+                return value
         
-        raise ReturnException(value)
+        return Return(value)
     
     
     def visit_var_stmt(self: Self, stmt: VarStmt) -> None:
@@ -225,11 +433,16 @@ class Interpreter(StmtVisitor, ExprVisitor):
         self.environment.define(stmt.name.lexeme, value)
     
     
-    def visit_while_stmt(self: Self, stmt: WhileStmt) -> None:
+    def visit_while_stmt(self: Self, stmt: WhileStmt) -> Return | None:
         """ Visit and execute a while statement. """
         
         while self.is_truthy(self.evaluate(stmt.condition)):
-            self.execute(stmt.body)
+            completion: Return | None = self.execute(stmt.body)
+            
+            if completion is not None:
+                return completion
+        
+        return None
     
     
     def visit_assign_expr(self: Self, expr: AssignExpr) -> Any:
@@ -237,10 +450,10 @@ class Interpreter(StmtVisitor, ExprVisitor):
         
         value: Any = self.evaluate(expr.value)
         
-        if expr in self.locals:
-            self.environment.assign_at(self.locals[expr], expr.name, value)
+        if expr.depth < 0:
+            self.globals.assign_global(expr.name, expr.slot, value)
         else:
-            self.globals.assign(expr.name, value)
+            self.environment.assign_at(expr.depth, expr.slot, value)
         
         return value
     
@@ -251,54 +464,91 @@ class Interpreter(StmtVisitor, ExprVisitor):
         left: Any = self.evaluate(expr.left)
         right: Any = self.evaluate(expr.right)
         
-        match expr.operator.type:
-            case TokenType.GREATER:
-                self.check_number_operands(left, expr.operator, right)
-                return float(left) > float(right)
-            case TokenType.GREATER_EQUAL:
-                self.check_number_operands(left, expr.operator, right)
-                return float(left) >= float(right)
-            case TokenType.LESS:
-                self.check_number_operands(left, expr.operator, right)
-                return float(left) < float(right)
-            case TokenType.LESS_EQUAL:
-                self.check_number_operands(left, expr.operator, right)
-                return float(left) <= float(right)
-            case TokenType.BANG_EQUAL:
-                return not self.is_equal(left, right)
-            case TokenType.EQUAL_EQUAL:
-                return self.is_equal(left, right)
-            case TokenType.MINUS:
-                self.check_number_operands(left, expr.operator, right)
-                return float(left) - float(right)
-            case TokenType.PLUS:
-                if isinstance(left, float) and isinstance(right, float):
-                    return float(left) + float(right)
-                
-                if isinstance(left, str) and isinstance(right, str):
-                    return str(left) + str(right)
-                
-                raise self.error(
-                        expr.operator,
-                        "Operands must both be numbers or strings.")
-            case TokenType.SLASH:
-                self.check_number_operands(left, expr.operator, right)
-                
-                if right == 0.0:
-                    raise self.error(expr.operator, "Cannot divide by zero.")
-                
-                return float(left) / float(right)
-            case TokenType.STAR:
-                self.check_number_operands(left, expr.operator, right)
-                return float(left) * float(right)
-        
-        raise self.error(expr.operator, "Unimplemented binary operator.")
+        return expr.operation(self, expr.operator, left, right)
     
     
     def visit_call_expr(self: Self, expr: CallExpr) -> Any:
-        """ Visit a call expression and return a value. """
+        """
+        Visit a call expression and return a value. Calls to Lox
+        functions in tail position return a tail call signal instead.
+        """
+        
+        if isinstance(expr.callee, GetExpr):
+            return self.invoke(expr, expr.callee)
+        elif isinstance(expr.callee, SuperExpr):
+            object, method = self.find_super_method(expr.callee)
+            return self.invoke_method(expr, object, method)
+        
+        return self.call_value(expr, self.evaluate(expr.callee))
+    
+    
+    def invoke(self: Self, expr: CallExpr, callee: GetExpr) -> Any:
+        """
+        Call a property of an instance. Methods are called without
+        binding them to the instance.
+        """
+        
+        object: Any = self.evaluate(callee.object)
+        
+        if not isinstance(object, LoxInstance):
+            raise self.error(callee.name, "Only instances have properties.")
+        
+        field: Any = object.get_field(callee.name.lexeme, callee.cache)
+        
+        if field is not UNDEFINED:
+            return self.call_value(expr, field)
+        
+        method: LoxFunction | None = callee.cache.lookup(object.klass)
+        
+        if method is None:
+            raise self.error(
+                    callee.name,
+                    f"Undefined property `{callee.name.lexeme}`.")
+        
+        return self.invoke_method(expr, object, method)
+    
+    
+    def invoke_method(
+            self: Self, expr: CallExpr,
+            object: LoxInstance, method: LoxFunction) -> Any:
+        """
+        Call a method with a receiver by binding `this` directly in the
+        call's frame.
+        """
+        
+        slots: list[Any] = [object]
+        
+        for argument in expr.arguments:
+            slots.append(self.evaluate(argument))
+        
+        arity: int = method.arity()
+        
+        if len(expr.arguments) != arity:
+            raise self.error(
+                    expr.paren,
+                    f"Expected {arity} arguments but got "
+                    f"{len(expr.arguments)}.")
+        
+        if expr.is_tail:
+            return TailCall(method, slots)
+        
+        self.depth += 1
+        
+        if self.depth > self.max_depth:
+            raise self.error(expr.paren, "Stack overflow.")
+        
+        try:
+            result: Any = method.invoke(slots)
+        except RecursionError:
+            raise StackOverflow(expr.paren)
+        
+        self.depth -= 1
+        return result
+    
+    
+    def call_value(self: Self, expr: CallExpr, callee: Any) -> Any:
+        """ Call an evaluated callee with a call's arguments. """
         
-        callee: Any = self.evaluate(expr.callee)
         arguments: list[Any] = []
         
         for argument in expr.arguments:
@@ -315,7 +565,24 @@ class Interpreter(StmtVisitor, ExprVisitor):
                     expr.paren,
                     f"Expected {arity} arguments but got {len(arguments)}.")
         
-        return callee.call(arguments)
+        if expr.is_tail and type(callee) is LoxFunction:
+            if callee.receiver is not None:
+                arguments.insert(0, callee.receiver)
+            
+            return TailCall(callee, arguments)
+        
+        self.depth += 1
+        
+        if self.depth > self.max_depth:
+            raise self.error(expr.paren, "Stack overflow.")
+        
+        try:
+            result: Any = callee.call(arguments)
+        except RecursionError:
+            raise StackOverflow(expr.paren)
+        
+        self.depth -= 1
+        return result
     
     
     def visit_get_expr(self: Self, expr: GetExpr) -> Any:
@@ -326,7 +593,13 @@ class Interpreter(StmtVisitor, ExprVisitor):
         if not isinstance(object, LoxInstance):
             raise self.error(expr.name, "Only instances have properties.")
         
-        return object.get(expr.name)
+        value: Any = object.get(expr.name, expr.cache)
+        
+        if value is UNDEFINED:
+            raise self.error(
+                    expr.name, f"Undefined property `{expr.name.lexeme}`.")
+        
+        return value
     
     
     def visit_grouping_expr(self: Self, expr: GroupingExpr) -> Any:
@@ -344,16 +617,7 @@ class Interpreter(StmtVisitor, ExprVisitor):
     def visit_logical_expr(self: Self, expr: LogicalExpr) -> Any:
         """ Visit a logical expression and return a value. """
         
-        left: Any = self.evaluate(expr.left)
-        
-        if expr.operator.type == TokenType.OR:
-            if self.is_truthy(left):
-                return left
-        else:
-            if not self.is_truthy(left):
-                return left
-        
-        return self.evaluate(expr.right)
+        return expr.operation(self, expr)
     
     
     def visit_set_expr(self: Self, expr: SetExpr) -> Any:
@@ -365,16 +629,26 @@ class Interpreter(StmtVisitor, ExprVisitor):
             raise self.error(expr.name, "Only instances have fields.")
         
         value: Any = self.evaluate(expr.value)
-        object.set(expr.name, value)
+        object.set(expr.name, value, expr.cache)
         return value
     
     
     def visit_super_expr(self: Self, expr: SuperExpr) -> Any:
         """ Visit a super expression and return a value. """
         
-        distance: int = self.locals[expr]
-        superclass: LoxClass = self.environment.get_at(distance, "super")
-        object: LoxInstance = self.environment.get_at(distance - 1, "this")
+        object, method = self.find_super_method(expr)
+        return object.bind_method(method)
+    
+    
+    def find_super_method(
+            self: Self, expr: SuperExpr) -> tuple[LoxInstance, LoxFunction]:
+        """ Find a super expression's receiver and superclass method. """
+        
+        superclass: LoxClass = self.environment.get_at(expr.depth, expr.slot)
+        
+        # `this` is always the first slot of the method's frame, which is
+        # enclosed by the scope containing `super`.
+        object: LoxInstance = self.environment.get_at(expr.depth - 1, 0)
         method: LoxFunction | None = superclass.find_method(
                 expr.method.lexeme)
         
@@ -382,85 +656,200 @@ class Interpreter(StmtVisitor, ExprVisitor):
             raise self.error(
                     expr.method, f"Undefined property `{expr.method.lexeme}`.")
         
-        return object.bind_method(method)
+        return object, method
     
     
     def visit_this_expr(self: Self, expr: ThisExpr) -> Any:
         """ Visit a this expression and return a value. """
         
-        return self.look_up_variable(expr.keyword, expr)
+        return self.environment.get_at(expr.depth, expr.slot)
     
     
     def visit_unary_expr(self: Self, expr: UnaryExpr) -> Any:
         """ Visit a unary expression and return a value. """
         
-        right: Any = self.evaluate(expr.right)
-        
-        match expr.operator.type:
-            case TokenType.MINUS:
-                self.check_number_operand(expr.operator, right)
-                return -float(right)
-            case TokenType.BANG:
-                return not self.is_truthy(right)
-        
-        raise self.error(expr.operator, "Unimplemented unary operator.")
+        return expr.operation(self, expr.operator, self.evaluate(expr.right))
     
     
     def visit_variable_expr(self: Self, expr: VariableExpr) -> Any:
         """ Visit a variable expression and return a value. """
         
-        return self.look_up_variable(expr.name, expr)
+        if expr.depth < 0:
+            return self.globals.get_global(expr.name, expr.slot)
+        
+        return self.environment.get_at(expr.depth, expr.slot)
     
     
-    def look_up_variable(self: Self, name: Token, expr: Expr) -> Any:
-        """ Look up a variable's value from its name and expression. """
+    def binary_greater(self: Self, operator: Token, a: Any, b: Any) -> Any:
+        """ Compare whether a number is greater than another number. """
         
-        if expr in self.locals:
-            return self.environment.get_at(self.locals[expr], name.lexeme)
-        else:
-            return self.globals.get(name)
+        if type(a) is float and type(b) is float:
+            return a > b
+        
+        raise self.error(operator, "Operands must both be numbers.")
     
     
-    def is_truthy(self: Self, value: Any) -> bool:
-        """ Return whether a value is truthy in Lox. """
-        
-        if value is None:
-            return False
+    def binary_greater_equal(
+            self: Self, operator: Token, a: Any, b: Any) -> Any:
+        """
+        Compare whether a number is greater than or equal to another
+        number.
+        """
         
-        if isinstance(value, bool):
-            return bool(value)
+        if type(a) is float and type(b) is float:
+            return a >= b
         
-        return True
+        raise self.error(operator, "Operands must both be numbers.")
     
     
-    def is_equal(self: Self, a: Any, b: Any) -> bool:
-        """ Return whether two values are equal in Lox. """
+    def binary_less(self: Self, operator: Token, a: Any, b: Any) -> Any:
+        """ Compare whether a number is less than another number. """
         
-        if type(a) != type(b):
-            return False
+        if type(a) is float and type(b) is float:
+            return a < b
         
-        return a == b
+        raise self.error(operator, "Operands must both be numbers.")
     
     
-    def check_number_operand(self: Self, operator: Token, right: Any) -> None:
+    def binary_less_equal(self: Self, operator: Token, a: Any, b: Any) -> Any:
         """
-        Throw an error if a unary operator token's operand is not a
+        Compare whether a number is less than or equal to another
         number.
         """
         
-        if not isinstance(right, float):
-            raise self.error(operator, "Operand must be a number.")
+        if type(a) is float and type(b) is float:
+            return a <= b
+        
+        raise self.error(operator, "Operands must both be numbers.")
+    
+    
+    def binary_not_equal(self: Self, operator: Token, a: Any, b: Any) -> Any:
+        """ Compare whether two values are not equal. """
+        
+        if type(a) is type(b):
+            return a != b
+        
+        return (type(a) not in STRING_TYPES or type(b) not in STRING_TYPES
+                or a != b)
+    
     
+    def binary_equal(self: Self, operator: Token, a: Any, b: Any) -> Any:
+        """ Compare whether two values are equal. """
+        
+        if type(a) is type(b):
+            return a == b
+        
+        return type(a) in STRING_TYPES and type(b) in STRING_TYPES and a == b
+    
+    
+    def binary_subtract(self: Self, operator: Token, a: Any, b: Any) -> Any:
+        """ Subtract a number from another number. """
+        
+        if type(a) is float and type(b) is float:
+            return a - b
+        
+        raise self.error(operator, "Operands must both be numbers.")
     
-    def check_number_operands(
-            self: Self, left: Any, operator: Token, right: Any) -> None:
+    
+    def binary_add(self: Self, operator: Token, a: Any, b: Any) -> Any:
+        """ Add two numbers or concatenate two strings. """
+        
+        if type(a) is float and type(b) is float:
+            return a + b
+        
+        if type(a) in STRING_TYPES and type(b) in STRING_TYPES:
+            return concatenate(a, b)
+        
+        raise self.error(operator, "Operands must both be numbers or strings.")
+    
+    
+    def binary_divide(self: Self, operator: Token, a: Any, b: Any) -> Any:
+        """ Divide a number by another number. """
+        
+        if type(a) is not float or type(b) is not float:
+            raise self.error(operator, "Operands must both be numbers.")
+        
+        if b == 0.0:
+            raise self.error(operator, "Cannot divide by zero.")
+        
+        return a / b
+    
+    
+    def binary_multiply(self: Self, operator: Token, a: Any, b: Any) -> Any:
+        """ Multiply two numbers. """
+        
+        if type(a) is float and type(b) is float:
+            return a * b
+        
+        raise self.error(operator, "Operands must both be numbers.")
+    
+    
+    def binary_unimplemented(
+            self: Self, operator: Token, a: Any, b: Any) -> Any:
+        """ Handle an unimplemented binary operator. """
+        
+        raise self.error(operator, "Unimplemented binary operator.")
+    
+    
+    def unary_negate(self: Self, operator: Token, right: Any) -> Any:
+        """ Negate a number. """
+        
+        if type(right) is float:
+            return -right
+        
+        raise self.error(operator, "Operand must be a number.")
+    
+    
+    def unary_not(self: Self, operator: Token, right: Any) -> Any:
+        """ Return whether a value is falsey. """
+        
+        return right is None or right is False
+    
+    
+    def unary_unimplemented(self: Self, operator: Token, right: Any) -> Any:
+        """ Handle an unimplemented unary operator. """
+        
+        raise self.error(operator, "Unimplemented unary operator.")
+    
+    
+    def logical_or(self: Self, expr: LogicalExpr) -> Any:
         """
-        Throw an error if a either of a binary operator token's operands
-        are not numbers.
+        Evaluate a logical or expression, short-circuiting if its left
+        operand is truthy.
         """
         
-        if not isinstance(left, float) or not isinstance(right, float):
-            raise self.error(operator, "Operands must both be numbers.")
+        left: Any = self.evaluate(expr.left)
+        
+        if left is None or left is False:
+            return self.evaluate(expr.right)
+        
+        return left
+    
+    
+    def logical_and(self: Self, expr: LogicalExpr) -> Any:
+        """
+        Evaluate a logical and expression, short-circuiting if its left
+        operand is falsey.
+        """
+        
+        left: Any = self.evaluate(expr.left)
+        
+        if left is None or left is False:
+            return left
+        
+        return self.evaluate(expr.right)
+    
+    
+    def is_truthy(self: Self, value: Any) -> bool:
+        """ Return whether a value is truthy in Lox. """
+        
+        if value is None:
+            return False
+        
+        if isinstance(value, bool):
+            return bool(value)
+        
+        return True
     
     
     def error(self: Self, token: Token, message: str) -> RuntimeError:
@@ -1,23 +1,17 @@
 import math
+import os
 import sys
 
 from collections.abc import Callable
+from functools import partial
+from lox_handle import Handle
+from lox_handle_table import STANDARD_HANDLES, HandleTable
+from lox_mapped_handle import MappedHandle
+from lox_string import LoxString, substring
 from typing import Any, BinaryIO
 
-STREAMS: list[BinaryIO | None] = [
-    sys.stdin.buffer,
-    sys.stdout.buffer,
-    sys.stderr.buffer,
-    None,
-    None,
-    None,
-    None,
-    None,
-]
-""" Streams available to Lox. """
-
-FILE_HANDLE_MIN: int = 3
-""" The minimum file handle available to lox. """
+STDOUT_HANDLE: int = 1
+""" The standard output handle. """
 
 def argc_intrinsic(arguments: list[Any]) -> float:
     """ The argc intrinsic. """
@@ -47,58 +41,116 @@ def chr_intrinsic(arguments: list[Any]) -> str | None:
     return chr(code)
 
 
-def close_intrinsic(arguments: list[Any]) -> bool:
+def close_intrinsic(table: HandleTable, arguments: list[Any]) -> bool:
     """ The close intrinsic. """
     
-    handle: int = int(arguments[0])
-    
-    if handle < FILE_HANDLE_MIN or handle >= len(STREAMS):
-        return False # Not a file handle.
-    
-    stream: BinaryIO = STREAMS[handle]
+    stream: Handle | None = table.remove(int(arguments[0]))
     
     if stream is None:
-        return False # File already closed.
+        return False # Not a file handle or file already closed.
+    
+    try:
+        stream.close()
+    except (OSError, ValueError):
+        return False # Failed to flush or close file.
     
-    stream.close()
-    STREAMS[handle] = None
     return True
 
 
 def exit_intrinsic(arguments: list[Any]) -> None:
     """ The exit intrinsic. """
     
+    flush_handles()
     sys.exit(int(arguments[0]))
 
 
-def get_intrinsic(arguments: list[Any]) -> float | None:
+def get_intrinsic(table: HandleTable, arguments: list[Any]) -> float | None:
     """ The get intrinsic. """
     
-    handle: int = int(arguments[0])
+    stream: Handle | None = table.get(int(arguments[0]))
     
-    if handle < 0 or handle >= len(STREAMS):
-        return None # Invalid file handle.
+    if stream is None or not stream.is_readable:
+        return None # Invalid, unopened or unreadable stream.
     
-    stream: BinaryIO | None = STREAMS[handle]
+    position: int = stream.position
     
-    if stream is None:
-        return None # Unopened stream.
+    if position < len(stream.data):
+        # Fast path for buffered bytes.
+        stream.position = position + 1
+        return float(stream.data[position])
+    
+    if stream.is_interactive:
+        flush_handles() # Show any prompt before waiting for input.
     
     try:
-        result: bytes = stream.read(1)
+        result: int | None = stream.get()
     except (OSError, ValueError):
         return None # Failed to get byte.
     
+    if result is None:
+        return None # End of file.
+    
+    return float(result)
+
+
+def getline_intrinsic(table: HandleTable, arguments: list[Any]) -> str | None:
+    """ The getline intrinsic. """
+    
+    stream: Handle | None = table.get(int(arguments[0]))
+    
+    if stream is None or not stream.is_readable:
+        return None # Invalid, unopened or unreadable stream.
+    
+    if stream.is_interactive and stream.position >= len(stream.data):
+        flush_handles() # Show any prompt before waiting for input.
+    
+    try:
+        result: bytes = stream.read_line()
+    except (OSError, ValueError):
+        return None # Failed to get line.
+    
     if not result:
         return None # End of file.
     
-    return float(result[0])
+    return result.decode("latin-1")
+
+
+def getstr_intrinsic(table: HandleTable, arguments: list[Any]) -> str | None:
+    """ The getstr intrinsic. """
+    
+    stream: Handle | None = table.get(int(arguments[0]))
+    
+    if stream is None or not stream.is_readable:
+        return None # Invalid, unopened or unreadable stream.
+    
+    count: int = int(arguments[1])
+    
+    if count == 0:
+        return "" # Nothing to get.
+    
+    if stream.is_interactive and stream.position >= len(stream.data):
+        flush_handles() # Show any prompt before waiting for input.
+    
+    try:
+        result: bytes = stream.read(count)
+    except (OSError, ValueError):
+        return None # Failed to get string.
+    
+    if not result:
+        return None # End of file.
+    
+    return result.decode("latin-1")
 
 
 def length_intrinsic(arguments: list[Any]) -> float:
     """ The length intrinsic. """
     
-    return float(len(str(arguments[0])))
+    string: Any = arguments[0]
+    
+    if isinstance(string, LoxString):
+        return float(len(string)) # Measure lazy strings without flattening.
+    
+    return float(len(str(string)))
 
 
 def ord_intrinsic(arguments: list[Any]) -> float | None:
@@ -117,7 +169,7 @@ def ord_intrinsic(arguments: list[Any]) -> float | None:
     return float(code)
 
 
-def put_intrinsic(arguments: list[Any]) -> float | None:
+def put_intrinsic(table: HandleTable, arguments: list[Any]) -> float | None:
     """ The put intrinsic. """
     
     byte: int = int(arguments[0])
@@ -125,28 +177,50 @@ def put_intrinsic(arguments: list[Any]) -> float | None:
     if byte < 0 or byte > 255:
         return None # Invalid byte.
     
-    handle: int = int(arguments[1])
-    
-    if handle < 0 or handle >= len(STREAMS):
-        return None # Invalid file handle.
+    stream: Handle | None = table.get(int(arguments[1]))
     
-    stream: BinaryIO | None = STREAMS[handle]
+    if stream is None or not stream.is_writable:
+        return None # Invalid, unopened or unwritable stream.
     
-    if stream is None:
-        return None # Unopened stream.
+    if (stream.is_buffered and byte != 10
+            and len(stream.pending) < Handle.BLOCK_SIZE - 1):
+        # Fast path for bytes that do not need a flush.
+        stream.pending.append(byte)
+        return float(byte)
     
     try:
-        stream.write(bytes((byte,)))
+        stream.put(byte)
     except (OSError, ValueError):
         return None # Failed to put byte.
     
     return float(byte)
 
 
-def read_intrinsic(arguments: list[Any]) -> float | None:
+def putstr_intrinsic(table: HandleTable, arguments: list[Any]) -> float | None:
+    """ The putstr intrinsic. """
+    
+    try:
+        data: bytes = str(arguments[0]).encode("latin-1")
+    except UnicodeEncodeError:
+        return None # Not an ASCII string.
+    
+    stream: Handle | None = table.get(int(arguments[1]))
+    
+    if stream is None or not stream.is_writable:
+        return None # Invalid, unopened or unwritable stream.
+    
+    try:
+        stream.write(data)
+    except (OSError, ValueError):
+        return None # Failed to put string.
+    
+    return float(len(data))
+
+
+def read_intrinsic(table: HandleTable, arguments: list[Any]) -> float | None:
     """ The read intrinsic. """
     
-    return open_file_handle(str(arguments[0]), "rb")
+    return open_file_handle(table, str(arguments[0]), "rb")
 
 
 def stderr_intrinsic(arguments: list[Any]) -> float:
@@ -167,23 +241,27 @@ def stdout_intrinsic(arguments: list[Any]) -> float:
     return 1.0
 
 
-def substring_intrinsic(arguments: list[Any]) -> str | None:
+def substring_intrinsic(arguments: list[Any]) -> str | LoxString | None:
     """ The substring intrinsic. """
     
-    string: str = str(arguments[0])
+    string: Any = arguments[0]
+    
+    if not isinstance(string, LoxString):
+        string = str(string)
+    
     start: int = int(arguments[1])
-    end: int = start + int(arguments[2])
+    length: int = int(arguments[2])
     
-    if start < 0 or end < start or end > len(string):
+    if start < 0 or length < 0 or start + length > len(string):
         return None # Substring out of bounds.
     
-    return string[start:end]
+    return substring(string, start, length)
 
 
-def write_intrinsic(arguments: list[Any]) -> float | None:
+def write_intrinsic(table: HandleTable, arguments: list[Any]) -> float | None:
     """ The write intrinsic. """
     
-    return open_file_handle(str(arguments[0]), "wb")
+    return open_file_handle(table, str(arguments[0]), "wb")
 
 
 def trunc_intrinsic(arguments: list[Any]) -> float:
@@ -192,43 +270,84 @@ def trunc_intrinsic(arguments: list[Any]) -> float:
     return float(math.trunc(float(arguments[0])))
 
 
-def open_file_handle(path: str, mode: str) -> float | None:
-    """ Open and return a new file handle from a path and a mode. """
+def open_file_handle(
+        table: HandleTable, path: str, mode: str) -> float | None:
+    """
+    Open a file from a path and a mode and return its new file handle.
+    """
+    
+    if table.is_full():
+        return None # No file handles available.
+    
+    try:
+        stream: BinaryIO = open(path, mode)
+    except OSError:
+        return None # Failed to open file handle.
     
-    handle: int = FILE_HANDLE_MIN
+    return float(table.add(create_handle(stream)))
+
+
+def create_handle(stream: BinaryIO) -> Handle:
+    """
+    Create a handle from an opened file. Large readable files are mapped
+    into memory if they can be.
+    """
     
-    while handle < len(STREAMS):
-        if STREAMS[handle] is None:
-            try:
-                stream: BinaryIO = open(path, mode)
-                STREAMS[handle] = stream
-                return float(handle)
-            except OSError:
-                return None # Failed to open file handle.
-        
-        handle = handle + 1
+    try:
+        if (stream.readable()
+                and os.fstat(stream.fileno()).st_size
+                >= MappedHandle.THRESHOLD):
+            return MappedHandle(stream)
+    except (OSError, ValueError):
+        pass # Failed to map file.
+    
+    return Handle(stream)
+
+
+def print_line(text: str) -> None:
+    """
+    Print a line of text to the standard output handle so that it is
+    ordered with bytes put to the handle.
+    """
+    
+    STANDARD_HANDLES[STDOUT_HANDLE].write(
+            f"{text}\n".encode(sys.stdout.encoding, sys.stdout.errors))
+
+
+def flush_handles() -> None:
+    """
+    Write any pending bytes in the standard handles to their streams.
+    Called before runtime errors are reported and when Lox exits.
+    """
     
-    return None # No file handles available.
+    for stream in STANDARD_HANDLES:
+        try:
+            stream.flush()
+        except (OSError, ValueError):
+            pass # Failed to flush stream.
 
 
 def install_intrinsics(
-        define_native: Callable[
-                [str, int, Callable[[list[Any]], Any]], None]) -> None:
-    """ Install the intrinsics. """
+        define_native: Callable[[str, int, Callable[[list[Any]], Any]], None],
+        table: HandleTable) -> None:
+    """ Install the intrinsics with a handle table. """
     
-    define_native("_argc", 1, argc_intrinsic)
-    define_native("_argv", 0, argv_intrinsic)
+    define_native("_argc", 0, argc_intrinsic)
+    define_native("_argv", 1, argv_intrinsic)
     define_native("_chr", 1, chr_intrinsic)
-    define_native("_close", 1, close_intrinsic)
+    define_native("_close", 1, partial(close_intrinsic, table))
     define_native("_exit", 1, exit_intrinsic)
-    define_native("_get", 1, get_intrinsic)
+    define_native("_get", 1, partial(get_intrinsic, table))
+    define_native("_getline", 1, partial(getline_intrinsic, table))
+    define_native("_getstr", 2, partial(getstr_intrinsic, table))
     define_native("_length", 1, length_intrinsic)
     define_native("_ord", 1, ord_intrinsic)
-    define_native("_put", 2, put_intrinsic)
-    define_native("_read", 1, read_intrinsic)
+    define_native("_put", 2, partial(put_intrinsic, table))
+    define_native("_putstr", 2, partial(putstr_intrinsic, table))
+    define_native("_read", 1, partial(read_intrinsic, table))
     define_native("_stderr", 0, stderr_intrinsic)
     define_native("_stdin", 0, stdin_intrinsic)
     define_native("_stdout", 0, stdout_intrinsic)
     define_native("_substring", 3, substring_intrinsic)
     define_native("_trunc", 1, trunc_intrinsic)
-    define_native("_write", 1, write_intrinsic)
+    define_native("_write", 1, partial(write_intrinsic, table))
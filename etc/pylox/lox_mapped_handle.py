@@ -0,0 +1,47 @@
+import mmap
+
+from lox_handle import Handle
+from typing import BinaryIO, Self
+
+class MappedHandle(Handle):
+    """
+    A read-only handle whose file is mapped into memory. The whole file
+    is available as the handle's read bytes, so bytes are indexed and
+    sliced directly from the map instead of being read from the stream.
+    """
+    
+    __slots__ = ()
+    
+    THRESHOLD: int = 0x100000
+    """ The minimum size of a file in bytes to map into memory. """
+    
+    data: mmap.mmap
+    """ The memory map of the handle's file. """
+    
+    def __init__(self: Self, stream: BinaryIO) -> None:
+        """
+        Initialize the mapped handle from its underlying stream. Raise
+        `OSError` or `ValueError` if the stream could not be mapped.
+        """
+        
+        super().__init__(stream)
+        self.data = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        self.is_writable = False
+    
+    
+    def fill(self: Self) -> bool:
+        """ Return `False` because the whole file is already mapped. """
+        
+        return False
+    
+    
+    def close(self: Self) -> None:
+        """
+        Unmap and close the handle's file. Raise `OSError` or
+        `ValueError` if the file could not be closed.
+        """
+        
+        try:
+            self.data.close()
+        finally:
+            self.stream.close()
@@ -5,6 +5,8 @@ from typing import Any, Self
 class NativeFunction(LoxCallable):
     """ A function that is native to Lox. """
     
+    __slots__ = ("parameter_count", "driver")
+    
     parameter_count: int
     """ The native function's parameter count. """
     
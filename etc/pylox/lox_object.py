@@ -0,0 +1,165 @@
+from lox_chunk import Chunk
+from typing import Any, Self
+
+class ObjFunction:
+    """ A compiled Lox function. """
+    
+    __slots__ = ("arity", "upvalue_count", "chunk", "name")
+    
+    arity: int
+    """ The function's number of parameters. """
+    
+    upvalue_count: int
+    """ The function's number of upvalues. """
+    
+    chunk: Chunk
+    """ The function's bytecode chunk. """
+    
+    name: str | None
+    """ The function's name, or `None` for the top level script. """
+    
+    def __init__(self: Self, name: str | None) -> None:
+        """ Initialize the function. """
+        
+        self.arity = 0
+        self.upvalue_count = 0
+        self.chunk = Chunk()
+        self.name = name
+    
+    
+    def __repr__(self: Self) -> str:
+        """ Represent the function as a string. """
+        
+        if self.name is None:
+            return "<script>"
+        
+        return f"<fn {self.name}>"
+
+
+class ObjUpvalue:
+    """
+    A reference to a variable captured by a closure. An open upvalue
+    refers to a slot in the VM's stack. A closed upvalue refers to its
+    own single slot.
+    """
+    
+    __slots__ = ("values", "index", "next")
+    
+    values: list[Any]
+    """ The list containing the upvalue's variable. """
+    
+    index: int
+    """ The index of the upvalue's variable in its list. """
+    
+    next: Self | None
+    """ The next open upvalue lower in the VM's stack. """
+    
+    def __init__(self: Self, values: list[Any], index: int) -> None:
+        """ Initialize the upvalue. """
+        
+        self.values = values
+        self.index = index
+        self.next = None
+    
+    
+    def close(self: Self) -> None:
+        """ Move the upvalue's variable off the VM's stack. """
+        
+        self.values = [self.values[self.index]]
+        self.index = 0
+
+
+class ObjClosure:
+    """ A compiled Lox function with its captured upvalues. """
+    
+    __slots__ = ("function", "upvalues")
+    
+    function: ObjFunction
+    """ The closure's function. """
+    
+    upvalues: list[ObjUpvalue | None]
+    """ The closure's upvalues. """
+    
+    def __init__(self: Self, function: ObjFunction) -> None:
+        """ Initialize the closure. """
+        
+        self.function = function
+        self.upvalues = [None] * function.upvalue_count
+    
+    
+    def __repr__(self: Self) -> str:
+        """ Represent the closure as a string. """
+        
+        return repr(self.function)
+
+
+class ObjClass:
+    """ A Lox class. """
+    
+    __slots__ = ("name", "methods")
+    
+    name: str
+    """ The class' name. """
+    
+    methods: dict[str, ObjClosure]
+    """ The class' methods, including any copied down on inheritance. """
+    
+    def __init__(self: Self, name: str) -> None:
+        """ Initialize the class. """
+        
+        self.name = name
+        self.methods = {}
+    
+    
+    def __repr__(self: Self) -> str:
+        """ Represent the class as a string. """
+        
+        return self.name
+
+
+class ObjInstance:
+    """ An instance of a Lox class. """
+    
+    __slots__ = ("klass", "fields")
+    
+    klass: ObjClass
+    """ The instance's class. """
+    
+    fields: dict[str, Any]
+    """ The instance's fields. """
+    
+    def __init__(self: Self, klass: ObjClass) -> None:
+        """ Initialize the instance. """
+        
+        self.klass = klass
+        self.fields = {}
+    
+    
+    def __repr__(self: Self) -> str:
+        """ Represent the instance as a string. """
+        
+        return f"{self.klass.name} instance"
+
+
+class ObjBoundMethod:
+    """ A method closure bound to a receiver. """
+    
+    __slots__ = ("receiver", "method")
+    
+    receiver: Any
+    """ The bound method's receiver. """
+    
+    method: ObjClosure
+    """ The bound method's closure. """
+    
+    def __init__(self: Self, receiver: Any, method: ObjClosure) -> None:
+        """ Initialize the bound method. """
+        
+        self.receiver = receiver
+        self.method = method
+    
+    
+    def __repr__(self: Self) -> str:
+        """ Represent the bound method as a string. """
+        
+        return repr(self.method.function)
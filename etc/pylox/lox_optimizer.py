@@ -0,0 +1,327 @@
+from lox_expr import AssignExpr, BinaryExpr, CallExpr, Expr, ExprVisitor
+from lox_expr import GetExpr, GroupingExpr, LiteralExpr, LogicalExpr, SetExpr
+from lox_expr import SuperExpr, ThisExpr, UnaryExpr, VariableExpr
+from lox_stmt import BlockStmt, ClassStmt, ExpressionStmt, FunctionStmt
+from lox_stmt import IfStmt, PrintStmt, ReturnStmt, Stmt, StmtVisitor, VarStmt
+from lox_stmt import WhileStmt
+from lox_token_type import TokenType
+from typing import Any, Self
+
+def count_nodes(node: Expr | Stmt) -> int:
+    """ Return the number of nodes in a statement or expression tree. """
+    
+    count: int = 1
+    
+    for field in type(node).__annotations__:
+        value: Any = getattr(node, field, None)
+        children: list[Any] = value if isinstance(value, list) else [value]
+        
+        for child in children:
+            if isinstance(child, (Expr, Stmt)):
+                count += count_nodes(child)
+    
+    return count
+
+
+def is_truthy(value: Any) -> bool:
+    """ Return whether a literal value is truthy in Lox. """
+    
+    return value is not None and value is not False
+
+
+class Optimizer(StmtVisitor, ExprVisitor):
+    """
+    Simplifies a resolved statement tree without changing its behavior.
+    Constant expressions are folded to literals, and branches, loops and
+    statements that can never run are removed. Expressions that would
+    cause a runtime error are left unfolded so the error is still
+    reported at its original token. Nodes that are kept are changed in
+    place so their resolved variables and inline caches stay valid.
+    """
+    
+    removed_count: int = 0
+    """ The number of nodes that have been removed from trees. """
+    
+    def optimize(self: Self, statements: list[Stmt]) -> list[Stmt]:
+        """ Optimize a list of statements and return the result. """
+        
+        count: int = sum(count_nodes(statement) for statement in statements)
+        statements = self.optimize_statements(statements)
+        self.removed_count += count - sum(
+                count_nodes(statement) for statement in statements)
+        return statements
+    
+    
+    def optimize_statements(self: Self, statements: list[Stmt]) -> list[Stmt]:
+        """
+        Optimize a list of statements, removing statements that do
+        nothing or follow a return statement.
+        """
+        
+        result: list[Stmt] = []
+        
+        for statement in statements:
+            optimized: Stmt | None = statement.accept(self)
+            
+            if optimized is not None:
+                result.append(optimized)
+            
+            if isinstance(optimized, ReturnStmt):
+                break
+        
+        return result
+    
+    
+    def optimize_branch(self: Self, statement: Stmt) -> Stmt:
+        """
+        Optimize a statement that must be kept as the branch of an if or
+        while statement.
+        """
+        
+        optimized: Stmt | None = statement.accept(self)
+        
+        if optimized is None:
+            return BlockStmt([])
+        
+        return optimized
+    
+    
+    def visit_block_stmt(self: Self, stmt: BlockStmt) -> Stmt | None:
+        """ Visit and optimize a block statement. """
+        
+        stmt.statements = self.optimize_statements(stmt.statements)
+        return stmt if stmt.statements else None
+    
+    
+    def visit_class_stmt(self: Self, stmt: ClassStmt) -> Stmt | None:
+        """ Visit and optimize a class statement. """
+        
+        for method in stmt.methods:
+            method.accept(self)
+        
+        return stmt
+    
+    
+    def visit_expression_stmt(
+            self: Self, stmt: ExpressionStmt) -> Stmt | None:
+        """ Visit and optimize an expression statement. """
+        
+        stmt.expression = stmt.expression.accept(self)
+        
+        if isinstance(stmt.expression, LiteralExpr):
+            return None
+        
+        return stmt
+    
+    
+    def visit_function_stmt(self: Self, stmt: FunctionStmt) -> Stmt | None:
+        """ Visit and optimize a function statement. """
+        
+        stmt.body = self.optimize_statements(stmt.body)
+        return stmt
+    
+    
+    def visit_if_stmt(self: Self, stmt: IfStmt) -> Stmt | None:
+        """ Visit and optimize an if statement. """
+        
+        stmt.condition = stmt.condition.accept(self)
+        
+        if isinstance(stmt.condition, LiteralExpr):
+            if is_truthy(stmt.condition.value):
+                return stmt.then_branch.accept(self)
+            elif stmt.else_branch is not None:
+                return stmt.else_branch.accept(self)
+            else:
+                return None
+        
+        stmt.then_branch = self.optimize_branch(stmt.then_branch)
+        
+        if stmt.else_branch is not None:
+            stmt.else_branch = stmt.else_branch.accept(self)
+        
+        return stmt
+    
+    
+    def visit_print_stmt(self: Self, stmt: PrintStmt) -> Stmt | None:
+        """ Visit and optimize a print statement. """
+        
+        stmt.expression = stmt.expression.accept(self)
+        return stmt
+    
+    
+    def visit_return_stmt(self: Self, stmt: ReturnStmt) -> Stmt | None:
+        """ Visit and optimize a return statement. """
+        
+        if stmt.value is not None:
+            stmt.value = stmt.value.accept(self)
+        
+        return stmt
+    
+    
+    def visit_var_stmt(self: Self, stmt: VarStmt) -> Stmt | None:
+        """ Visit and optimize a variable statement. """
+        
+        if stmt.initializer is not None:
+            stmt.initializer = stmt.initializer.accept(self)
+        
+        return stmt
+    
+    
+    def visit_while_stmt(self: Self, stmt: WhileStmt) -> Stmt | None:
+        """ Visit and optimize a while statement. """
+        
+        stmt.condition = stmt.condition.accept(self)
+        
+        if isinstance(stmt.condition, LiteralExpr):
+            if not is_truthy(stmt.condition.value):
+                return None
+        
+        stmt.body = self.optimize_branch(stmt.body)
+        return stmt
+    
+    
+    def visit_assign_expr(self: Self, expr: AssignExpr) -> Expr:
+        """ Visit and optimize an assign expression. """
+        
+        expr.value = expr.value.accept(self)
+        return expr
+    
+    
+    def visit_binary_expr(self: Self, expr: BinaryExpr) -> Expr:
+        """ Visit and optimize a binary expression. """
+        
+        expr.left = expr.left.accept(self)
+        expr.right = expr.right.accept(self)
+        
+        if not isinstance(expr.left, LiteralExpr):
+            return expr
+        
+        if not isinstance(expr.right, LiteralExpr):
+            return expr
+        
+        a: Any = expr.left.value
+        b: Any = expr.right.value
+        
+        match expr.operator.type:
+            case TokenType.BANG_EQUAL:
+                return LiteralExpr(type(a) is not type(b) or a != b)
+            case TokenType.EQUAL_EQUAL:
+                return LiteralExpr(type(a) is type(b) and a == b)
+            case TokenType.PLUS if type(a) is str and type(b) is str:
+                return LiteralExpr(a + b)
+        
+        if type(a) is not float or type(b) is not float:
+            return expr
+        
+        match expr.operator.type:
+            case TokenType.GREATER:
+                return LiteralExpr(a > b)
+            case TokenType.GREATER_EQUAL:
+                return LiteralExpr(a >= b)
+            case TokenType.LESS:
+                return LiteralExpr(a < b)
+            case TokenType.LESS_EQUAL:
+                return LiteralExpr(a <= b)
+            case TokenType.MINUS:
+                return LiteralExpr(a - b)
+            case TokenType.PLUS:
+                return LiteralExpr(a + b)
+            case TokenType.SLASH if b != 0.0:
+                return LiteralExpr(a / b)
+            case TokenType.STAR:
+                return LiteralExpr(a * b)
+        
+        return expr
+    
+    
+    def visit_call_expr(self: Self, expr: CallExpr) -> Expr:
+        """ Visit and optimize a call expression. """
+        
+        expr.callee = expr.callee.accept(self)
+        expr.arguments = [
+                argument.accept(self) for argument in expr.arguments]
+        return expr
+    
+    
+    def visit_get_expr(self: Self, expr: GetExpr) -> Expr:
+        """ Visit and optimize a get expression. """
+        
+        expr.object = expr.object.accept(self)
+        return expr
+    
+    
+    def visit_grouping_expr(self: Self, expr: GroupingExpr) -> Expr:
+        """ Visit and optimize a grouping expression. """
+        
+        expr.expression = expr.expression.accept(self)
+        
+        if isinstance(expr.expression, LiteralExpr):
+            return expr.expression
+        
+        return expr
+    
+    
+    def visit_literal_expr(self: Self, expr: LiteralExpr) -> Expr:
+        """ Visit and optimize a literal expression. """
+        
+        return expr
+    
+    
+    def visit_logical_expr(self: Self, expr: LogicalExpr) -> Expr:
+        """ Visit and optimize a logical expression. """
+        
+        expr.left = expr.left.accept(self)
+        expr.right = expr.right.accept(self)
+        
+        if not isinstance(expr.left, LiteralExpr):
+            return expr
+        
+        if is_truthy(expr.left.value) == (expr.operator.type == TokenType.OR):
+            return expr.left
+        
+        return expr.right
+    
+    
+    def visit_set_expr(self: Self, expr: SetExpr) -> Expr:
+        """ Visit and optimize a set expression. """
+        
+        expr.value = expr.value.accept(self)
+        expr.object = expr.object.accept(self)
+        return expr
+    
+    
+    def visit_super_expr(self: Self, expr: SuperExpr) -> Expr:
+        """ Visit and optimize a super expression. """
+        
+        return expr
+    
+    
+    def visit_this_expr(self: Self, expr: ThisExpr) -> Expr:
+        """ Visit and optimize a this expression. """
+        
+        return expr
+    
+    
+    def visit_unary_expr(self: Self, expr: UnaryExpr) -> Expr:
+        """ Visit and optimize a unary expression. """
+        
+        expr.right = expr.right.accept(self)
+        
+        if not isinstance(expr.right, LiteralExpr):
+            return expr
+        
+        value: Any = expr.right.value
+        
+        match expr.operator.type:
+            case TokenType.BANG:
+                return LiteralExpr(not is_truthy(value))
+            case TokenType.MINUS if type(value) is float:
+                return LiteralExpr(-value)
+        
+        return expr
+    
+    
+    def visit_variable_expr(self: Self, expr: VariableExpr) -> Expr:
+        """ Visit and optimize a variable expression. """
+        
+        return expr
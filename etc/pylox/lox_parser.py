@@ -1,8 +1,9 @@
-from collections.abc import Callable
+from collections.abc import Iterable, Iterator
 from lox_error_reporter import ErrorReporter
 from lox_expr import AssignExpr, BinaryExpr, CallExpr, Expr, GetExpr
 from lox_expr import GroupingExpr, LiteralExpr, LogicalExpr, SetExpr
 from lox_expr import SuperExpr, ThisExpr, UnaryExpr, VariableExpr
+from lox_precedence import Precedence
 from lox_stmt import BlockStmt, ClassStmt, ExpressionStmt, FunctionStmt
 from lox_stmt import IfStmt, PrintStmt, ReturnStmt, Stmt, VarStmt, WhileStmt
 from lox_token import Token
@@ -10,36 +11,69 @@ from lox_token_type import TokenType
 from typing import Self
 
 class Parser:
-    """ Parses an abstract syntax tree from a list of tokens. """
+    """
+    Parses an abstract syntax tree from a stream of tokens. Only the
+    current and previous tokens are kept, so tokens can be scanned
+    lazily while they are parsed.
+    """
     
     error_reporter: ErrorReporter
     """ The parser's error reporter. """
     
-    tokens: list[Token]
+    tokens: Iterator[Token]
     """ The tokens to parse. """
     
-    current: int = 0
-    """ The index of the current token. """
+    PRECEDENCES: dict[TokenType, Precedence] = {
+        TokenType.OR: Precedence.OR,
+        TokenType.AND: Precedence.AND,
+        TokenType.BANG_EQUAL: Precedence.EQUALITY,
+        TokenType.EQUAL_EQUAL: Precedence.EQUALITY,
+        TokenType.GREATER: Precedence.COMPARISON,
+        TokenType.GREATER_EQUAL: Precedence.COMPARISON,
+        TokenType.LESS: Precedence.COMPARISON,
+        TokenType.LESS_EQUAL: Precedence.COMPARISON,
+        TokenType.MINUS: Precedence.TERM,
+        TokenType.PLUS: Precedence.TERM,
+        TokenType.SLASH: Precedence.FACTOR,
+        TokenType.STAR: Precedence.FACTOR,
+        TokenType.LEFT_PAREN: Precedence.CALL,
+        TokenType.DOT: Precedence.CALL,
+    }
+    """ The precedences of infix and postfix operators by token type. """
+    
+    current: Token
+    """ The current token. """
+    
+    last: Token
+    """ The previous token. """
     
     def __init__(
             self: Self,
-            error_reporter: ErrorReporter, tokens: list[Token]) -> None:
+            error_reporter: ErrorReporter, tokens: Iterable[Token]) -> None:
         """ Initialize the parser. """
         
         self.error_reporter = error_reporter
-        self.tokens = tokens
+        self.tokens = iter(tokens)
+        self.current = next(self.tokens)
+        self.last = self.current
     
     
     def parse(self: Self) -> list[Stmt]:
-        """ Parse a list of statements. """
+        """
+        Parse a list of statements. Parsing stops with an error if the
+        source code is nested too deeply to parse recursively.
+        """
         
         statements: list[Stmt] = []
         
-        while not self.is_at_end():
-            declaration: Stmt | None = self.declaration()
-            
-            if declaration is not None:
-                statements.append(declaration)
+        try:
+            while not self.is_at_end():
+                declaration: Stmt | None = self.declaration()
+                
+                if declaration is not None:
+                    statements.append(declaration)
+        except RecursionError:
+            self.error(self.peek(), "Code is too deeply nested.")
         
         return statements
     
@@ -116,6 +150,7 @@ class Parser:
     def for_statement(self: Self) -> Stmt:
         """ Parse a for statement. """
         
+        keyword: Token = self.previous()
         self.consume(TokenType.LEFT_PAREN, "Expect `(` after `for`.")
         initializer: Stmt | None = None
         
@@ -144,7 +179,7 @@ class Parser:
         if increment is not None:
             body = BlockStmt([body, ExpressionStmt(increment)])
         
-        body = WhileStmt(condition, body)
+        body = WhileStmt(keyword, condition, body)
         
         if initializer is not None:
             body = BlockStmt([initializer, body])
@@ -155,6 +190,7 @@ class Parser:
     def if_statement(self: Self) -> Stmt:
         """ Parse an if statement. """
         
+        keyword: Token = self.previous()
         self.consume(TokenType.LEFT_PAREN, "Expect `(` after `if`.")
         condition: Expr = self.expression()
         self.consume(TokenType.RIGHT_PAREN, "Expect `)` after if condition.")
@@ -165,15 +201,16 @@ class Parser:
         if self.match(TokenType.ELSE):
             else_branch = self.statement()
         
-        return IfStmt(condition, then_branch, else_branch)
+        return IfStmt(keyword, condition, then_branch, else_branch)
     
     
     def print_statement(self: Self) -> Stmt:
         """ Parse a print statement. """
         
+        keyword: Token = self.previous()
         value: Expr = self.expression()
         self.consume(TokenType.SEMICOLON, "Expect `;` after value.")
-        return PrintStmt(value)
+        return PrintStmt(keyword, value)
     
     
     def return_statement(self: Self) -> Stmt:
@@ -207,11 +244,12 @@ class Parser:
     def while_statement(self: Self) -> Stmt:
         """ Parse a while statement. """
         
+        keyword: Token = self.previous()
         self.consume(TokenType.LEFT_PAREN, "Expect `(` after while.")
         condition: Expr = self.expression()
         self.consume(TokenType.RIGHT_PAREN, "Expect `)` after condition.")
         body: Stmt = self.statement()
-        return WhileStmt(condition, body)
+        return WhileStmt(keyword, condition, body)
     
     
     def expression_statement(self: Self) -> Stmt:
@@ -262,7 +300,7 @@ class Parser:
     def assignment(self: Self) -> Expr:
         """ Parse an assignment expression. """
         
-        expr: Expr = self.or_expression()
+        expr: Expr = self.parse_precedence(Precedence.OR)
         
         if self.match(TokenType.EQUAL):
             equals: Token = self.previous()
@@ -279,87 +317,52 @@ class Parser:
         return expr
     
     
-    def or_expression(self: Self) -> Expr:
-        """ Parse an or expression. """
-        
-        expr: Expr = self.and_expression()
-        
-        while self.match(TokenType.OR):
-            operator: Token = self.previous()
-            right: Expr = self.and_expression()
-            expr = LogicalExpr(expr, operator, right)
-        
-        return expr
-    
-    
-    def and_expression(self: Self) -> Expr:
-        """ Parse an and expression. """
-        
-        expr: Expr = self.equality()
-        
-        while self.match(TokenType.AND):
-            operator: Token = self.previous()
-            right: Expr = self.equality()
-            expr = LogicalExpr(expr, operator, right)
-        
-        return expr
-    
-    
-    def equality(self: Self) -> Expr:
-        """ Parse an equality expression. """
-        
-        return self.binary(
-                self.comparison, TokenType.BANG_EQUAL, TokenType.EQUAL_EQUAL)
-    
-    
-    def comparison(self: Self) -> Expr:
-        """ Parse a comparison expression. """
-        
-        return self.binary(
-                self.term, TokenType.GREATER, TokenType.GREATER_EQUAL,
-                TokenType.LESS, TokenType.LESS_EQUAL)
-    
-    
-    def term(self: Self) -> Expr:
-        """ Parse a term expression. """
-        
-        return self.binary(self.factor, TokenType.MINUS, TokenType.PLUS)
-    
-    
-    def factor(self: Self) -> Expr:
-        """ Parse a factor expresison. """
-        
-        return self.binary(self.unary, TokenType.SLASH, TokenType.STAR)
-    
-    
-    def unary(self: Self) -> Expr:
-        """ Parse a unary expression. """
-        
-        if self.match(TokenType.BANG, TokenType.MINUS):
-            operator: Token = self.previous()
-            right: Expr = self.unary()
-            return UnaryExpr(operator, right)
-        
-        return self.call()
-    
-    
-    def call(self: Self) -> Expr:
-        """ Parse a call expression. """
+    def parse_precedence(self: Self, precedence: int) -> Expr:
+        """
+        Parse an expression with operators of at least a precedence,
+        dispatching on each operator with the precedence table.
+        """
         
-        expr: Expr = self.primary()
+        expr: Expr = self.prefix()
         
         while True:
-            if self.match(TokenType.LEFT_PAREN):
+            type: TokenType = self.peek_type()
+            operator_precedence: Precedence = self.PRECEDENCES.get(
+                    type, Precedence.NONE)
+            
+            if operator_precedence < precedence:
+                return expr
+            
+            if type is TokenType.LEFT_PAREN:
+                self.skip()
                 expr = self.finish_call(expr)
-            elif self.match(TokenType.DOT):
+            elif type is TokenType.DOT:
+                self.skip()
                 name: Token = self.consume(
                         TokenType.IDENTIFIER,
                         "Expect property name after `.`.")
                 expr = GetExpr(expr, name)
             else:
-                break
+                operator: Token = self.advance()
+                right: Expr = self.parse_precedence(operator_precedence + 1)
+                
+                if type is TokenType.OR or type is TokenType.AND:
+                    expr = LogicalExpr(expr, operator, right)
+                else:
+                    expr = BinaryExpr(expr, operator, right)
+    
+    
+    def prefix(self: Self) -> Expr:
+        """ Parse a unary or primary expression. """
         
-        return expr
+        type: TokenType = self.peek_type()
+        
+        if type is TokenType.BANG or type is TokenType.MINUS:
+            operator: Token = self.advance()
+            right: Expr = self.parse_precedence(Precedence.UNARY)
+            return UnaryExpr(operator, right)
+        
+        return self.primary()
     
     
     def finish_call(self: Self, callee: Expr) -> Expr:
@@ -385,56 +388,45 @@ class Parser:
     def primary(self: Self) -> Expr:
         """ Parse a primary expression. """
         
-        if self.match(TokenType.FALSE):
+        type: TokenType = self.peek_type()
+        
+        if type is TokenType.IDENTIFIER:
+            return VariableExpr(self.advance())
+        
+        if type is TokenType.NUMBER or type is TokenType.STRING:
+            return LiteralExpr(self.advance().literal)
+        
+        if type is TokenType.THIS:
+            return ThisExpr(self.advance())
+        
+        if type is TokenType.LEFT_PAREN:
+            self.skip()
+            expr: Expr = self.expression()
+            self.consume(TokenType.RIGHT_PAREN, "Expect `)` after expression.")
+            return GroupingExpr(expr)
+        
+        if type is TokenType.FALSE:
+            self.skip()
             return LiteralExpr(False)
         
-        if self.match(TokenType.TRUE):
+        if type is TokenType.TRUE:
+            self.skip()
             return LiteralExpr(True)
         
-        if self.match(TokenType.NIL):
+        if type is TokenType.NIL:
+            self.skip()
             return LiteralExpr(None)
         
-        if self.match(TokenType.NUMBER, TokenType.STRING):
-            return LiteralExpr(self.previous().literal)
-        
-        if self.match(TokenType.SUPER):
-            keyword: Token = self.previous()
+        if type is TokenType.SUPER:
+            keyword: Token = self.advance()
             self.consume(TokenType.DOT, "Expect `.` after `super`.")
             method: Token = self.consume(
                     TokenType.IDENTIFIER, "Expect superclass method name.")
             return SuperExpr(keyword, method)
         
-        if self.match(TokenType.THIS):
-            return ThisExpr(self.previous())
-        
-        if self.match(TokenType.IDENTIFIER):
-            return VariableExpr(self.previous())
-        
-        if self.match(TokenType.LEFT_PAREN):
-            expr: Expr = self.expression()
-            self.consume(TokenType.RIGHT_PAREN, "Expect `)` after expression.")
-            return GroupingExpr(expr)
-        
         raise self.error(self.peek(), "Expect expression.")
     
     
-    def binary(
-            self: Self, rule: Callable[[], Expr], *types: TokenType) -> Expr:
-        """
-        Parse a left-associative binary expression from its
-        sub-expression rule and operator types.
-        """
-        
-        expr: Expr = rule()
-        
-        while self.match(*types):
-            operator: Token = self.previous()
-            right: Expr = rule()
-            expr = BinaryExpr(expr, operator, right)
-        
-        return expr
-    
-    
     def match(self: Self, *types: TokenType) -> bool:
         """
         Consume the current token if it matches a set of types and
@@ -474,9 +466,16 @@ class Parser:
         """ Consume and return the current token. """
         
         if not self.is_at_end():
-            self.current += 1
+            self.last = self.current
+            self.current = next(self.tokens)
+        
+        return self.last
+    
+    
+    def skip(self: Self) -> None:
+        """ Consume the current token without returning it. """
         
-        return self.previous()
+        self.advance()
     
     
     def is_at_end(self: Self) -> bool:
@@ -485,16 +484,22 @@ class Parser:
         return self.peek().type == TokenType.EOF
     
     
+    def peek_type(self: Self) -> TokenType:
+        """ Peek the current token's type. """
+        
+        return self.current.type
+    
+    
     def peek(self: Self) -> Token:
         """ Peek the current token. """
         
-        return self.tokens[self.current]
+        return self.current
     
     
     def previous(self: Self) -> Token:
         """ Peek the previous token. """
         
-        return self.tokens[self.current - 1]
+        return self.last
     
     
     def error(self: Self, token: Token, message: str) -> SyntaxError:
@@ -0,0 +1,34 @@
+from enum import IntEnum, auto
+
+class Precedence(IntEnum):
+    """ The precedence of an expression, from lowest to highest. """
+    
+    NONE = auto()
+    """ Not an operator. """
+    
+    ASSIGNMENT = auto()
+    """ `=`. """
+    
+    OR = auto()
+    """ `or`. """
+    
+    AND = auto()
+    """ `and`. """
+    
+    EQUALITY = auto()
+    """ `==` and `!=`. """
+    
+    COMPARISON = auto()
+    """ `<`, `>`, `<=` and `>=`. """
+    
+    TERM = auto()
+    """ `+` and `-`. """
+    
+    FACTOR = auto()
+    """ `*` and `/`. """
+    
+    UNARY = auto()
+    """ `!` and `-`. """
+    
+    CALL = auto()
+    """ `.` and `()`. """
@@ -0,0 +1,186 @@
+import re
+
+from collections.abc import Callable, Iterable, Iterator
+from lox_scanner import Scanner
+from lox_token import Token
+from lox_token_buffer import TokenBuffer
+from lox_token_type import TokenType
+from typing import Self, TextIO
+
+class RegexScanner(Scanner):
+    """
+    Scans a list of tokens from source code with a single compiled
+    regular expression. Generates the same tokens and errors as the
+    character-by-character scanner, but lets the regular expression
+    engine consume whole lexemes at once. Source code can be scanned in
+    chunks so that whole files do not need to be read into memory.
+    """
+    
+    CHUNK_SIZE: int = 0x10000
+    """ The number of characters to read from a file at a time. """
+    
+    PATTERN: re.Pattern[str] = re.compile(r"""
+        (?P<space>[ \t\r\n]+|//[^\n]*)
+        | (?P<identifier>[A-Za-z_][A-Za-z0-9_]*)
+        | (?P<symbol>[!=<>]=?|[(){},.\-+;*/])
+        | (?P<number>[0-9]+(?:\.[0-9]+)?)
+        | (?P<string>"[^"]*"?)
+        | (?P<unexpected>.)
+        """, re.VERBOSE | re.DOTALL)
+    """
+    The master pattern that matches every lexeme, ignored character
+    and unexpected character in the source code.
+    """
+    
+    SYMBOLS: dict[str, TokenType] = {
+        "(": TokenType.LEFT_PAREN,
+        ")": TokenType.RIGHT_PAREN,
+        "{": TokenType.LEFT_BRACE,
+        "}": TokenType.RIGHT_BRACE,
+        ",": TokenType.COMMA,
+        ".": TokenType.DOT,
+        "-": TokenType.MINUS,
+        "+": TokenType.PLUS,
+        ";": TokenType.SEMICOLON,
+        "/": TokenType.SLASH,
+        "*": TokenType.STAR,
+        "!": TokenType.BANG,
+        "!=": TokenType.BANG_EQUAL,
+        "=": TokenType.EQUAL,
+        "==": TokenType.EQUAL_EQUAL,
+        ">": TokenType.GREATER,
+        ">=": TokenType.GREATER_EQUAL,
+        "<": TokenType.LESS,
+        "<=": TokenType.LESS_EQUAL,
+    }
+    """ A map of lexemes to symbol token types. """
+    
+    def scan(self: Self) -> Iterator[Token]:
+        """ Lazily scan tokens from the source code. """
+        
+        return self.scan_chunks((self.source,))
+    
+    
+    def scan_buffer(self: Self) -> TokenBuffer:
+        """
+        Scan a compact token buffer from the source code without
+        creating a `Token` for each token.
+        """
+        
+        buffer: TokenBuffer = TokenBuffer(self.source, self.names)
+        keywords: dict[str, TokenType] = self.KEYWORDS
+        symbols: dict[str, TokenType] = self.SYMBOLS
+        identifier: int = TokenType.IDENTIFIER._value_
+        append_type: Callable[[int], None] = buffer.types.append
+        append_start: Callable[[int], None] = buffer.starts.append
+        append_end: Callable[[int], None] = buffer.ends.append
+        append_line: Callable[[int], None] = buffer.lines.append
+        line: int = self.line
+        
+        for match in self.PATTERN.finditer(self.source):
+            kind: str | None = match.lastgroup
+            
+            if kind == "space":
+                line += match.group().count("\n")
+                continue
+            elif kind == "identifier":
+                type: TokenType | None = keywords.get(match.group())
+                append_type(identifier if type is None else type._value_)
+            elif kind == "symbol":
+                append_type(symbols[match.group()]._value_)
+            elif kind == "number":
+                append_type(TokenType.NUMBER._value_)
+            elif kind == "string":
+                lexeme: str = match.group()
+                line += lexeme.count("\n")
+                
+                if len(lexeme) < 2 or not lexeme.endswith('"'):
+                    self.error_reporter.report(line, "Unterminated string.")
+                    continue
+                
+                append_type(TokenType.STRING._value_)
+            else:
+                self.error_reporter.report(line, "Unexpected character.")
+                continue
+            
+            append_start(match.start())
+            append_end(match.end())
+            append_line(line)
+        
+        self.line = line
+        self.start = self.current = len(self.source)
+        buffer.append(TokenType.EOF, self.current, self.current, line)
+        return buffer
+    
+    
+    def scan_file(self: Self, file: TextIO) -> Iterator[Token]:
+        """ Lazily scan tokens from a file's source code in chunks. """
+        
+        return self.scan_chunks(iter(lambda: file.read(self.CHUNK_SIZE), ""))
+    
+    
+    def scan_chunks(self: Self, chunks: Iterable[str]) -> Iterator[Token]:
+        """
+        Lazily scan tokens from chunks of source code. Lexemes that
+        could continue into the next chunk are scanned again with it.
+        """
+        
+        keywords: dict[str, TokenType] = self.KEYWORDS
+        symbols: dict[str, TokenType] = self.SYMBOLS
+        names: dict[str, str] = self.names
+        chunk_iterator: Iterator[str] = iter(chunks)
+        buffer: str = ""
+        is_at_end: bool = False
+        
+        while not is_at_end:
+            chunk: str | None = next(chunk_iterator, None)
+            
+            if chunk is None:
+                is_at_end = True
+            else:
+                buffer += chunk
+            
+            # A number may need 2 more characters to find its fraction.
+            end: int = len(buffer) - 1
+            
+            for match in self.PATTERN.finditer(buffer):
+                if match.end() >= end and not is_at_end:
+                    buffer = buffer[match.start():]
+                    break
+                
+                kind: str | None = match.lastgroup
+                lexeme: str = match.group()
+                
+                if kind == "space":
+                    self.line += lexeme.count("\n")
+                elif kind == "identifier":
+                    type: TokenType | None = keywords.get(lexeme)
+                    
+                    if type is None:
+                        type = TokenType.IDENTIFIER
+                        lexeme = names.setdefault(lexeme, lexeme)
+                    
+                    yield Token(type, lexeme, None, self.line)
+                elif kind == "symbol":
+                    yield Token(symbols[lexeme], lexeme, None, self.line)
+                elif kind == "number":
+                    yield Token(
+                            TokenType.NUMBER, lexeme, float(lexeme),
+                            self.line)
+                elif kind == "string":
+                    self.line += lexeme.count("\n")
+                    
+                    if len(lexeme) < 2 or not lexeme.endswith('"'):
+                        self.error_reporter.report(
+                                self.line, "Unterminated string.")
+                    else:
+                        yield Token(
+                                TokenType.STRING, lexeme, lexeme[1:-1],
+                                self.line)
+                else:
+                    self.error_reporter.report(
+                            self.line, "Unexpected character.")
+            else:
+                buffer = ""
+        
+        yield Token(TokenType.EOF, "", None, self.line)
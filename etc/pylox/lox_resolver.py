@@ -51,6 +51,9 @@ class Resolver(StmtVisitor, ExprVisitor):
     scopes: list[dict[str, bool]]
     """ The resolver's stack of local scopes. """
     
+    slots: list[dict[str, int]]
+    """ The resolver's stack of local scope slot indices. """
+    
     current_function: FunctionType
     """ The resolver's current function type. """
     
@@ -66,6 +69,7 @@ class Resolver(StmtVisitor, ExprVisitor):
         self.error_reporter = error_reporter
         self.interpreter = interpreter
         self.scopes = []
+        self.slots = []
         self.current_function = FunctionType.NONE
         self.current_class = ClassType.NONE
     
@@ -88,6 +92,11 @@ class Resolver(StmtVisitor, ExprVisitor):
         self.current_function = type
         self.begin_scope()
         
+        # Methods take `this` in the first slot of their frame.
+        if type == FunctionType.METHOD or type == FunctionType.INITIALIZER:
+            self.scopes[-1]["this"] = True
+            self.declare_slot("this")
+        
         for param in function.params:
             self.declare(param)
             self.define(param)
@@ -101,12 +110,14 @@ class Resolver(StmtVisitor, ExprVisitor):
         """ Begin a new scope. """
         
         self.scopes.append({})
+        self.slots.append({})
     
     
     def end_scope(self: Self) -> None:
         """ End the current scope. """
         
         self.scopes.pop()
+        self.slots.pop()
     
     
     def declare(self: Self, name: Token) -> None:
@@ -120,6 +131,16 @@ class Resolver(StmtVisitor, ExprVisitor):
                     name, "Already a variable with this name in this scope.")
         
         self.scopes[-1][name.lexeme] = False
+        self.declare_slot(name.lexeme)
+    
+    
+    def declare_slot(self: Self, name: str) -> None:
+        """ Declare a name's slot in the current scope. """
+        
+        slots: dict[str, int] = self.slots[-1]
+        
+        if name not in slots:
+            slots[name] = len(slots)
     
     
     def define(self: Self, name: Token) -> None:
@@ -131,13 +152,32 @@ class Resolver(StmtVisitor, ExprVisitor):
         self.scopes[-1][name.lexeme] = True
     
     
-    def resolve_local(self: Self, expr: Expr, name: Token) -> None:
-        """ Resolve a local variable to an expression. """
+    def resolve_local(
+            self: Self, expr: AssignExpr | SuperExpr | ThisExpr | VariableExpr,
+            name: Token) -> bool:
+        """
+        Resolve a local variable to an expression's depth and slot and
+        return whether it was found.
+        """
         
         for index in range(len(self.scopes) - 1, -1, -1):
             if name.lexeme in self.scopes[index]:
-                self.interpreter.resolve(expr, len(self.scopes) - 1 - index)
-                return
+                self.interpreter.resolve(
+                        expr, len(self.scopes) - 1 - index,
+                        self.slots[index][name.lexeme])
+                return True
+        
+        return False
+    
+    
+    def resolve_variable(self: Self, expr: AssignExpr | VariableExpr) -> None:
+        """
+        Resolve a variable expression to a local variable, or otherwise
+        to a global variable slot.
+        """
+        
+        if not self.resolve_local(expr, expr.name):
+            self.interpreter.resolve_global(expr)
     
     
     def visit_block_stmt(self: Self, stmt: BlockStmt) -> None:
@@ -166,9 +206,7 @@ class Resolver(StmtVisitor, ExprVisitor):
             self.resolve(stmt.superclass)
             self.begin_scope()
             self.scopes[-1]["super"] = True
-        
-        self.begin_scope()
-        self.scopes[-1]["this"] = True
+            self.declare_slot("super")
         
         for method in stmt.methods:
             declaration: FunctionType = FunctionType.METHOD
@@ -178,8 +216,6 @@ class Resolver(StmtVisitor, ExprVisitor):
             
             self.resolve_function(method, declaration)
         
-        self.end_scope()
-        
         if stmt.superclass is not None:
             self.end_scope()
         
@@ -228,6 +264,8 @@ class Resolver(StmtVisitor, ExprVisitor):
                 self.error_reporter.error(
                         stmt.keyword,
                         "Can't return a value from an initializer.")
+            elif isinstance(stmt.value, CallExpr):
+                stmt.value.is_tail = True
             
             self.resolve(stmt.value)
     
@@ -254,7 +292,7 @@ class Resolver(StmtVisitor, ExprVisitor):
         """ Visit and resolve an assign expression. """
         
         self.resolve(expr.value)
-        self.resolve_local(expr, expr.name)
+        self.resolve_variable(expr)
     
     
     def visit_binary_expr(self: Self, expr: BinaryExpr) -> None:
@@ -262,6 +300,7 @@ class Resolver(StmtVisitor, ExprVisitor):
         
         self.resolve(expr.left)
         self.resolve(expr.right)
+        self.interpreter.resolve_operator(expr)
     
     
     def visit_call_expr(self: Self, expr: CallExpr) -> None:
@@ -277,6 +316,7 @@ class Resolver(StmtVisitor, ExprVisitor):
         """ Visit and resolve a get expression. """
         
         self.resolve(expr.object)
+        self.interpreter.resolve_cache(expr.cache)
     
     
     def visit_grouping_expr(self: Self, expr: GroupingExpr) -> None:
@@ -296,6 +336,7 @@ class Resolver(StmtVisitor, ExprVisitor):
         
         self.resolve(expr.left)
         self.resolve(expr.right)
+        self.interpreter.resolve_operator(expr)
     
     
     def visit_set_expr(self: Self, expr: SetExpr) -> None:
@@ -333,6 +374,7 @@ class Resolver(StmtVisitor, ExprVisitor):
         """ Visit and resolve a unary expression. """
         
         self.resolve(expr.right)
+        self.interpreter.resolve_operator(expr)
     
     
     def visit_variable_expr(self: Self, expr: VariableExpr) -> None:
@@ -343,4 +385,4 @@ class Resolver(StmtVisitor, ExprVisitor):
                     expr.name,
                     "Can't read local variable in its own initializer.")
         
-        self.resolve_local(expr, expr.name)
+        self.resolve_variable(expr)
@@ -1,7 +1,9 @@
+from collections.abc import Iterator
 from lox_error_reporter import ErrorReporter
 from lox_token import Token
+from lox_token_buffer import TokenBuffer
 from lox_token_type import TokenType
-from typing import Any, Self
+from typing import Any, Self, TextIO
 
 class Scanner:
     """ Scans a list of tokens from source code. """
@@ -33,7 +35,13 @@ class Scanner:
     """ The source code to scan. """
     
     tokens: list[Token]
-    """ The tokens generated by the scanner. """
+    """ The tokens generated by the current lexeme. """
+    
+    names: dict[str, str]
+    """
+    The intern table of identifier lexemes, so that identical names
+    share one string.
+    """
     
     start: int = 0
     """ The index of the current lexeme's first character. """
@@ -51,17 +59,52 @@ class Scanner:
         self.error_reporter = error_reporter
         self.source = source
         self.tokens = []
+        self.names = {}
     
     
     def scan_tokens(self: Self) -> list[Token]:
         """ Scan a list of tokens from the source code. """
         
+        return list(self.scan())
+    
+    
+    def scan(self: Self) -> Iterator[Token]:
+        """ Lazily scan tokens from the source code. """
+        
+        while not self.is_at_end():
+            self.start = self.current
+            self.scan_token()
+            
+            if self.tokens:
+                yield from self.tokens
+                self.tokens.clear()
+        
+        yield Token(TokenType.EOF, "", None, self.line)
+    
+    
+    def scan_buffer(self: Self) -> TokenBuffer:
+        """ Scan a compact token buffer from the source code. """
+        
+        buffer: TokenBuffer = TokenBuffer(self.source, self.names)
+        
         while not self.is_at_end():
             self.start = self.current
             self.scan_token()
+            
+            for token in self.tokens:
+                buffer.append(token.type, self.start, self.current, token.line)
+            
+            self.tokens.clear()
         
-        self.tokens.append(Token(TokenType.EOF, "", None, self.line))
-        return self.tokens
+        buffer.append(TokenType.EOF, self.current, self.current, self.line)
+        return buffer
+    
+    
+    def scan_file(self: Self, file: TextIO) -> Iterator[Token]:
+        """ Lazily scan tokens from a file's source code. """
+        
+        self.source = file.read()
+        return self.scan()
     
     
     def scan_token(self: Self) -> None:
@@ -139,8 +182,14 @@ class Scanner:
             self.advance()
         
         text: str = self.source[self.start:self.current]
-        type: TokenType = self.KEYWORDS.get(text, TokenType.IDENTIFIER)
-        self.add_token(type)
+        type: TokenType | None = self.KEYWORDS.get(text)
+        
+        if type is None:
+            text = self.names.setdefault(text, text)
+            self.tokens.append(
+                    Token(TokenType.IDENTIFIER, text, None, self.line))
+        else:
+            self.add_token(type)
     
     
     def number(self: Self) -> None:
@@ -0,0 +1,40 @@
+from typing import Self
+
+class Shape:
+    """
+    A layout of an instance's fields that is shared between instances.
+    Each class has an empty root shape, and adding a field to an
+    instance moves it to the next shape in a tree of transitions. Each
+    shape has slot indices for its fields in the order they were added.
+    Instances that have their fields assigned in the same order, such
+    as by the same initializer, share the same shapes and store their
+    field values in a list.
+    """
+    
+    __slots__ = ("slots", "transitions")
+    
+    slots: dict[str, int]
+    """ The shape's slot indices by field name. """
+    
+    transitions: dict[str, Self]
+    """ The shapes after adding each new field to the shape by name. """
+    
+    def __init__(self: Self, slots: dict[str, int]) -> None:
+        """ Initialize the shape's slot indices. """
+        
+        self.slots = slots
+        self.transitions = {}
+    
+    
+    def add_field(self: Self, name: str) -> Self:
+        """ Return the shape after adding a new field to the shape. """
+        
+        shape: Self | None = self.transitions.get(name)
+        
+        if shape is None:
+            slots: dict[str, int] = self.slots.copy()
+            slots[name] = len(slots)
+            shape = type(self)(slots)
+            self.transitions[name] = shape
+        
+        return shape
@@ -5,6 +5,8 @@ from typing import Any, Self
 class Stmt:
     """ A statement in a tree. """
     
+    __slots__ = ()
+    
     def accept(self: Self, visitor: Any) -> Any:
         """ Accept a statement visitor. """
         
@@ -14,6 +16,8 @@ class Stmt:
 class BlockStmt(Stmt):
     """ A block statement in a tree. """
     
+    __slots__ = ("statements",)
+    
     statements: list[Stmt]
     """ The block statement's statements. """
     
@@ -33,6 +37,8 @@ class BlockStmt(Stmt):
 class ExpressionStmt(Stmt):
     """ An expression statement in a tree. """
     
+    __slots__ = ("expression",)
+    
     expression: Expr
     """ The expression statement's expression. """
     
@@ -52,6 +58,8 @@ class ExpressionStmt(Stmt):
 class FunctionStmt(Stmt):
     """ A function statement in a tree. """
     
+    __slots__ = ("name", "params", "body")
+    
     name: Token
     """ The function's name. """
     
@@ -83,6 +91,8 @@ class FunctionStmt(Stmt):
 class ClassStmt(Stmt):
     """ A class statement in a tree. """
     
+    __slots__ = ("name", "superclass", "methods")
+    
     name: Token
     """ The class statement's name. """
     
@@ -112,6 +122,11 @@ class ClassStmt(Stmt):
 class IfStmt(Stmt):
     """ An if statement in a tree. """
     
+    __slots__ = ("keyword", "condition", "then_branch", "else_branch")
+    
+    keyword: Token
+    """ The if statement's keyword for line numbers. """
+    
     condition: Expr
     """ The if statement's condition. """
     
@@ -122,11 +137,14 @@ class IfStmt(Stmt):
     """ The if statement's else branch. """
     
     def __init__(
-            self: Self, condition: Expr,
+            self: Self, keyword: Token, condition: Expr,
             then_branch: Stmt, else_branch: Stmt | None) -> None:
-        """ Initialize the if statement's condition and branches. """
+        """
+        Initialize the if statement's keyword, condition and branches.
+        """
         
         super().__init__()
+        self.keyword = keyword
         self.condition = condition
         self.then_branch = then_branch
         self.else_branch = else_branch
@@ -141,13 +159,19 @@ class IfStmt(Stmt):
 class PrintStmt(Stmt):
     """ A print statement in a tree. """
     
+    __slots__ = ("keyword", "expression")
+    
+    keyword: Token
+    """ The print statement's keyword for line numbers. """
+    
     expression: Expr
     """ The print statement's expression. """
     
-    def __init__(self: Self, expression: Expr) -> None:
-        """ Initialize the print statement's expression. """
+    def __init__(self: Self, keyword: Token, expression: Expr) -> None:
+        """ Initialize the print statement's keyword and expression. """
         
         super().__init__()
+        self.keyword = keyword
         self.expression = expression
     
     
@@ -160,6 +184,8 @@ class PrintStmt(Stmt):
 class ReturnStmt(Stmt):
     """ A return statement in a tree. """
     
+    __slots__ = ("keyword", "value")
+    
     keyword: Token
     """ The return statement's keyword for error logging. """
     
@@ -183,6 +209,8 @@ class ReturnStmt(Stmt):
 class VarStmt(Stmt):
     """ A var statement in a tree. """
     
+    __slots__ = ("name", "initializer")
+    
     name: Token
     """ The var statement's name. """
     
@@ -206,16 +234,28 @@ class VarStmt(Stmt):
 class WhileStmt(Stmt):
     """ A while statement in a tree. """
     
+    __slots__ = ("keyword", "condition", "body")
+    
+    keyword: Token
+    """
+    The while statement's keyword for line numbers. This is a `for`
+    keyword if the while statement was desugared from a for statement.
+    """
+    
     condition: Expr
     """ The while statement's condition. """
     
     body: Stmt
     """ The while statement's body. """
     
-    def __init__(self: Self, condition: Expr, body: Stmt) -> None:
-        """ Initialize the while statement's condition and body. """
+    def __init__(
+            self: Self, keyword: Token, condition: Expr, body: Stmt) -> None:
+        """
+        Initialize the while statement's keyword, condition and body.
+        """
         
         super().__init__()
+        self.keyword = keyword
         self.condition = condition
         self.body = body
     
@@ -0,0 +1,177 @@
+from typing import Any, Self
+
+class LoxString:
+    """
+    A Lox string that is built lazily. Lazy strings are flattened to a
+    `str` when their characters are needed, and they compare and hash
+    equal to the `str` with the same characters.
+    """
+    
+    __slots__ = ("length",)
+    
+    length: int
+    """ The lazy string's length in characters. """
+    
+    def flatten(self: Self) -> str:
+        """ Flatten the lazy string and return it as a `str`. """
+        
+        return ""
+    
+    
+    def __str__(self: Self) -> str:
+        """ Return the lazy string as a `str`. """
+        
+        return self.flatten()
+    
+    
+    def __len__(self: Self) -> int:
+        """ Return the lazy string's length without flattening it. """
+        
+        return self.length
+    
+    
+    def __eq__(self: Self, other: object) -> bool:
+        """ Return whether the lazy string is equal to another string. """
+        
+        if not isinstance(other, (str, LoxString)):
+            return NotImplemented
+        
+        return len(other) == self.length and str(other) == self.flatten()
+    
+    
+    def __hash__(self: Self) -> int:
+        """ Hash the lazy string's characters. """
+        
+        return hash(self.flatten())
+
+
+class LoxRope(LoxString):
+    """
+    A lazy string made of parts to concatenate. Ropes that are appended
+    to share one list of parts, so appending to the end of a rope takes
+    constant time.
+    """
+    
+    __slots__ = ("parts", "count")
+    
+    parts: list[str]
+    """
+    The list of parts that may be shared with ropes appended to the
+    rope. Only the first parts of the list belong to the rope.
+    """
+    
+    count: int
+    """ The number of parts in the list that belong to the rope. """
+    
+    def __init__(
+            self: Self, parts: list[str], count: int, length: int) -> None:
+        """ Initialize the rope from its parts. """
+        
+        self.parts = parts
+        self.count = count
+        self.length = length
+    
+    
+    def append(self: Self, text: str) -> Self:
+        """ Return a new rope with some text appended. """
+        
+        parts: list[str] = self.parts
+        
+        if len(parts) != self.count:
+            parts = parts[:self.count] # Another rope has appended.
+        
+        parts.append(text)
+        return LoxRope(parts, self.count + 1, self.length + len(text))
+    
+    
+    def flatten(self: Self) -> str:
+        """ Flatten the rope and return it as a `str`. """
+        
+        if self.count != 1:
+            parts: list[str] = self.parts
+            
+            if len(parts) != self.count:
+                parts = parts[:self.count] # Another rope has appended.
+            
+            self.parts = ["".join(parts)]
+            self.count = 1
+        
+        return self.parts[0]
+
+
+class LoxSlice(LoxString):
+    """ A lazy string that is a view of part of a `str`. """
+    
+    __slots__ = ("source", "start")
+    
+    source: str
+    """ The `str` that the slice is a view of. """
+    
+    start: int
+    """ The index of the slice's first character in its source. """
+    
+    def __init__(
+            self: Self, source: str, start: int, length: int) -> None:
+        """ Initialize the slice from its source. """
+        
+        self.source = source
+        self.start = start
+        self.length = length
+    
+    
+    def flatten(self: Self) -> str:
+        """ Flatten the slice and return it as a `str`. """
+        
+        if self.start != 0 or self.length != len(self.source):
+            self.source = self.source[self.start:self.start + self.length]
+            self.start = 0
+        
+        return self.source
+
+
+STRING_TYPES: frozenset[type] = frozenset((str, LoxRope, LoxSlice))
+""" The types that represent Lox strings. """
+
+LAZY_LENGTH_MIN: int = 0x100
+"""
+The minimum length of a concatenation or substring to represent as a
+lazy string. Shorter strings are cheaper to copy.
+"""
+
+def concatenate(a: Any, b: Any) -> Any:
+    """
+    Concatenate two Lox strings. Long concatenations are represented as
+    ropes instead of being copied.
+    """
+    
+    length: int = len(a) + len(b)
+    
+    if length < LAZY_LENGTH_MIN:
+        return str(a) + str(b)
+    elif type(a) is LoxRope:
+        return a.append(str(b))
+    
+    return LoxRope([str(a), str(b)], 2, length)
+
+
+def substring(string: Any, start: int, length: int) -> Any:
+    """
+    Return a substring of a Lox string. Long substrings are represented
+    as slices of their string instead of being copied.
+    """
+    
+    if length == len(string):
+        return string
+    
+    source: str
+    
+    if type(string) is LoxSlice:
+        source = string.source
+        start += string.start
+    else:
+        source = str(string)
+    
+    if length < LAZY_LENGTH_MIN:
+        return source[start:start + length]
+    
+    return LoxSlice(source, start, length)
@@ -4,6 +4,8 @@ from typing import Any, Self
 class Token:
     """ A token generated by the scanner. """
     
+    __slots__ = ("type", "lexeme", "literal", "line")
+    
     type: TokenType
     """ The type of the token. """
     
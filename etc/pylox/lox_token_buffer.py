@@ -0,0 +1,80 @@
+from array import array
+from lox_token import Token
+from lox_token_type import TokenType
+from typing import Any, Self
+
+class TokenBuffer:
+    """
+    A compact buffer of scanned tokens. Tokens are stored as columns of
+    type codes, source offsets and line numbers instead of as `Token`
+    objects. A `Token` is only created when one is read from the
+    buffer, and identifier lexemes are interned so that identical names
+    share one string.
+    """
+    
+    __slots__ = ("source", "names", "types", "starts", "ends", "lines")
+    
+    TYPES: dict[int, TokenType] = {type.value: type for type in TokenType}
+    """ The token types by type value. """
+    
+    source: str
+    """ The source code that the tokens were scanned from. """
+    
+    names: dict[str, str]
+    """ The intern table of identifier lexemes. """
+    
+    types: array
+    """ The tokens' type values. """
+    
+    starts: array
+    """ The source offsets of the tokens' first characters. """
+    
+    ends: array
+    """ The source offsets after the tokens' last characters. """
+    
+    lines: array
+    """ The line numbers that the tokens were generated from. """
+    
+    def __init__(self: Self, source: str, names: dict[str, str]) -> None:
+        """ Initialize the token buffer from its source code. """
+        
+        self.source = source
+        self.names = names
+        self.types = array("B")
+        self.starts = array("I")
+        self.ends = array("I")
+        self.lines = array("I")
+    
+    
+    def __len__(self: Self) -> int:
+        """ Return the number of tokens in the token buffer. """
+        
+        return len(self.types)
+    
+    
+    def append(
+            self: Self,
+            type: TokenType, start: int, end: int, line: int) -> None:
+        """ Append a token to the token buffer. """
+        
+        self.types.append(type._value_)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.lines.append(line)
+    
+    
+    def token(self: Self, index: int) -> Token:
+        """ Create a token from an index in the token buffer. """
+        
+        type: TokenType = self.TYPES[self.types[index]]
+        lexeme: str = self.source[self.starts[index]:self.ends[index]]
+        literal: Any = None
+        
+        if type == TokenType.IDENTIFIER:
+            lexeme = self.names.setdefault(lexeme, lexeme)
+        elif type == TokenType.NUMBER:
+            literal = float(lexeme)
+        elif type == TokenType.STRING:
+            literal = lexeme[1:-1]
+        
+        return Token(type, lexeme, literal, self.lines[index])
@@ -0,0 +1,601 @@
+from collections.abc import Callable
+from lox_chunk import OpCode
+from lox_error_reporter import ErrorReporter
+from lox_handle_table import HandleTable
+from lox_interpreter import Interpreter, create_clock, stringify
+from lox_intrinsic import install_intrinsics, print_line
+from lox_native_function import NativeFunction
+from lox_object import ObjBoundMethod, ObjClass, ObjClosure, ObjFunction
+from lox_object import ObjInstance, ObjUpvalue
+from lox_string import STRING_TYPES, concatenate
+from lox_token import Token
+from time import perf_counter
+from typing import Any, Self
+
+class CallFrame:
+    """ An ongoing call to a closure in the VM. """
+    
+    __slots__ = ("closure", "ip", "base")
+    
+    closure: ObjClosure
+    """ The call frame's closure. """
+    
+    ip: int
+    """ The offset of the call frame's next instruction. """
+    
+    base: int
+    """ The stack index of the call frame's first slot. """
+    
+    def __init__(self: Self, closure: ObjClosure, base: int) -> None:
+        """ Initialize the call frame. """
+        
+        self.closure = closure
+        self.ip = 0
+        self.base = base
+
+
+class VM:
+    """ Runs compiled functions on a stack-based virtual machine. """
+    
+    error_reporter: ErrorReporter
+    """ The VM's error reporter. """
+    
+    stack: list[Any]
+    """ The VM's value stack. """
+    
+    frames: list[CallFrame]
+    """ The VM's stack of call frames. """
+    
+    globals: dict[str, Any]
+    """ The VM's global variables. """
+    
+    open_upvalues: ObjUpvalue | None
+    """ The VM's open upvalues, from the top of the stack downwards. """
+    
+    frames_max: int
+    """ The VM's maximum number of call frames. """
+    
+    handles: HandleTable
+    """ The VM's table of handles. """
+    
+    def __init__(self: Self, error_reporter: ErrorReporter) -> None:
+        """ Initialize the VM and install the standard library. """
+        
+        self.error_reporter = error_reporter
+        self.stack = []
+        self.frames = []
+        self.globals = {}
+        self.open_upvalues = None
+        self.frames_max = Interpreter.DEPTH_MAX
+        self.handles = HandleTable()
+        self.define_native("clock", 0, create_clock(perf_counter()))
+        install_intrinsics(self.define_native, self.handles)
+    
+    
+    def define_native(
+            self: Self, name: str, parameter_count: int,
+            driver: Callable[[list[Any]], Any]) -> None:
+        """ Define a native function in the VM's globals. """
+        
+        self.globals[name] = NativeFunction(parameter_count, driver)
+    
+    
+    def close(self: Self) -> None:
+        """ Close the VM's file handles. """
+        
+        self.handles.close()
+    
+    
+    def interpret(self: Self, function: ObjFunction) -> None:
+        """ Run a compiled top level script function. """
+        
+        closure: ObjClosure = ObjClosure(function)
+        self.stack.append(closure)
+        self.frames.append(CallFrame(closure, 0))
+        
+        try:
+            self.run()
+        except RuntimeError:
+            self.reset_stack()
+    
+    
+    def reset_stack(self: Self) -> None:
+        """ Discard the VM's values, call frames and open upvalues. """
+        
+        self.stack.clear()
+        self.frames.clear()
+        self.open_upvalues = None
+    
+    
+    def error(self: Self, token: Token, message: str) -> RuntimeError:
+        """
+        Report an error from a token and a message and return a runtime
+        error.
+        """
+        
+        self.error_reporter.error(token, message)
+        return RuntimeError()
+    
+    
+    def call(
+            self: Self,
+            closure: ObjClosure, arg_count: int, token: Token) -> None:
+        """ Push a new call frame for a closure. """
+        
+        arity: int = closure.function.arity
+        
+        if arg_count != arity:
+            raise self.error(
+                    token, f"Expected {arity} arguments but got {arg_count}.")
+        
+        if len(self.frames) == self.frames_max:
+            raise self.error(token, "Stack overflow.")
+        
+        self.frames.append(
+                CallFrame(closure, len(self.stack) - arg_count - 1))
+    
+    
+    def call_value(
+            self: Self, callee: Any, arg_count: int, token: Token) -> None:
+        """
+        Call a value below its arguments on the stack. Natives are called
+        immediately, and other callables push a new call frame.
+        """
+        
+        stack: list[Any] = self.stack
+        
+        if isinstance(callee, ObjClosure):
+            self.call(callee, arg_count, token)
+        elif isinstance(callee, ObjBoundMethod):
+            stack[-1 - arg_count] = callee.receiver
+            self.call(callee.method, arg_count, token)
+        elif isinstance(callee, ObjClass):
+            stack[-1 - arg_count] = ObjInstance(callee)
+            initializer: ObjClosure | None = callee.methods.get("init")
+            
+            if initializer is not None:
+                self.call(initializer, arg_count, token)
+            elif arg_count != 0:
+                raise self.error(
+                        token, f"Expected 0 arguments but got {arg_count}.")
+        elif isinstance(callee, NativeFunction):
+            arity: int = callee.arity()
+            
+            if arg_count != arity:
+                raise self.error(
+                        token,
+                        f"Expected {arity} arguments but got {arg_count}.")
+            
+            start: int = len(stack) - arg_count
+            result: Any = callee.call(stack[start:])
+            del stack[start - 1:]
+            stack.append(result)
+        else:
+            raise self.error(token, "Can only call functions and classes.")
+    
+    
+    def capture_upvalue(self: Self, index: int) -> ObjUpvalue:
+        """ Return an open upvalue for a stack index. """
+        
+        previous: ObjUpvalue | None = None
+        upvalue: ObjUpvalue | None = self.open_upvalues
+        
+        while upvalue is not None and upvalue.index > index:
+            previous = upvalue
+            upvalue = upvalue.next
+        
+        if upvalue is not None and upvalue.index == index:
+            return upvalue
+        
+        created: ObjUpvalue = ObjUpvalue(self.stack, index)
+        created.next = upvalue
+        
+        if previous is None:
+            self.open_upvalues = created
+        else:
+            previous.next = created
+        
+        return created
+    
+    
+    def close_upvalues(self: Self, last: int) -> None:
+        """ Close every open upvalue at or above a stack index. """
+        
+        upvalue: ObjUpvalue | None = self.open_upvalues
+        
+        while upvalue is not None and upvalue.index >= last:
+            upvalue.close()
+            upvalue = upvalue.next
+        
+        self.open_upvalues = upvalue
+    
+    
+    def run(self: Self) -> None:
+        """ Run the VM's instructions until the script returns. """
+        
+        # Opcodes, globals and frame state are held in local variables
+        # because they are faster to access in the dispatch loop.
+        CONSTANT: int = OpCode.CONSTANT.value
+        NIL: int = OpCode.NIL.value
+        TRUE: int = OpCode.TRUE.value
+        FALSE: int = OpCode.FALSE.value
+        POP: int = OpCode.POP.value
+        GET_LOCAL: int = OpCode.GET_LOCAL.value
+        SET_LOCAL: int = OpCode.SET_LOCAL.value
+        GET_GLOBAL: int = OpCode.GET_GLOBAL.value
+        DEFINE_GLOBAL: int = OpCode.DEFINE_GLOBAL.value
+        SET_GLOBAL: int = OpCode.SET_GLOBAL.value
+        GET_UPVALUE: int = OpCode.GET_UPVALUE.value
+        SET_UPVALUE: int = OpCode.SET_UPVALUE.value
+        GET_PROPERTY: int = OpCode.GET_PROPERTY.value
+        SET_PROPERTY: int = OpCode.SET_PROPERTY.value
+        GET_SUPER: int = OpCode.GET_SUPER.value
+        EQUAL: int = OpCode.EQUAL.value
+        GREATER: int = OpCode.GREATER.value
+        LESS: int = OpCode.LESS.value
+        ADD: int = OpCode.ADD.value
+        SUBTRACT: int = OpCode.SUBTRACT.value
+        MULTIPLY: int = OpCode.MULTIPLY.value
+        DIVIDE: int = OpCode.DIVIDE.value
+        NOT: int = OpCode.NOT.value
+        NEGATE: int = OpCode.NEGATE.value
+        PRINT: int = OpCode.PRINT.value
+        JUMP: int = OpCode.JUMP.value
+        JUMP_IF_FALSE: int = OpCode.JUMP_IF_FALSE.value
+        LOOP: int = OpCode.LOOP.value
+        CALL: int = OpCode.CALL.value
+        INVOKE: int = OpCode.INVOKE.value
+        SUPER_INVOKE: int = OpCode.SUPER_INVOKE.value
+        CLOSURE: int = OpCode.CLOSURE.value
+        CLOSE_UPVALUE: int = OpCode.CLOSE_UPVALUE.value
+        RETURN: int = OpCode.RETURN.value
+        CLASS: int = OpCode.CLASS.value
+        INHERIT: int = OpCode.INHERIT.value
+        METHOD: int = OpCode.METHOD.value
+        
+        frames_max: int = self.frames_max
+        stack: list[Any] = self.stack
+        frames: list[CallFrame] = self.frames
+        globals: dict[str, Any] = self.globals
+        frame: CallFrame = frames[-1]
+        function: ObjFunction = frame.closure.function
+        upvalues: list[ObjUpvalue | None] = frame.closure.upvalues
+        code: Any = function.chunk.code
+        constants: list[Any] = function.chunk.constants
+        ip: int = frame.ip
+        base: int = frame.base
+        upvalue: ObjUpvalue | None
+        arg_count: int
+        callee: Any
+        name: str
+        a: Any
+        b: Any
+        
+        while True:
+            op: int = code[ip]
+            ip += 1
+            
+            if op == GET_LOCAL:
+                stack.append(stack[base + code[ip]])
+                ip += 1
+            elif op == CONSTANT:
+                stack.append(constants[(code[ip] << 8) | code[ip + 1]])
+                ip += 2
+            elif op == GET_GLOBAL:
+                name = constants[(code[ip] << 8) | code[ip + 1]]
+                ip += 2
+                
+                try:
+                    stack.append(globals[name])
+                except KeyError:
+                    raise self.error(
+                            function.chunk.tokens[ip - 3],
+                            f"Undefined variable `{name}`.") from None
+            elif op == JUMP_IF_FALSE:
+                ip += 2
+                a = stack[-1]
+                
+                if a is None or a is False:
+                    ip += (code[ip - 2] << 8) | code[ip - 1]
+            elif op == POP:
+                stack.pop()
+            elif op == CALL:
+                arg_count = code[ip]
+                ip += 1
+                frame.ip = ip
+                callee = stack[-1 - arg_count]
+                
+                if (type(callee) is ObjClosure
+                        and callee.function.arity == arg_count
+                        and len(frames) < frames_max):
+                    frame = CallFrame(callee, len(stack) - arg_count - 1)
+                    frames.append(frame)
+                else:
+                    self.call_value(
+                            callee, arg_count, function.chunk.tokens[ip - 2])
+                    frame = frames[-1]
+                
+                function = frame.closure.function
+                upvalues = frame.closure.upvalues
+                code = function.chunk.code
+                constants = function.chunk.constants
+                ip = frame.ip
+                base = frame.base
+            elif op == RETURN:
+                a = stack.pop()
+                
+                if self.open_upvalues is not None:
+                    self.close_upvalues(base)
+                
+                frames.pop()
+                
+                if not frames:
+                    stack.pop()
+                    return
+                
+                del stack[base:]
+                stack.append(a)
+                frame = frames[-1]
+                function = frame.closure.function
+                upvalues = frame.closure.upvalues
+                code = function.chunk.code
+                constants = function.chunk.constants
+                ip = frame.ip
+                base = frame.base
+            elif op == LESS:
+                b = stack.pop()
+                a = stack[-1]
+                
+                if type(a) is not float or type(b) is not float:
+                    raise self.error(
+                            function.chunk.tokens[ip - 1],
+                            "Operands must both be numbers.")
+                
+                stack[-1] = a < b
+            elif op == ADD:
+                b = stack.pop()
+                a = stack[-1]
+                
+                if type(a) is float and type(b) is float:
+                    stack[-1] = a + b
+                elif type(a) in STRING_TYPES and type(b) in STRING_TYPES:
+                    stack[-1] = concatenate(a, b)
+                else:
+                    raise self.error(
+                            function.chunk.tokens[ip - 1],
+                            "Operands must both be numbers or strings.")
+            elif op == SUBTRACT:
+                b = stack.pop()
+                a = stack[-1]
+                
+                if type(a) is not float or type(b) is not float:
+                    raise self.error(
+                            function.chunk.tokens[ip - 1],
+                            "Operands must both be numbers.")
+                
+                stack[-1] = a - b
+            elif op == SET_LOCAL:
+                stack[base + code[ip]] = stack[-1]
+                ip += 1
+            elif op == JUMP:
+                ip += 2 + ((code[ip] << 8) | code[ip + 1])
+            elif op == LOOP:
+                ip += 2 - ((code[ip] << 8) | code[ip + 1])
+            elif op == GET_UPVALUE:
+                upvalue = upvalues[code[ip]]
+                ip += 1
+                assert upvalue is not None
+                stack.append(upvalue.values[upvalue.index])
+            elif op == SET_UPVALUE:
+                upvalue = upvalues[code[ip]]
+                ip += 1
+                assert upvalue is not None
+                upvalue.values[upvalue.index] = stack[-1]
+            elif op == GET_PROPERTY:
+                name = constants[(code[ip] << 8) | code[ip + 1]]
+                ip += 2
+                a = stack[-1]
+                
+                if type(a) is not ObjInstance:
+                    raise self.error(
+                            function.chunk.tokens[ip - 3],
+                            "Only instances have properties.")
+                
+                if name in a.fields:
+                    stack[-1] = a.fields[name]
+                    continue
+                
+                b = a.klass.methods.get(name)
+                
+                if b is None:
+                    raise self.error(
+                            function.chunk.tokens[ip - 3],
+                            f"Undefined property `{name}`.")
+                
+                stack[-1] = ObjBoundMethod(a, b)
+            elif op == SET_PROPERTY:
+                name = constants[(code[ip] << 8) | code[ip + 1]]
+                ip += 2
+                b = stack.pop()
+                a = stack[-1]
+                
+                if type(a) is not ObjInstance:
+                    raise self.error(
+                            function.chunk.tokens[ip - 3],
+                            "Only instances have fields.")
+                
+                a.fields[name] = b
+                stack[-1] = b
+            elif op == INVOKE or op == SUPER_INVOKE:
+                name = constants[(code[ip] << 8) | code[ip + 1]]
+                arg_count = code[ip + 2]
+                ip += 3
+                frame.ip = ip
+                
+                if op == SUPER_INVOKE:
+                    a = stack.pop().methods.get(name)
+                    
+                    if a is None:
+                        raise self.error(
+                                function.chunk.tokens[ip - 3],
+                                f"Undefined property `{name}`.")
+                else:
+                    b = stack[-1 - arg_count]
+                    
+                    if type(b) is not ObjInstance:
+                        raise self.error(
+                                function.chunk.tokens[ip - 3],
+                                "Only instances have properties.")
+                    
+                    if name in b.fields:
+                        # Fields shadow methods and are called as values.
+                        a = b.fields[name]
+                        stack[-1 - arg_count] = a
+                    else:
+                        a = b.klass.methods.get(name)
+                        
+                        if a is None:
+                            raise self.error(
+                                    function.chunk.tokens[ip - 3],
+                                    f"Undefined property `{name}`.")
+                
+                if (type(a) is ObjClosure
+                        and a.function.arity == arg_count
+                        and len(frames) < frames_max):
+                    frame = CallFrame(a, len(stack) - arg_count - 1)
+                    frames.append(frame)
+                else:
+                    self.call_value(
+                            a, arg_count, function.chunk.tokens[ip - 4])
+                    frame = frames[-1]
+                
+                function = frame.closure.function
+                upvalues = frame.closure.upvalues
+                code = function.chunk.code
+                constants = function.chunk.constants
+                ip = frame.ip
+                base = frame.base
+            elif op == NIL:
+                stack.append(None)
+            elif op == TRUE:
+                stack.append(True)
+            elif op == FALSE:
+                stack.append(False)
+            elif op == EQUAL:
+                b = stack.pop()
+                a = stack[-1]
+                
+                if type(a) is type(b):
+                    stack[-1] = a == b
+                else:
+                    stack[-1] = (type(a) in STRING_TYPES
+                            and type(b) in STRING_TYPES and a == b)
+            elif op == GREATER:
+                b = stack.pop()
+                a = stack[-1]
+                
+                if type(a) is not float or type(b) is not float:
+                    raise self.error(
+                            function.chunk.tokens[ip - 1],
+                            "Operands must both be numbers.")
+                
+                stack[-1] = a > b
+            elif op == MULTIPLY:
+                b = stack.pop()
+                a = stack[-1]
+                
+                if type(a) is not float or type(b) is not float:
+                    raise self.error(
+                            function.chunk.tokens[ip - 1],
+                            "Operands must both be numbers.")
+                
+                stack[-1] = a * b
+            elif op == DIVIDE:
+                b = stack.pop()
+                a = stack[-1]
+                
+                if type(a) is not float or type(b) is not float:
+                    raise self.error(
+                            function.chunk.tokens[ip - 1],
+                            "Operands must both be numbers.")
+                
+                if b == 0.0:
+                    raise self.error(
+                            function.chunk.tokens[ip - 1],
+                            "Cannot divide by zero.")
+                
+                stack[-1] = a / b
+            elif op == NOT:
+                a = stack[-1]
+                stack[-1] = a is None or a is False
+            elif op == NEGATE:
+                a = stack[-1]
+                
+                if type(a) is not float:
+                    raise self.error(
+                            function.chunk.tokens[ip - 1],
+                            "Operand must be a number.")
+                
+                stack[-1] = -a
+            elif op == PRINT:
+                print_line(stringify(stack.pop()))
+            elif op == SET_GLOBAL:
+                name = constants[(code[ip] << 8) | code[ip + 1]]
+                ip += 2
+                
+                if name not in globals:
+                    raise self.error(
+                            function.chunk.tokens[ip - 3],
+                            f"Undefined variable `{name}`.")
+                
+                globals[name] = stack[-1]
+            elif op == DEFINE_GLOBAL:
+                globals[constants[(code[ip] << 8) | code[ip + 1]]] = (
+                        stack.pop())
+                ip += 2
+            elif op == CLOSURE:
+                a = constants[(code[ip] << 8) | code[ip + 1]]
+                ip += 2
+                b = ObjClosure(a)
+                stack.append(b)
+                
+                for i in range(a.upvalue_count):
+                    if code[ip]:
+                        b.upvalues[i] = self.capture_upvalue(
+                                base + code[ip + 1])
+                    else:
+                        b.upvalues[i] = upvalues[code[ip + 1]]
+                    
+                    ip += 2
+            elif op == CLOSE_UPVALUE:
+                self.close_upvalues(len(stack) - 1)
+                stack.pop()
+            elif op == GET_SUPER:
+                name = constants[(code[ip] << 8) | code[ip + 1]]
+                ip += 2
+                b = stack.pop().methods.get(name)
+                
+                if b is None:
+                    raise self.error(
+                            function.chunk.tokens[ip - 3],
+                            f"Undefined property `{name}`.")
+                
+                stack[-1] = ObjBoundMethod(stack[-1], b)
+            elif op == CLASS:
+                stack.append(ObjClass(
+                        constants[(code[ip] << 8) | code[ip + 1]]))
+                ip += 2
+            elif op == INHERIT:
+                a = stack[-2]
+                
+                if type(a) is not ObjClass:
+                    raise self.error(
+                            function.chunk.tokens[ip - 1],
+                            "Superclass must be a class.")
+                
+                stack.pop().methods.update(a.methods)
+            elif op == METHOD:
+                name = constants[(code[ip] << 8) | code[ip + 1]]
+                ip += 2
+                b = stack.pop()
+                stack[-1].methods[name] = b